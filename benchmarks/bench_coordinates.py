@@ -0,0 +1,88 @@
+"""Benchmark: per-row vs vectorized Koordinat / Koordinat_DMS formatting
+
+Run from the repository root:
+
+    python benchmarks/bench_coordinates.py --rows 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from qoe_core.coordinates import add_coordinate_columns, format_coordinates  # noqa: E402
+
+
+# Decimals of the recorded coordinates: full precision, GPS-style 6, and the
+# 7/8 decimals whose half-way cases test the rounding of the 6-decimal output
+COORDINATE_DECIMALS = [None, 6, 7, 8]
+
+
+def make_frame(rows, seed=0):
+    """Random points around Southeast Sulawesi, with a few missing coordinates"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Latitude': rng.uniform(-5.8, -3.0, rows),
+        'Longitude': rng.uniform(121.0, 124.2, rows),
+    })
+    decimals = np.array(COORDINATE_DECIMALS, dtype=object)[np.arange(rows) % len(COORDINATE_DECIMALS)]
+    for places in COORDINATE_DECIMALS[1:]:
+        rounded = decimals == places
+        df.loc[rounded, ['Latitude', 'Longitude']] = df.loc[rounded, ['Latitude', 'Longitude']].round(places)
+    df.loc[df.sample(frac=0.01, random_state=seed).index, 'Latitude'] = np.nan
+    return df
+
+
+def per_row(df):
+    """The original row-wise df.apply path"""
+    df = df.copy()
+    df['Koordinat'] = df.apply(
+        lambda row: format_coordinates(row['Latitude'], row['Longitude'], "decimal"),
+        axis=1
+    )
+    df['Koordinat_DMS'] = df.apply(
+        lambda row: format_coordinates(row['Latitude'], row['Longitude'], "dms"),
+        axis=1
+    )
+    return df
+
+
+def vectorized(df):
+    """The vectorized formatting engine"""
+    return add_coordinate_columns(df.copy())
+
+
+def best_of(func, df, repeat):
+    """Best wall-clock time of several runs, plus the last result"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'per-row (s)':>12} {'vectorized (s)':>15} {'speedup':>8}  identical")
+    for rows in args.rows:
+        df = make_frame(rows)
+        slow, expected = best_of(per_row, df, args.repeat)
+        fast, actual = best_of(vectorized, df, args.repeat)
+        identical = all(
+            (expected[col].to_numpy(dtype=object) == actual[col].to_numpy(dtype=object)).all()
+            for col in ('Koordinat', 'Koordinat_DMS')
+        )
+        print(f"{rows:>10} {slow:>12.3f} {fast:>15.3f} {slow / fast:>7.1f}x  {identical}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark: data pipeline stages on synthetic QoE campaigns
+
+Times normalization, the filter index, the long-format melt, filtering, the
+bar chart, the location comparison and map HTML generation headlessly (no
+Streamlit, no network). Run from the repository root:
+
+    python benchmarks/bench_pipeline.py --rows 10000 100000 1000000 --output bench_pipeline.json
+    python benchmarks/bench_pipeline.py --rows 10000 --baseline bench_pipeline.json
+
+With --baseline, stages slower than the baseline by more than --tolerance are
+reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import make_qoe_frame  # noqa: E402
+from qoe_core import charts, maps  # noqa: E402
+from qoe_core.aggregate import rank_locations  # noqa: E402
+from qoe_core.compare import location_comparison_table  # noqa: E402
+from qoe_core.index import build_filter_index, build_long_table, lookup_rows, select_long_rows  # noqa: E402
+from qoe_core.normalize import normalize_data  # noqa: E402
+
+# Parameter charted and mapped per test type
+ROUTE_PARAMETER = 'DL speed (Mbps)'
+STATIC_PARAMETER = 'DL (Mbps)'
+
+# The map stage is skipped for larger frames
+MAP_MAX_ROWS = 1_000_000
+
+# Rows of the untimed warm-up run, which loads the deferred plotting/mapping modules
+WARMUP_ROWS = 1_000
+
+
+def best_of(func, repeat):
+    """Best wall-clock time of several runs, plus the last result"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_stages(raw, repeat, map_max_rows):
+    """(stage, seconds) of every pipeline stage on one raw frame"""
+    timings = []
+
+    def stage(name, func):
+        seconds, result = best_of(func, repeat)
+        timings.append((name, seconds))
+        return result
+
+    df = stage('normalize', lambda: normalize_data(raw.copy()))
+    index = stage('filter_index', lambda: build_filter_index(df))
+    long_data = stage('long_table', lambda: build_long_table(df))
+
+    def select(test_type, parameter):
+        selections = {'Jenis Pengukuran': [test_type], 'Parameter': [parameter]}
+        return select_long_rows(long_data, lookup_rows(index, selections))
+
+    route = stage('filter', lambda: select('Route Test', ROUTE_PARAMETER))
+    static = select('Static Test', STATIC_PARAMETER)
+
+    stage('create_barchart', lambda: charts.barchart_figure(static, STATIC_PARAMETER, 'Static Test'))
+    ranking = stage('rank_locations', lambda: rank_locations(long_data['table'], top_n=1))
+    stage('create_location_comparison', lambda: location_comparison_table(ranking, None, 'Static Test'))
+
+    if len(raw) <= map_max_rows:
+        stage('map_html', lambda: maps.create_combined_map(route, static, ROUTE_PARAMETER, STATIC_PARAMETER).to_html())
+    return timings
+
+
+def compare(results, baseline, tolerance):
+    """Stages slower than the baseline by more than the tolerance"""
+    previous = {(r['rows'], r['stage']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for r in results:
+        before = previous.get((r['rows'], r['stage']))
+        if before and r['seconds'] > before * (1 + tolerance):
+            regressions.append(dict(r, baseline=before, ratio=round(r['seconds'] / before, 2)))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--map-max-rows', type=int, default=MAP_MAX_ROWS)
+    parser.add_argument('--output', help="JSON file receiving the results")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    run_stages(make_qoe_frame(WARMUP_ROWS, args.seed), 1, WARMUP_ROWS)
+
+    results = []
+    print(f"{'rows':>10} {'stage':<28} {'seconds':>9}")
+    for rows in args.rows:
+        raw = make_qoe_frame(rows, args.seed)
+        for name, seconds in run_stages(raw, args.repeat, args.map_max_rows):
+            results.append({'rows': rows, 'stage': name, 'seconds': round(seconds, 4)})
+            print(f"{rows:>10} {name:<28} {seconds:>9.3f}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['rows']:>10} {r['stage']:<28} {r['baseline']:.3f}s -> {r['seconds']:.3f}s ({r['ratio']}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Synthetic QoE campaign data with the schema of the SIGMON measurement sheets
+
+Run from the repository root to write a dataset for the app or the batch tools:
+
+    python benchmarks/synthetic_data.py --rows 100000 --output /tmp/qoe_100k.parquet
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# (Jenis Pengukuran, Test, Parameter, typical value) of every measured parameter
+PARAMETERS = [
+    ('Route Test', 'Route Test', 'DL speed (Mbps)', 15.0),
+    ('Route Test', 'Route Test', 'Distance (km)', 12.0),
+    ('Route Test', 'Route Test', 'Durations', 18.0),
+    ('Static Test', 'Speed Test', 'DL (Mbps)', 25.0),
+    ('Static Test', 'Speed Test', 'UL (Mbps)', 12.0),
+    ('Static Test', 'Speed Test', 'Ping (ms)', 45.0),
+    ('Static Test', 'Video Test', 'Initial Buffering (ms)', 300.0),
+    ('Static Test', 'Video Test', 'Throughput V (Mbps)', 8.0),
+    ('Static Test', 'Web Test', 'Loading time (ms)', 250.0),
+    ('Static Test', 'Web Test', 'Throughput W (Mbps)', 20.0),
+]
+
+# Scale of each operator's values relative to the typical value
+OPERATOR_SCALES = {'Telkomsel': 1.2, 'IOH': 1.0, 'XL Axiata': 0.7}
+
+# Approximate centres of the districts of Southeast Sulawesi
+DISTRICTS = {
+    'Kendari': (-3.99, 122.51),
+    'Konawe Selatan': (-4.20, 122.45),
+    'Konawe': (-3.85, 122.10),
+    'Konawe Utara': (-3.40, 122.10),
+    'Kolaka': (-4.05, 121.60),
+    'Kolaka Utara': (-3.35, 121.05),
+    'Kolaka Timur': (-3.95, 121.75),
+    'Bombana': (-4.65, 121.90),
+    'Muna': (-4.90, 122.60),
+    'Buton': (-5.30, 122.90),
+    'Buton Utara': (-4.70, 123.00),
+    'Bau-Bau': (-5.47, 122.60),
+    'Wakatobi': (-5.32, 123.60),
+}
+
+DAY_NAMES = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+MONTH_NAMES = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli',
+               'Agustus', 'September', 'Oktober', 'November', 'Desember']
+
+# Campaign days, split into Before/After periods at the holiday
+CAMPAIGN_START = pd.Timestamp('2025-03-01')
+CAMPAIGN_DAYS = 92
+HOLIDAY = pd.Timestamp('2025-03-31')
+
+# Rows per measurement site, on average
+ROWS_PER_SITE = 50
+
+
+def make_qoe_frame(rows, seed=0):
+    """Raw measurement rows (as read from the sheet or CSV) for random sites and days"""
+    rng = np.random.default_rng(seed)
+    parameters = pd.DataFrame(PARAMETERS, columns=['Jenis Pengukuran', 'Test', 'Parameter', 'typical'])
+
+    # Sites scattered around the district centres
+    n_sites = max(1, rows // ROWS_PER_SITE)
+    district_names = np.array(list(DISTRICTS))
+    site_district = rng.integers(0, len(district_names), n_sites)
+    centres = np.array(list(DISTRICTS.values()))[site_district]
+    site_lat = centres[:, 0] + rng.normal(0, 0.08, n_sites)
+    site_lon = centres[:, 1] + rng.normal(0, 0.08, n_sites)
+    site_names = np.array([f"Lokasi {i:05d}" for i in range(n_sites)])
+
+    # One row per (site, day, parameter) draw
+    site = rng.integers(0, n_sites, rows)
+    parameter = rng.integers(0, len(parameters), rows)
+    day = CAMPAIGN_START + pd.to_timedelta(rng.integers(0, CAMPAIGN_DAYS, rows), unit='D')
+
+    df = pd.DataFrame({
+        'Bulan': np.array(MONTH_NAMES)[day.month - 1],
+        'Hari': np.array(DAY_NAMES)[day.dayofweek],
+        'Tanggal': day.strftime('%m/%d/%y'),
+        'Jenis Pengukuran': parameters['Jenis Pengukuran'].to_numpy()[parameter],
+        'Test': parameters['Test'].to_numpy()[parameter],
+        'Parameter': parameters['Parameter'].to_numpy()[parameter],
+    })
+
+    # Log-normal operator values with a few missing and zero readings
+    typical = parameters['typical'].to_numpy()[parameter]
+    for operator, scale in OPERATOR_SCALES.items():
+        values = np.round(typical * scale * rng.lognormal(0.0, 0.6, rows), 3)
+        values[rng.random(rows) < 0.01] = np.nan
+        values[rng.random(rows) < 0.02] = 0.0
+        df[operator] = values
+
+    df['Longitude'] = np.round(site_lon[site], 6)
+    df['Latitude'] = np.round(site_lat[site], 6)
+    df['Kabupaten/Kota'] = district_names[site_district][site]
+    df['Alamat'] = site_names[site]
+    df['Keterangan'] = np.where(day < HOLIDAY, 'Posko Before Idul Fitri', 'Posko After Idul Fitri')
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help="CSV or Parquet file to write")
+    args = parser.parse_args()
+
+    df = make_qoe_frame(args.rows, args.seed)
+    if os.path.splitext(args.output)[1].lower() == '.parquet':
+        df.to_parquet(args.output, index=False)
+    else:
+        df.to_csv(args.output, index=False)
+    print(f"wrote {len(df)} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,86 @@
+import cProfile
+import hashlib
+import importlib
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+STARTUP_BEGIN = time.perf_counter()
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import folium
-from folium.plugins import MarkerCluster, MousePosition
-import gspread
-from google.oauth2.service_account import Credentials
-import leafmap.foliumap as leafmap
+
+from qoe_core.aggregate import (
+    ALL_DISTRICTS, BARCHART_LARGE_MODES, BARCHART_MAX_LOCATIONS, BARCHART_TOP_N, MAP_MODES, ROLLUP_FREQUENCIES,
+    SKETCH_RELATIVE_ACCURACY, build_rollups, parameter_direction, rank_locations, selected_distribution,
+    score_operators, value_extremes,
+)
+from qoe_core.compare import NEAREST_MATCH_KM, PERIOD_COLUMN, compare_periods, location_comparison_table
+from qoe_core.coordinates import coordinate_field
+from qoe_core.index import (
+    build_filter_index, build_long_table, build_spatial_index, colocated_groups,
+    dataset_version, lookup_rows, lookup_values, nearest_points, radius_query, select_long_rows,
+)
+from qoe_core.normalize import memory_usage_report
+from qoe_core.perf import collect_spans, perf_span
+from qoe_core.schema import OPERATORS
+
+# ====== DEFERRED IMPORTS ======
+# Plotting, mapping, Sheets and snapshot modules (and the qoe_core modules
+# built on them) are heavy (leafmap alone takes seconds, qoe_core.ingest loads
+# the pyarrow Parquet and IPC readers), so they are bound to placeholders that
+# import the real module on first attribute access. Cold import times and
+# startup stages are recorded for the startup report.
+
+# Module name -> seconds of the imports actually done from disk during this run
+IMPORT_TIMINGS = {"numpy, pandas, streamlit, qoe_core": time.perf_counter() - STARTUP_BEGIN}
+
+# (stage, seconds since the script started) of this run
+STARTUP_STAGES = []
+
+def timed_import(module_name):
+    """Import a module, recording the time when it is not loaded yet"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMINGS[module_name] = time.perf_counter() - start
+    return module
+
+def lazy_module(module_name):
+    """Placeholder module that imports module_name on first attribute access"""
+    def load(attribute):
+        module = timed_import(module_name)
+        placeholder.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+    
+    placeholder = types.ModuleType(module_name)
+    placeholder.__getattr__ = load
+    return placeholder
+
+def mark_stage(stage):
+    """Record the time from script start to the given startup stage"""
+    STARTUP_STAGES.append((stage, time.perf_counter() - STARTUP_BEGIN))
+
+gspread = lazy_module("gspread")
+service_account = lazy_module("google.oauth2.service_account")
+ingest = lazy_module("qoe_core.ingest")
+sheets = lazy_module("qoe_core.sheets")
+charts = lazy_module("qoe_core.charts")
+maps = lazy_module("qoe_core.maps")
+
+mark_stage("Impor modul inti")
+
+# Timing spans of this run, shown in the performance panel
+PERF_SPANS = collect_spans()
 
 # Setup page config
 st.set_page_config(page_title="QoE SIGMON", page_icon="📊", layout="wide")
@@ -112,44 +187,23 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Define color map for operators
-OPERATOR_COLORS = {
-    'Telkomsel': 'red',
-    'XL Axiata': 'blue',
-    'IOH': 'yellow'
-}
-
-# Operator list
-OPERATORS = ['Telkomsel', 'IOH', 'XL Axiata']
-
-# ====== UTILITY FUNCTIONS ======
-
-def format_coordinates(lat, lon, format_type="decimal"):
-    """Format coordinates as decimal or DMS"""
-    if pd.isna(lat) or pd.isna(lon):
-        return "Koordinat tidak tersedia"
-    
-    if format_type == "decimal":
-        return f"{lat:.6f}, {lon:.6f}"
-    else:  # DMS format
-        lat_dms = decimal_to_dms(abs(lat)) + ("S" if lat < 0 else "N")
-        lon_dms = decimal_to_dms(abs(lon)) + ("W" if lon < 0 else "E")
-        return f"{lat_dms}, {lon_dms}"
-
-def decimal_to_dms(decimal_coord):
-    """Convert decimal coordinates to DMS format"""
-    degrees = int(decimal_coord)
-    minutes_float = (decimal_coord - degrees) * 60
-    minutes = int(minutes_float)
-    seconds = (minutes_float - minutes) * 60
-    return f"{degrees}°{minutes}'{seconds:.2f}\""
+mark_stage("Konfigurasi halaman")
+
+# Data sources selectable in the app
+SOURCE_GSHEETS = "Google Sheets"
+SOURCE_LOCAL = "File/Folder Lokal (CSV/Parquet)"
+
+# Local data file opened by default (the sample shipped with the repo)
+DEFAULT_LOCAL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "Data QoS Posko 1446 H Before After.csv"
+)
 
 @st.cache_resource
 def get_gsheet_credentials():
     """Get Google Sheets API credentials"""
     # Check if credentials are in Streamlit secrets
     if 'gcp_service_account' in st.secrets:
-        credentials = Credentials.from_service_account_info(
+        credentials = service_account.Credentials.from_service_account_info(
             st.secrets["gcp_service_account"],
             scopes=[
                 "https://www.googleapis.com/auth/spreadsheets",
@@ -160,7 +214,7 @@ def get_gsheet_credentials():
     else:
         # Allow user to upload credentials file
         try:
-            credentials = Credentials.from_service_account_file(
+            credentials = service_account.Credentials.from_service_account_file(
                 'credentials.json',
                 scopes=[
                     "https://www.googleapis.com/auth/spreadsheets",
@@ -176,9 +230,8 @@ def get_gsheet_credentials():
                 key="credential_uploader"
             )
             if credentials_file is not None:
-                import json
                 creds_dict = json.loads(credentials_file.getvalue().decode())
-                credentials = Credentials.from_service_account_info(
+                credentials = service_account.Credentials.from_service_account_info(
                     creds_dict,
                     scopes=[
                         "https://www.googleapis.com/auth/spreadsheets",
@@ -188,69 +241,101 @@ def get_gsheet_credentials():
                 return credentials
             return None
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_data_from_sheets(sheet_id, sheet_name="Sheet1"):
-    """Load data from Google Sheets and process it"""
+# ====== SHEETS CLIENT AND PREFETCH ======
+#
+# One authorized gspread client is shared by every sheet call, so its HTTP
+# session (and connection pool) is reused instead of re-authorizing per call.
+# While the user is still picking a spreadsheet, the last-used worksheet's data
+# and then the worksheet names of every listed spreadsheet are fetched once in
+# a small background thread pool. The loaders only take results that have
+# already finished and otherwise fetch directly, so they never wait behind
+# other background fetches. Background tasks only use plain functions, never
+# Streamlit calls.
+
+PREFETCH_WORKERS = 4
+PREFETCH_TTL = 300  # Seconds a prefetched result stays usable
+
+@st.cache_resource
+def get_gspread_client(_credentials, service_account_email):
+    """Shared gspread client for one set of credentials"""
+    return gspread.authorize(_credentials)
+
+def get_sheets_client():
+    """Shared gspread client, or None without credentials"""
     credentials = get_gsheet_credentials()
     if credentials is None:
+        return None
+    return get_gspread_client(credentials, credentials.service_account_email)
+
+@st.cache_resource
+def get_prefetcher():
+    """Thread pool and pending results of background sheet fetches"""
+    return {
+        'pool': ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="qoe-prefetch"),
+        'futures': {},
+        'lock': threading.Lock()
+    }
+
+def prefetch(key, func, *args):
+    """Run func(*args) in the background, once per key"""
+    prefetcher = get_prefetcher()
+    with prefetcher['lock']:
+        entry = prefetcher['futures'].get(key)
+        if entry is None:
+            entry = (time.time(), prefetcher['pool'].submit(func, *args))
+            prefetcher['futures'][key] = entry
+        return entry[1]
+
+def prefetched_result(key):
+    """Result of a finished, fresh prefetch for key, or None
+    
+    A prefetch that has not finished is cancelled if it is still queued; the
+    caller then fetches directly instead of waiting for it.
+    """
+    prefetcher = get_prefetcher()
+    with prefetcher['lock']:
+        entry = prefetcher['futures'].get(key)
+    if entry is None or time.time() - entry[0] >= PREFETCH_TTL:
+        return None
+    future = entry[1]
+    if not future.done():
+        future.cancel()
+        return None
+    if future.cancelled() or future.exception() is not None:
+        # Failed prefetches are retried by the regular loader
+        return None
+    return future.result()
+
+def prefetch_sheets(gc, sheet_ids):
+    """Prefetch the last-used worksheet's data, then the worksheet names of sheet_ids"""
+    last_used = ingest.read_last_used_sheet()
+    if last_used is not None and last_used[0] in sheet_ids:
+        prefetch(('data',) + last_used, sheets.fetch_sheet_data, gc, *last_used)
+    
+    for sheet_id in sheet_ids:
+        prefetch(('worksheets', sheet_id), sheets.fetch_worksheet_titles, gc, sheet_id)
+
+# ====== CACHED LOADERS ======
+#
+# Streamlit-cached wrappers around the qoe_core loaders; errors are reported
+# in the app instead of raised.
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def load_data_from_sheets(sheet_id, sheet_name="Sheet1", incremental=False):
+    """Load data from Google Sheets and process it"""
+    gc = get_sheets_client()
+    if gc is None:
         st.error("Kredensial Google API diperlukan untuk mengakses data.")
         return None
     
     try:
-        # Initialize gspread client
-        gc = gspread.authorize(credentials)
-        
-        # Open spreadsheet by ID
-        sh = gc.open_by_key(sheet_id)
-        
-        # Select worksheet by name
-        worksheet = sh.worksheet(sheet_name)
-        
-        # Get all values and headers
-        data = worksheet.get_all_records()
-        
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(data)
-        
-        # Process the DataFrame
-        if df.empty:
-            return None
-            
-        # Process coordinates
-        if 'Latitude' in df.columns and 'Longitude' in df.columns:
-            # Convert to numeric, handling both text and numbers
-            df['Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
-            df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
-            
-            # Add formatted coordinate columns
-            df['Koordinat'] = df.apply(
-                lambda row: format_coordinates(row['Latitude'], row['Longitude'], "decimal"), 
-                axis=1
-            )
-            
-            df['Koordinat_DMS'] = df.apply(
-                lambda row: format_coordinates(row['Latitude'], row['Longitude'], "dms"), 
-                axis=1
-            )
-        
-        # Process date column
-        if 'Tanggal' in df.columns:
-            df['Tanggal'] = pd.to_datetime(df['Tanggal'], errors='coerce')
-            df['Bulan'] = df['Tanggal'].dt.strftime('%B %Y')
-            df['Tanggal_str'] = df['Tanggal'].dt.strftime('%d-%m-%Y')
-        
-        # Process operator columns - convert to appropriate types
-        for operator in OPERATORS:
-            if operator in df.columns:
-                # Try to convert to numeric, but keep text values if conversion fails
-                try:
-                    # First attempt to replace common text representations
-                    df[operator] = df[operator].replace(['Excellent', 'Good', 'Fair', 'Poor'], [4, 3, 2, 1])
-                    # Then convert to numeric, keeping text values
-                    df[operator] = pd.to_numeric(df[operator], errors='ignore')
-                except:
-                    pass  # Keep as is if conversion fails
+        # Data prefetched in the background, if any
+        df = prefetched_result(('data', sheet_id, sheet_name))
+        if df is None:
+            df = sheets.fetch_sheet_data(gc, sheet_id, sheet_name, incremental)
         
+        if df is not None:
+            ingest.write_last_used_sheet(sheet_id, sheet_name)
         return df
         
     except Exception as e:
@@ -260,12 +345,11 @@ def load_data_from_sheets(sheet_id, sheet_name="Sheet1"):
 @st.cache_data(ttl=600)  # Cache for 10 minutes
 def get_available_spreadsheets():
     """Get list of available Google Sheets"""
-    credentials = get_gsheet_credentials()
-    if credentials is None:
+    gc = get_sheets_client()
+    if gc is None:
         return []
     
     try:
-        gc = gspread.authorize(credentials)
         spreadsheets = gc.list_spreadsheet_files()
         return [(sheet['id'], sheet['name']) for sheet in spreadsheets]
     except Exception as e:
@@ -275,113 +359,142 @@ def get_available_spreadsheets():
 @st.cache_data(ttl=600)  # Cache for 10 minutes
 def get_worksheet_names(sheet_id):
     """Get list of worksheets in a spreadsheet"""
-    credentials = get_gsheet_credentials()
-    if credentials is None:
+    gc = get_sheets_client()
+    if gc is None:
         return []
     
     try:
-        gc = gspread.authorize(credentials)
-        sh = gc.open_by_key(sheet_id)
-        return [worksheet.title for worksheet in sh.worksheets()]
+        names = prefetched_result(('worksheets', sheet_id))
+        if names is None:
+            names = sheets.fetch_worksheet_titles(gc, sheet_id)
+        return names
     except Exception as e:
         st.error(f"Error saat mendapatkan daftar worksheet: {str(e)}")
         return []
 
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def load_merged_sheets(sources):
+    """Load and merge several worksheets, sources being (sheet_id, sheet_name, label) tuples"""
+    gc = get_sheets_client()
+    if gc is None:
+        st.error("Kredensial Google API diperlukan untuk mengakses data.")
+        return None
+    
+    try:
+        df = sheets.fetch_sheet_set(gc, sources)
+        return df if not df.empty else None
+    except Exception as e:
+        st.error(f"Error saat mengakses Google Sheets: {str(e)}")
+        return None
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def load_data_from_local(path, pattern="*", modified_time=None):
+    """Load data from a local CSV/Parquet file or a directory of them and process it
+    
+    modified_time only serves as part of the cache key, so changed files are reloaded.
+    """
+    files = ingest.list_local_files(path, pattern)
+    if not files:
+        st.error("Tidak ada file CSV/Parquet yang ditemukan.")
+        return None
+    
+    try:
+        return ingest.read_local_files(files)
+    except Exception as e:
+        st.error(f"Error saat membaca file lokal: {str(e)}")
+        return None
+
+# ====== CACHED DATASET STRUCTURES ======
+#
+# Indexes, tables and summaries of a loaded dataset are built by qoe_core once
+# per dataset version (and filter state) and kept in the Streamlit caches.
+
+@st.cache_resource(max_entries=4)
+def get_filter_index(_df, dataset_version):
+    """Filter index for a loaded dataset, built once per dataset version"""
+    return build_filter_index(_df)
+
+@st.cache_resource(max_entries=4)
+def get_long_table(_df, dataset_version):
+    """Long-format table for a loaded dataset, built once per dataset version"""
+    return build_long_table(_df)
+
+@st.cache_resource(max_entries=4)
+def get_spatial_index(_df, dataset_version):
+    """Spatial index of a loaded dataset's rows, built once per dataset version"""
+    return build_spatial_index(_df['Latitude'].to_numpy(dtype=float), _df['Longitude'].to_numpy(dtype=float))
+
+@st.cache_resource(max_entries=8)
+def get_colocated_groups(_df, dataset_version, tolerance_km):
+    """Co-located point groups of a loaded dataset for one tolerance"""
+    return colocated_groups(get_spatial_index(_df, dataset_version), tolerance_km)
+
+@st.cache_data(max_entries=32)
+def get_location_ranking(_df, dataset_version, selections, top_n=1):
+    """Location ranking for a filter state of a loaded dataset"""
+    index = get_filter_index(_df, dataset_version)
+    long_data = get_long_table(_df, dataset_version)
+    return rank_locations(select_long_rows(long_data, lookup_rows(index, selections)), top_n)
+
+@st.cache_data(max_entries=16)
+def get_period_comparison(_df, dataset_version, selections, before, after, max_distance_km=NEAREST_MATCH_KM):
+    """Before/after comparison for a filter state of a loaded dataset"""
+    index = get_filter_index(_df, dataset_version)
+    long_data = get_long_table(_df, dataset_version)
+    return compare_periods(select_long_rows(long_data, lookup_rows(index, selections)), before, after, max_distance_km)
+
+@st.cache_resource(max_entries=4)
+def get_rollups(_df, dataset_version):
+    """Time-series rollups of a loaded dataset, built once per dataset version"""
+    return build_rollups(get_long_table(_df, dataset_version)['table'])
+
+@st.cache_data(max_entries=32)
+def get_distribution_summary(_df, dataset_version, selections, approximate=None):
+    """Distribution summary for a filter state of a loaded dataset"""
+    index = get_filter_index(_df, dataset_version)
+    long_data = get_long_table(_df, dataset_version)
+    return selected_distribution(long_data, lookup_rows(index, selections), approximate)
+
+@st.cache_data(max_entries=32)
+def get_operator_scores(_df, dataset_version, selections, weights):
+    """Operator scores for a filter state, weights given as (parameter, weight) pairs"""
+    index = get_filter_index(_df, dataset_version)
+    long_data = get_long_table(_df, dataset_version)
+    return score_operators(select_long_rows(long_data, lookup_rows(index, selections)), dict(weights))
+
 # ====== DATA VISUALIZATION FUNCTIONS ======
+#
+# Display wrappers around the qoe_core figures and tables: they take the
+# display options from the sidebar, show the result and report errors in the app.
 
-def create_barchart(df, parameter, title):
-    """Create bar chart comparing operators for a specific parameter"""
-    if df.empty or parameter not in df['Parameter'].values:
+def selected_coordinate_format():
+    """Coordinate format ("decimal" or "dms") chosen in the sidebar"""
+    coord_format = st.session_state.get('coord_format_radio_sidebar', "Desimal (DD.DDDDDD)")
+    return "decimal" if coord_format == "Desimal (DD.DDDDDD)" else "dms"
+
+def create_barchart(df_plot, parameter, title, mode=None, top_n=BARCHART_TOP_N):
+    """Show the bar chart comparing operators for a parameter, with its highest and lowest value
+    
+    df_plot holds the long-format rows (one per location and operator) of the parameter.
+    Above BARCHART_MAX_LOCATIONS locations, mode selects one of BARCHART_LARGE_MODES.
+    """
+    if df_plot.empty:
         st.write(f"Tidak ada data untuk {title}.")
         return None
     
     try:
-        # Filter data for selected parameter
-        df_param = df[df['Parameter'] == parameter]
-        
-        # Define columns to keep in melted dataframe
-        id_vars = ['Alamat', 'Tanggal', 'Bulan', 'Jenis Pengukuran', 'Parameter', 
-                  'Tanggal_str', 'Latitude', 'Longitude', 'Koordinat', 'Koordinat_DMS']
-        
-        # Add 'Kabupaten/Kota' if it exists
-        if 'Kabupaten/Kota' in df.columns:
-            id_vars.append('Kabupaten/Kota')
-        
-        # Filter operator columns that exist in the dataframe
-        value_vars = [op for op in OPERATORS if op in df.columns]
-        
-        if not value_vars:
-            st.write(f"Tidak ada kolom operator yang valid untuk {title}.")
-            return None
-        
-        # Ensure operator columns are numeric where possible
-        for op in value_vars:
-            if op in df_param.columns:
-                # Try to convert to numeric, preserve text values
-                df_param[op] = pd.to_numeric(df_param[op], errors='ignore')
-        
-        # Reshape the dataframe for plotting
-        df_plot = df_param.melt(
-            id_vars=id_vars,
-            value_vars=value_vars,
-            var_name='Operator',
-            value_name='Nilai'
-        )
-        
-        if df_plot.empty:
-            st.write(f"Tidak ada data untuk {title} setelah transformasi.")
-            return None
-        
-        # Create color map
-        color_discrete_map = {op: OPERATOR_COLORS.get(op, 'gray') for op in value_vars}
-        
-        # Create bar chart
-        fig = px.bar(
-            df_plot, 
-            x='Alamat', 
-            y='Nilai', 
-            color='Operator', 
-            barmode='group',
-            title=f"{parameter} ({title})",
-            hover_data=['Operator', 'Alamat', 'Tanggal_str', 'Nilai', 'Koordinat'],
-            color_discrete_map=color_discrete_map
-        )
-        
-        # Adjust layout
-        fig.update_layout(
-            xaxis_title="Lokasi",
-            yaxis_title=parameter,
-            legend_title="Operator"
-        )
-        
         # Display the chart
-        st.plotly_chart(fig)
+        st.plotly_chart(charts.barchart_figure(df_plot, parameter, title, mode, top_n))
         
         # Show highest and lowest values
         try:
-            # Get coordinate display format
-            coord_format = st.session_state.get('coord_format_radio_sidebar', "Desimal (DD.DDDDDD)")
-            
-            # Filter to numeric values only for max/min analysis
-            df_plot_numeric = df_plot[pd.to_numeric(df_plot['Nilai'], errors='coerce').notna()]
-            
-            if not df_plot_numeric.empty:
-                # Find highest value
-                max_idx = df_plot_numeric['Nilai'].idxmax()
-                max_row = df_plot_numeric.loc[max_idx]
+            extremes = value_extremes(df_plot)
+            if extremes is not None:
+                max_row, min_row = extremes
+                coord_field = coordinate_field(selected_coordinate_format())
                 
-                # Find lowest value
-                min_idx = df_plot_numeric['Nilai'].idxmin()
-                min_row = df_plot_numeric.loc[min_idx]
-                
-                # Display highest value info
                 st.markdown(f"**Nilai {parameter} Tertinggi:** {max_row['Operator']} di lokasi {max_row['Alamat']} ({max_row['Nilai']})")
-                
-                # Show coordinates in selected format
-                coord_field = 'Koordinat' if coord_format == "Desimal (DD.DDDDDD)" else 'Koordinat_DMS'
                 st.markdown(f"**Koordinat:** {max_row[coord_field]}")
-                
-                # Display lowest value info
                 st.markdown(f"**Nilai {parameter} Terendah:** {min_row['Operator']} di lokasi {min_row['Alamat']} ({min_row['Nilai']})")
                 st.markdown(f"**Koordinat:** {min_row[coord_field]}")
             else:
@@ -394,311 +507,118 @@ def create_barchart(df, parameter, title):
         st.error(f"Error saat membuat grafik {title}: {str(e)}")
         return None
 
-def create_location_comparison(df, parameter, test_type):
-    """Create comparison table showing best and worst locations per operator"""
-    if df.empty or parameter not in df['Parameter'].values:
-        return None
+def create_location_comparison(ranking, parameter, test_type):
+    """Create comparison table showing best and worst locations per operator
     
+    ranking comes from rank_locations; with parameter=None every parameter is compared.
+    """
     try:
-        df_param = df[df['Parameter'] == parameter].copy()
-        
-        # Prepare data structure for comparison
-        comparison_data = []
-        
-        # Get coordinate format preference
-        coord_format = st.session_state.get('coord_format_radio_sidebar', "Desimal (DD.DDDDDD)")
-        coord_field = 'Koordinat' if coord_format == "Desimal (DD.DDDDDD)" else 'Koordinat_DMS'
-        
-        # Process each operator
-        for op in [op for op in OPERATORS if op in df_param.columns]:
-            # Get data for this operator
-            op_data = df_param[['Alamat', 'Tanggal_str', 'Latitude', 'Longitude', 
-                               'Koordinat', 'Koordinat_DMS', op]].copy()
-            
-            # Convert to numeric where possible, preserving text values
-            op_data[op] = pd.to_numeric(op_data[op], errors='coerce')
-            
-            # Drop rows with NA values
-            op_data_clean = op_data.dropna(subset=[op])
-            
-            if not op_data_clean.empty:
-                try:
-                    # Find highest value
-                    max_idx = op_data_clean[op].idxmax()
-                    max_row = op_data_clean.loc[max_idx]
-                    
-                    # Find lowest value
-                    min_idx = op_data_clean[op].idxmin()
-                    min_row = op_data_clean.loc[min_idx]
-                    
-                    # Add comparison data
-                    comparison_data.append({
-                        'Operator': op,
-                        'Parameter': parameter,
-                        'Jenis Test': test_type,
-                        'Nilai Tertinggi': max_row[op],
-                        'Lokasi Tertinggi': max_row['Alamat'],
-                        'Koordinat Tertinggi': max_row[coord_field],
-                        'Tanggal Tertinggi': max_row['Tanggal_str'],
-                        'Nilai Terendah': min_row[op],
-                        'Lokasi Terendah': min_row['Alamat'],
-                        'Koordinat Terendah': min_row[coord_field],
-                        'Tanggal Terendah': min_row['Tanggal_str']
-                    })
-                except Exception as e:
-                    st.warning(f"Error saat menganalisis data operator {op}: {str(e)}")
-        
-        return pd.DataFrame(comparison_data) if comparison_data else None
+        return location_comparison_table(ranking, parameter, test_type, selected_coordinate_format())
     except Exception as e:
         st.error(f"Error saat membuat perbandingan lokasi: {str(e)}")
         return None
 
-def create_combined_map(df_route, df_static, param_route, param_static):
-    """Create a map displaying both Route Test and Static Test data"""
-    # Check if there's data to display
-    has_route_data = not df_route.empty and param_route in df_route['Parameter'].values
-    has_static_data = not df_static.empty and param_static in df_static['Parameter'].values
-   
-    if not has_route_data and not has_static_data:
-        st.write("Tidak ada data untuk ditampilkan pada peta.")
+def create_trend_chart(rollup, parameter, statistic, title):
+    """Show the line chart of one rollup statistic per operator over time"""
+    if rollup.empty:
+        st.write(f"Tidak ada data tren untuk {parameter}.")
         return None
-   
-    # Filter data by selected parameters
-    df_route_map = df_route[df_route['Parameter'] == param_route] if has_route_data else pd.DataFrame()
-    df_static_map = df_static[df_static['Parameter'] == param_static] if has_static_data else pd.DataFrame()
-   
-    # Combine data to determine map center
-    df_combined = pd.concat([df_route_map, df_static_map])
-   
-    if df_combined.empty:
-        st.write("Tidak ada data untuk parameter yang dipilih.")
+    
+    try:
+        fig = charts.trend_figure(rollup, parameter, statistic, title)
+        st.plotly_chart(fig)
+        return fig
+    except Exception as e:
+        st.error(f"Error saat membuat grafik tren: {str(e)}")
+        return None
+
+def create_distribution_charts(distribution, parameter, test_type):
+    """Show the box plot and ECDF of one parameter per operator"""
+    try:
+        figures = charts.distribution_figures(distribution, parameter, test_type)
+        if figures is None:
+            st.write(f"Tidak ada data distribusi untuk {parameter} ({test_type}).")
+            return None
+        for fig in figures:
+            st.plotly_chart(fig)
+        return figures
+    except Exception as e:
+        st.error(f"Error saat membuat grafik distribusi: {str(e)}")
+        return None
+
+def create_score_chart(district_scores):
+    """Show the bar chart of operator scores per district"""
+    if district_scores.empty:
+        st.write("Tidak ada parameter yang dapat diberi skor.")
         return None
-   
-    # Calculate center coordinates
-    center_lat = df_combined['Latitude'].mean()
-    center_lon = df_combined['Longitude'].mean()
-   
-    # Create map
-    m = leafmap.Map(center=[center_lat, center_lon], zoom=8)
-    m.add_basemap("OpenStreetMap")
-    m.add_basemap("Satellite")
-    
-    # Get coordinate display preference
-    show_coordinates = st.session_state.get('show_coords_checkbox_sidebar', True)
-    coordinate_format = st.session_state.get('coord_format_radio_sidebar', "Desimal (DD.DDDDDD)")
-    
-    # Add coordinate control to map
-    if show_coordinates:
-        # Format according to user choice
-        if coordinate_format == "Desimal (DD.DDDDDD)":
-            formatter = 'function(num) {return L.Util.formatNum(num, 6) + "°";}'
-        else:
-            formatter = '''
-            function(num) {
-                var deg = Math.floor(Math.abs(num));
-                var min = Math.floor((Math.abs(num) - deg) * 60);
-                var sec = ((Math.abs(num) - deg - min/60) * 3600).toFixed(2);
-                var dir = num >= 0 ? "N" : "S";
-                if (this.options.lngFirst) {
-                    dir = num >= 0 ? "E" : "W";
-                }
-                return deg + "°" + min + "'" + sec + '"' + dir;
-            }
-            '''
-            
-        mouse_position = MousePosition(
-            position='bottomright',
-            separator=' | ',
-            empty_string='',
-            lng_first=False,
-            num_digits=6,
-            prefix='Koordinat:',
-            lat_formatter=formatter,
-            lng_formatter=formatter
-        )
-        m.add_child(mouse_position)
     
-    # Add CSS for pulse animation
-    folium.Element("""
-    <style>
-        @keyframes pulse {
-            0% { opacity: 1; }
-            50% { opacity: 0.4; }
-            100% { opacity: 1; }
-        }
-        .marker-pulse {
-            animation: pulse 1.5s infinite;
-        }
-        .marker-pulse-fast {
-            animation: pulse 0.8s infinite;
-        }
-        .coordinate-display {
-            background-color: rgba(255, 255, 255, 0.8);
-            border-radius: 4px;
-            padding: 4px 8px;
-            font-weight: bold;
-            color: #333;
-            border: 1px solid #ccc;
-        }
-        .coords-highlight {
-            background-color: #f0f0f0;
-            border-left: 3px solid #2196F3;
-            padding: 3px 6px;
-            margin-top: 4px;
-            font-weight: bold;
-            font-family: monospace;
-        }
-    </style>
-    """).add_to(m)
-   
-    # Create marker cluster
-    marker_cluster = MarkerCluster().add_to(m)
-   
-    # Function to create custom icon
-    def create_custom_icon(jenis_test, operator, nilai):
-        # Determine color based on operator
-        color = OPERATOR_COLORS.get(operator, 'gray')
-        
-        # Create icon HTML based on test type
-        if jenis_test == 'Route Test':
-            icon_html = f"""
-            <div class="marker-pulse" style="animation-delay: {(hash(operator) % 5) * 0.2}s;">
-                <i class="fa fa-map-marker fa-2x" style="color:{color};"></i>
-            </div>
-            """
-            return folium.DivIcon(
-                html=icon_html,
-                icon_size=(30, 30),
-                icon_anchor=(15, 30)
-            )
-        else:
-            icon_html = f"""
-            <div class="marker-pulse-fast" style="animation-delay: {(hash(operator) % 3) * 0.3}s;">
-                <i class="fa fa-wifi fa-2x" style="color:{color};"></i>
-            </div>
-            """
-            return folium.DivIcon(
-                html=icon_html,
-                icon_size=(30, 30),
-                icon_anchor=(15, 15)
-            )
+    try:
+        fig = charts.score_figure(district_scores)
+        st.plotly_chart(fig)
+        return fig
+    except Exception as e:
+        st.error(f"Error saat membuat grafik skor: {str(e)}")
+        return None
+
+def create_period_diff_chart(comparison, parameter, test_type):
+    """Show the bar chart of the after-minus-before change per site and operator"""
+    if comparison.empty:
+        st.write(f"Tidak ada pasangan lokasi Before/After untuk {parameter} ({test_type}).")
+        return None
     
-    # Helper function to get coordinate display
-    def get_coordinate_display(row):
-        if coordinate_format == "Desimal (DD.DDDDDD)":
-            return row['Koordinat']
-        else:
-            return row['Koordinat_DMS']
-   
-    # Add Route Test markers
-    if has_route_data:
-        for op in [op for op in OPERATORS if op in df_route_map.columns]:
-            # Convert to numeric where possible
-            df_route_map[op] = pd.to_numeric(df_route_map[op], errors='ignore')
-            
-            # Filter data with non-null values
-            op_data = df_route_map.copy()
-            op_data = op_data[op_data[op].notna()]
-           
-            if not op_data.empty:
-                for _, row in op_data.iterrows():
-                    # Format value for display
-                    nilai = row[op]
-                    nilai_str = f"{nilai}" if isinstance(nilai, (int, float, str)) else str(nilai)
-                    
-                    # Get coordinates in selected format
-                    coord_display = get_coordinate_display(row)
-                   
-                    # Create popup content
-                    popup_content = f"""
-                    <div style="font-family: Arial; font-size: 12px;">
-                        <b>Jenis Pengukuran:</b> Route Test<br>
-                        <b>Lokasi:</b> {row['Alamat']}<br>
-                        <b>Operator:</b> {op}<br>
-                        <b>Parameter:</b> {param_route}<br>
-                        <b>Nilai:</b> {nilai_str}<br>
-                        <b>Tanggal:</b> {row['Tanggal_str']}<br>
-                        <b>Koordinat:</b> <div class="coords-highlight">{coord_display}</div>
-                        {"<b>Kabupaten/Kota:</b> " + row['Kabupaten/Kota'] + "<br>" if 'Kabupaten/Kota' in op_data.columns else ""}
-                    </div>
-                    """
-                   
-                    # Create marker
-                    folium.Marker(
-                        location=[row['Latitude'], row['Longitude']],
-                        icon=create_custom_icon('Route Test', op, nilai),
-                        popup=folium.Popup(popup_content, max_width=300),
-                        tooltip=f"Route Test: {op} - {row['Alamat']} | {coord_display}"
-                    ).add_to(marker_cluster)
-   
-    # Add Static Test markers
-    if has_static_data:
-        for op in [op for op in OPERATORS if op in df_static_map.columns]:
-            # Convert to numeric where possible
-            df_static_map[op] = pd.to_numeric(df_static_map[op], errors='ignore')
-            
-            # Filter data with non-null values
-            op_data = df_static_map.copy()
-            op_data = op_data[op_data[op].notna()]
-           
-            if not op_data.empty:
-                for _, row in op_data.iterrows():
-                    # Format value for display
-                    nilai = row[op]
-                    nilai_str = f"{nilai}" if isinstance(nilai, (int, float, str)) else str(nilai)
-                    
-                    # Get coordinates in selected format
-                    coord_display = get_coordinate_display(row)
-                   
-                    # Create popup content
-                    popup_content = f"""
-                    <div style="font-family: Arial; font-size: 12px;">
-                        <b>Jenis Pengukuran:</b> Static Test<br>
-                        <b>Lokasi:</b> {row['Alamat']}<br>
-                        <b>Operator:</b> {op}<br>
-                        <b>Parameter:</b> {param_static}<br>
-                        <b>Nilai:</b> {nilai_str}<br>
-                        <b>Tanggal:</b> {row['Tanggal_str']}<br>
-                        <b>Koordinat:</b> <div class="coords-highlight">{coord_display}</div>
-                        {"<b>Kabupaten/Kota:</b> " + row['Kabupaten/Kota'] + "<br>" if 'Kabupaten/Kota' in op_data.columns else ""}
-                    </div>
-                    """
-                   
-                    # Create marker
-                    folium.Marker(
-                        location=[row['Latitude'], row['Longitude']],
-                        icon=create_custom_icon('Static Test', op, nilai),
-                        popup=folium.Popup(popup_content, max_width=300),
-                        tooltip=f"Static Test: {op} - {row['Alamat']} | {coord_display}"
-                    ).add_to(marker_cluster)
-   
-    # Add legend
-    legend_html = """
-    <div style="position: fixed; bottom: 50px; right: 50px; z-index: 1000; background-color: white;
-                padding: 10px; border: 2px solid grey; border-radius: 5px">
-        <div style="margin-bottom: 5px;"><b>Operator:</b></div>
-    """
-   
-    # Add operator legend
-    for op in OPERATORS:
-        legend_html += f"""
-        <div style="margin-bottom: 3px;">
-            <i style="background:{OPERATOR_COLORS.get(op, 'gray')}; width: 12px; height: 12px; display: inline-block; border: 1px solid black;" 
-               class="marker-pulse"></i> {op}
-        </div>
-        """
-   
-    # Add test type legend
-    legend_html += """
-        <div style="margin-top: 10px; margin-bottom: 5px;"><b>Jenis Pengukuran:</b></div>
-        <div style="margin-bottom: 3px;" class="marker-pulse"><i class="fa fa-map-marker" style="color:gray;"></i> Route Test</div>
-        <div style="margin-bottom: 3px;" class="marker-pulse-fast"><i class="fa fa-wifi" style="color:gray;"></i> Static Test</div>
-    </div>
-    """
-   
-    m.add_html(html=legend_html, position="bottomright")
-   
-    return m
+    try:
+        fig = charts.period_diff_figure(comparison, parameter, test_type)
+        st.plotly_chart(fig)
+        return fig
+    except Exception as e:
+        st.error(f"Error saat membuat grafik perubahan: {str(e)}")
+        return None
+
+# ====== MAP RENDER CACHE ======
+#
+# Building the folium map and serializing it is the slowest part of a rerun,
+# yet most reruns come from widgets that do not affect the map. Rendered HTML
+# is kept in a process-wide LRU keyed by a hash of everything the map depends
+# on, bounded by total size so a few very large maps cannot exhaust memory.
+
+MAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MAP_CACHE_MAX_ENTRIES = 32
+
+@st.cache_resource
+def get_map_cache():
+    """Process-wide LRU of rendered map HTML"""
+    return {'entries': OrderedDict(), 'size': 0, 'lock': threading.Lock()}
+
+def map_cache_key(*parts):
+    """Stable hash of the inputs of a map render"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def get_cached_map_html(key):
+    """Rendered map HTML for key, or None"""
+    cache = get_map_cache()
+    with cache['lock']:
+        html = cache['entries'].get(key)
+        if html is not None:
+            cache['entries'].move_to_end(key)
+        return html
+
+def put_cached_map_html(key, html):
+    """Store rendered map HTML, evicting the least recently used entries"""
+    size = len(html.encode('utf-8'))
+    if size > MAP_CACHE_MAX_BYTES:
+        return
+    
+    cache = get_map_cache()
+    entries = cache['entries']
+    with cache['lock']:
+        if key in entries:
+            cache['size'] -= len(entries.pop(key).encode('utf-8'))
+        while entries and (cache['size'] + size > MAP_CACHE_MAX_BYTES or len(entries) >= MAP_CACHE_MAX_ENTRIES):
+            _, evicted = entries.popitem(last=False)
+            cache['size'] -= len(evicted.encode('utf-8'))
+        entries[key] = html
+        cache['size'] += size
 
 # ====== CONFIGURATION MANAGEMENT ======
 
@@ -773,18 +693,101 @@ def load_config():
             except Exception as e:
                 st.sidebar.error(f"Error saat memuat konfigurasi: {str(e)}")
 
-# ====== MAIN APPLICATION ======
+# ====== STARTUP REPORT ======
+# Import times and stage timings from the first run of this server process
+# (the cold start) are kept next to those of the current run, so cold-start
+# regressions on small hosts show up in the sidebar.
 
-def main():
-    """Main application function"""
-    st.title("Visualisasi Data QoE SIGMON Operator Seluler")
+@st.cache_resource(show_spinner=False)
+def get_startup_profile():
+    """Process-wide store of cold import times and the first run's stages"""
+    return {'imports': {}, 'first_run': None, 'lock': threading.Lock()}
+
+def stage_table(stages):
+    """Stage timings as a frame with the time since start and per stage"""
+    table = pd.DataFrame(stages, columns=['Tahap', 'Sejak Mulai (s)'])
+    table['Durasi (s)'] = table['Sejak Mulai (s)'].diff().fillna(table['Sejak Mulai (s)'])
+    return table.round(3)
+
+def startup_report():
+    """Show the cold-start import and stage timings in the sidebar"""
+    mark_stage("Selesai")
+    profile = get_startup_profile()
+    with profile['lock']:
+        for module_name, seconds in IMPORT_TIMINGS.items():
+            profile['imports'].setdefault(module_name, seconds)
+        if profile['first_run'] is None:
+            profile['first_run'] = list(STARTUP_STAGES)
+        imports = dict(profile['imports'])
+        first_run = profile['first_run']
+    
+    with st.sidebar.expander("Profil Startup"):
+        st.markdown("**Impor modul (cold start)**")
+        st.dataframe(pd.DataFrame({'Modul': list(imports), 'Waktu (s)': list(imports.values())}).round(3), hide_index=True)
+        st.markdown("**Tahap run pertama**")
+        st.dataframe(stage_table(first_run), hide_index=True)
+        st.markdown("**Tahap run ini**")
+        st.dataframe(stage_table(STARTUP_STAGES), hide_index=True)
+
+# ====== PERFORMANCE PANEL ======
+# Optional sidebar view of the spans of the current run with a JSON-lines
+# download, and a one-off cProfile capture of the next full rerun.
+
+# Functions listed in a cProfile capture, by cumulative time
+PROFILE_TOP_FUNCTIONS = 30
+
+# Span table columns, in display order
+PERF_SPAN_COLUMNS = ['span', 'rows', 'seconds', 'memory_delta_mb', 'start', 'bytes', 'thread']
+
+def start_rerun_profile():
+    """Profiler enabled for this run if a capture was requested, else None"""
+    if not st.session_state.pop('profile_next_run', False):
+        return None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def performance_panel(profiler=None):
+    """Sidebar panel with the spans of this run and the last cProfile capture"""
+    if profiler is not None:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        st.session_state['last_profile'] = stream.getvalue()
     
+    if not st.sidebar.checkbox("Tampilkan Panel Performa", value=False, key="performance_panel_checkbox"):
+        return
+    
+    with st.sidebar.expander("Performa", expanded=True):
+        if PERF_SPANS:
+            spans = pd.DataFrame(PERF_SPANS).sort_values('start')
+            st.dataframe(spans[[c for c in PERF_SPAN_COLUMNS if c in spans.columns]], hide_index=True)
+            st.download_button(
+                "Unduh Log Span (JSON Lines)",
+                "\n".join(json.dumps(record) for record in PERF_SPANS),
+                file_name="qoe_perf_spans.jsonl",
+                mime="application/json",
+                key="perf_log_download"
+            )
+        else:
+            st.write("Belum ada span pada run ini.")
+        
+        if st.button("Profil Run Berikutnya (cProfile)", key="profile_next_run_button"):
+            st.session_state['profile_next_run'] = True
+            st.rerun()
+        if 'last_profile' in st.session_state:
+            st.code(st.session_state['last_profile'], language=None)
+
+# ====== MAIN APPLICATION ======
+
+def select_sheets_source():
+    """Show spreadsheet selection options, returns a function that loads the selection"""
     # Check credentials
     credentials = get_gsheet_credentials()
     
     if credentials is None:
         st.warning("Silakan upload file kredensial Google API (credentials.json) untuk mengakses spreadsheet.")
-        return
+        return None
     
     # Show spreadsheet selection options
     available_sheets = get_available_spreadsheets()
@@ -806,9 +809,17 @@ def main():
             else:
                 sheet_name = "Sheet1"  # Default
         else:
-            return
+            return None
     else:
+        # Fetch worksheet names (and the last-used worksheet) while the user chooses
+        prefetch_sheets(get_sheets_client(), [sheet_id for sheet_id, _ in available_sheets])
+        
         sheet_options = {name: id for id, name in available_sheets}
+        
+        # Campaigns split over several worksheets/spreadsheets
+        if st.checkbox("Gabungkan beberapa worksheet/spreadsheet", value=False, key="merge_sheets_checkbox"):
+            return select_merged_sheets(sheet_options)
+        
         selected_sheet_name = st.selectbox("Pilih Spreadsheet:", list(sheet_options.keys()), key="spreadsheet_select")
         sheet_id = sheet_options[selected_sheet_name]
         
@@ -819,30 +830,101 @@ def main():
         else:
             sheet_name = "Sheet1"  # Default
     
+    # Incremental sync option for worksheets that are only appended to
+    incremental = st.checkbox(
+        "Sinkronisasi inkremental (hanya ambil baris baru)",
+        value=False,
+        help="Gunakan jika data hanya ditambahkan di bagian bawah worksheet",
+        key="incremental_sync_checkbox"
+    )
+    
+    return lambda: load_data_from_sheets(sheet_id, sheet_name, incremental)
+
+def select_merged_sheets(sheet_options):
+    """Show worksheet selection for a merged load, returns a function that loads it"""
+    selected_spreadsheets = st.multiselect("Pilih Spreadsheet:", list(sheet_options.keys()), key="merge_spreadsheet_multiselect")
+    
+    worksheet_options = {}
+    for spreadsheet_name in selected_spreadsheets:
+        sheet_id = sheet_options[spreadsheet_name]
+        for sheet_name in get_worksheet_names(sheet_id):
+            worksheet_options[f"{spreadsheet_name} / {sheet_name}"] = (sheet_id, sheet_name)
+    
+    selected_worksheets = st.multiselect("Pilih Worksheet:", list(worksheet_options.keys()), key="merge_worksheet_multiselect")
+    if not selected_worksheets:
+        st.info("Pilih minimal satu worksheet untuk dimuat.")
+        return None
+    
+    sources = tuple((*worksheet_options[label], label) for label in selected_worksheets)
+    return lambda: load_merged_sheets(sources)
+
+def select_local_source():
+    """Show local file/folder options, returns a function that loads the selection"""
+    path = st.text_input(
+        "Path file atau folder data:",
+        value=DEFAULT_LOCAL_PATH,
+        help="File CSV/Parquet, atau folder berisi beberapa file CSV/Parquet",
+        key="local_path_input"
+    )
+    
+    pattern = "*"
+    if os.path.isdir(path):
+        pattern = st.text_input("Pola nama file:", value="*", help="Contoh: *.csv atau 2025-*.parquet", key="local_pattern_input")
+    elif not os.path.isfile(path):
+        st.warning("File atau folder tidak ditemukan.")
+        return None
+    
+    return lambda: load_data_from_local(path, pattern, ingest.get_local_modified_time(path, pattern))
+
+def main():
+    """Main application function"""
+    st.title("Visualisasi Data QoE SIGMON Operator Seluler")
+    mark_stage("Tampilan pertama")
+    
+    # Choose where the data comes from
+    source = st.radio("Sumber Data:", [SOURCE_GSHEETS, SOURCE_LOCAL], horizontal=True, key="data_source_radio")
+    
+    if source == SOURCE_LOCAL:
+        load_selected_data = select_local_source()
+    else:
+        load_selected_data = select_sheets_source()
+    mark_stage("Sumber data dipilih")
+    
+    if load_selected_data is None:
+        return
+    
     # Load data button
     if st.button("Muat Data", key="load_data_button"):
-        with st.spinner("Memuat data dari Google Sheets..."):
-            df = load_data_from_sheets(sheet_id, sheet_name)
+        with st.spinner(f"Memuat data dari {source}..."):
+            with perf_span("load_data") as span:
+                df = load_selected_data()
+                span['rows'] = 0 if df is None else len(df)
             
             if df is None or df.empty:
-                st.error("Tidak dapat memuat data dari spreadsheet atau spreadsheet kosong.")
+                st.error("Tidak dapat memuat data dari sumber data atau data kosong.")
                 return
             
             # Save DataFrame to session_state for access in other parts
             st.session_state['df'] = df
+            st.session_state['dataset_version'] = dataset_version(df)
+            mark_stage("Data dimuat")
             
             # Display raw data
             st.subheader("Data mentah")
             st.dataframe(df)
             
-            # Process data
-            process_data(df)
+            # Memory used per column by the typed schema
+            report = memory_usage_report(df)
+            if report is not None:
+                with st.expander("Penggunaan Memori per Kolom"):
+                    st.dataframe(report)
     
-    # If data was previously loaded, display it
+    # Display the loaded data (processed once per run)
     if 'df' in st.session_state:
-        process_data(st.session_state['df'])
+        process_data(st.session_state['df'], st.session_state['dataset_version'])
+        mark_stage("Dashboard")
 
-def process_data(df):
+def process_data(df, dataset_version):
     """Process and display data visualizations"""
     # Ensure date column is available and properly formatted
     if 'Tanggal' not in df.columns:
@@ -859,28 +941,30 @@ def process_data(df):
         st.warning("Kolom 'Latitude' dan/atau 'Longitude' tidak ditemukan dalam data.")
         return
     
+    # Filter index of the loaded dataset
+    index = get_filter_index(df, dataset_version)
+    selections = {}
+    
     # Month filter
-    bulan_unik = ['Semua'] + sorted(df['Bulan'].unique().tolist())
+    bulan_unik = ['Semua'] + lookup_values(index, 'Bulan', selections)
     bulan_terpilih = st.selectbox("Pilih Bulan:", bulan_unik, index=0, key="process_data_month_select_primary")
     
-    if bulan_terpilih == 'Semua':
-        df_filtered = df.copy()
-    else:
-        df_filtered = df[df['Bulan'] == bulan_terpilih]
+    if bulan_terpilih != 'Semua':
+        selections['Bulan'] = [bulan_terpilih]
         
     # District/City filter
     if 'Kabupaten/Kota' in df.columns:
-        kabupaten_unik = sorted(df_filtered['Kabupaten/Kota'].unique().tolist())
+        kabupaten_unik = lookup_values(index, 'Kabupaten/Kota', selections)
         kabupaten_terpilih = st.multiselect("Pilih Kabupaten/Kota:", kabupaten_unik, default=kabupaten_unik, key="district_multiselect_main")
         
         if kabupaten_terpilih:
-            df_filtered = df_filtered[df_filtered['Kabupaten/Kota'].isin(kabupaten_terpilih)]
+            selections['Kabupaten/Kota'] = kabupaten_terpilih
     else:
         st.warning("Kolom 'Kabupaten/Kota' tidak ditemukan dalam data.")
     
-    # Split data by measurement type
-    df_route_all = df_filtered[df_filtered['Jenis Pengukuran'] == 'Route Test'].copy()
-    df_static_all = df_filtered[df_filtered['Jenis Pengukuran'] == 'Static Test'].copy()
+    # Split selections by measurement type
+    selections_route = {**selections, 'Jenis Pengukuran': ['Route Test']}
+    selections_static = {**selections, 'Jenis Pengukuran': ['Static Test']}
     
     # Location filters for Route Test and Static Test
     st.subheader("Filter Lokasi")
@@ -891,7 +975,7 @@ def process_data(df):
         st.markdown('<div class="route-test-header">Route Test</div>', unsafe_allow_html=True)
         st.markdown('<div class="filter-container">', unsafe_allow_html=True)
         
-        lokasi_route_unik = sorted(df_route_all['Alamat'].unique().tolist()) if not df_route_all.empty else []
+        lokasi_route_unik = lookup_values(index, 'Alamat', selections_route)
         lokasi_route_terpilih = st.multiselect(
             "Pilih Lokasi Route Test:", 
             lokasi_route_unik, 
@@ -904,7 +988,7 @@ def process_data(df):
         st.markdown('<div class="static-test-header">Static Test</div>', unsafe_allow_html=True)
         st.markdown('<div class="filter-container">', unsafe_allow_html=True)
         
-        lokasi_static_unik = sorted(df_static_all['Alamat'].unique().tolist()) if not df_static_all.empty else []
+        lokasi_static_unik = lookup_values(index, 'Alamat', selections_static)
         lokasi_static_terpilih = st.multiselect(
             "Pilih Lokasi Static Test:", 
             lokasi_static_unik, 
@@ -913,13 +997,13 @@ def process_data(df):
         )
         st.markdown('</div>', unsafe_allow_html=True)
     
-    # Filter data by selected locations
-    df_route_test = df_route_all[df_route_all['Alamat'].isin(lokasi_route_terpilih)] if lokasi_route_terpilih else pd.DataFrame()
-    df_static_test = df_static_all[df_static_all['Alamat'].isin(lokasi_static_terpilih)] if lokasi_static_terpilih else pd.DataFrame()
+    # Filter data by selected locations (no location selected means no data)
+    selections_route['Alamat'] = lokasi_route_terpilih
+    selections_static['Alamat'] = lokasi_static_terpilih
     
     # Parameter selection for Route Test
     st.sidebar.subheader("Parameter Route Test")
-    parameter_unik_route = sorted(df_route_test['Parameter'].unique().tolist()) if not df_route_test.empty else []
+    parameter_unik_route = lookup_values(index, 'Parameter', selections_route)
     parameter_terpilih_route = st.sidebar.selectbox(
         "Pilih Parameter Route Test:", 
         parameter_unik_route if parameter_unik_route else ['Tidak ada data'], 
@@ -928,68 +1012,374 @@ def process_data(df):
     
     # Parameter selection for Static Test
     st.sidebar.subheader("Parameter Static Test")
-    parameter_unik_static = sorted(df_static_test['Parameter'].unique().tolist()) if not df_static_test.empty else []
+    parameter_unik_static = lookup_values(index, 'Parameter', selections_static)
     parameter_terpilih_static = st.sidebar.selectbox(
         "Pilih Parameter Static Test:", 
         parameter_unik_static if parameter_unik_static else ['Tidak ada data'], 
         key="static_param_select_sidebar"
     )
     
-    # Map display options
-    st.sidebar.subheader("Opsi Peta")
-    show_coordinates = st.sidebar.checkbox("Tampilkan Koordinat pada Peta", value=True, key="show_coords_checkbox_sidebar")
-    coordinate_format = st.sidebar.radio(
+    # Coordinate display options, shared by the map and the comparison tables
+    st.sidebar.subheader("Opsi Koordinat")
+    st.sidebar.checkbox("Tampilkan Koordinat pada Peta", value=True, key="show_coords_checkbox_sidebar")
+    st.sidebar.radio(
         "Format Koordinat", 
         ["Desimal (DD.DDDDDD)", "Derajat-Menit-Detik (DD°MM'SS\")"], 
         index=0, 
         key="coord_format_radio_sidebar"
     )
     
-    # Create two columns for charts
-    col1, col2 = st.columns(2)
+    # Dashboard panels; only the open tab computes its data
+    (tab_route, tab_static, tab_map, tab_comparison, tab_periods, tab_trend, tab_distribution,
+     tab_score) = st.tabs(DASHBOARD_TABS, key="dashboard_tabs", on_change="rerun")
     
-    # Display Route Test chart
-    with col1:
-        st.subheader(f"Grafik {parameter_terpilih_route} (Route Test)")
-        df_plot_route = create_barchart(df_route_test, parameter_terpilih_route, "Route Test")
-        
-    # Display Static Test chart
-    with col2:
-        st.subheader(f"Grafik {parameter_terpilih_static} (Static Test)")
-        df_plot_static = create_barchart(df_static_test, parameter_terpilih_static, "Static Test")
+    if tab_route.open:
+        with tab_route:
+            chart_panel(df, dataset_version, selections_route, parameter_terpilih_route, "Route Test")
+    
+    if tab_static.open:
+        with tab_static:
+            chart_panel(df, dataset_version, selections_static, parameter_terpilih_static, "Static Test")
+    
+    if tab_map.open:
+        with tab_map:
+            map_panel(df, dataset_version, selections_route, selections_static, parameter_terpilih_route, parameter_terpilih_static)
+            spatial_panel(df, dataset_version)
+    
+    if tab_comparison.open:
+        with tab_comparison:
+            comparison_panel(df, dataset_version, selections_route, selections_static, parameter_terpilih_route, parameter_terpilih_static)
+    
+    if tab_periods.open:
+        with tab_periods:
+            # Periods usually span several months, so the month filter is not applied
+            period_panel(df, dataset_version, {k: v for k, v in selections.items() if k != 'Bulan'})
+    
+    if tab_trend.open:
+        with tab_trend:
+            trend_panel(df, dataset_version)
+    
+    if tab_distribution.open:
+        with tab_distribution:
+            distribution_panel(df, dataset_version, selections_route, selections_static, parameter_terpilih_route, parameter_terpilih_static)
+    
+    if tab_score.open:
+        with tab_score:
+            score_panel(df, dataset_version, selections)
+
+# ====== DASHBOARD PANELS ======
+#
+# Each panel is a fragment: it is only called while its tab is open, and a
+# change to one of its own widgets reruns just that panel.
+
+DASHBOARD_TABS = ["Grafik Route Test", "Grafik Static Test", "Peta Gabungan", "Perbandingan Operator", "Before/After", "Tren", "Distribusi", "Skor Operator"]
+
+def select_parameter_rows(df, dataset_version, selections, parameter):
+    """Long-format rows of one parameter for a filter state"""
+    with perf_span("filter") as span:
+        index = get_filter_index(df, dataset_version)
+        long_data = get_long_table(df, dataset_version)
+        rows = select_long_rows(long_data, lookup_rows(index, {**selections, 'Parameter': [parameter]}))
+        span['rows'] = len(rows)
+    return rows
+
+@st.fragment
+def chart_panel(df, dataset_version, selections, parameter, test_type):
+    """Bar chart of the selected parameter for one test type"""
+    st.subheader(f"Grafik {parameter} ({test_type})")
+    df_plot = select_parameter_rows(df, dataset_version, selections, parameter)
+    
+    # Large-data mode options for many locations
+    mode, top_n = None, BARCHART_TOP_N
+    if df_plot['Alamat'].nunique() > BARCHART_MAX_LOCATIONS:
+        col_mode, col_n = st.columns(2)
+        with col_mode:
+            mode = st.radio("Tampilan lokasi:", BARCHART_LARGE_MODES, horizontal=True, key=f"bar_mode_radio_{test_type}")
+        if mode == "Top/Bottom N":
+            with col_n:
+                top_n = st.number_input("N:", min_value=1, max_value=BARCHART_MAX_LOCATIONS, value=BARCHART_TOP_N, key=f"bar_top_n_{test_type}")
     
-    # Display combined map
+    with perf_span("create_barchart", len(df_plot)):
+        create_barchart(df_plot, parameter, test_type, mode, top_n)
+
+@st.fragment
+def map_panel(df, dataset_version, selections_route, selections_static, param_route, param_static):
+    """Combined Route Test and Static Test map"""
     st.subheader("Peta Lokasi QoE SIGMON (Route Test & Static Test)")
-    combined_map = create_combined_map(df_route_test, df_static_test, parameter_terpilih_route, parameter_terpilih_static)
-    if combined_map:
-        combined_map.to_streamlit(height=500)
+    
+    # Map display options
+    col_mode, col_zoom, col_operator = st.columns(3)
+    with col_mode:
+        map_mode = st.radio("Mode Peta", MAP_MODES, index=0, horizontal=True, key="map_mode_radio_sidebar")
+    if map_mode == "Agregasi Grid":
+        with col_zoom:
+            st.slider("Zoom Grid (ukuran sel)", min_value=6, max_value=16, value=12, key="grid_zoom_slider_sidebar")
+        with col_operator:
+            st.selectbox("Warna Grid Berdasarkan Operator", OPERATORS, key="grid_operator_select_sidebar")
+    
+    map_key = map_cache_key(
+        dataset_version, param_route, param_static, selections_route, selections_static,
+        st.session_state.get('coord_format_radio_sidebar'), st.session_state.get('show_coords_checkbox_sidebar'),
+        map_mode, st.session_state.get('grid_zoom_slider_sidebar'), st.session_state.get('grid_operator_select_sidebar')
+    )
+    map_html = get_cached_map_html(map_key)
+    if map_html is None:
+        df_route_test = select_parameter_rows(df, dataset_version, selections_route, param_route)
+        df_static_test = select_parameter_rows(df, dataset_version, selections_static, param_static)
+        map_rows = len(df_route_test) + len(df_static_test)
+        with perf_span("create_combined_map", map_rows):
+            combined_map = maps.create_combined_map(
+                df_route_test, df_static_test, param_route, param_static,
+                show_coordinates=st.session_state.get('show_coords_checkbox_sidebar', True),
+                coordinate_format=selected_coordinate_format(),
+                map_mode=map_mode,
+                grid_zoom=st.session_state.get('grid_zoom_slider_sidebar', 12),
+                color_operator=st.session_state.get('grid_operator_select_sidebar', OPERATORS[0])
+            )
+        if combined_map:
+            with perf_span("to_html", map_rows) as span:
+                map_html = combined_map.to_html()
+                span['bytes'] = len(map_html)
+            put_cached_map_html(map_key, map_html)
+    if map_html:
+        st.iframe(map_html, height=500)
     else:
         st.write("Tidak ada data untuk ditampilkan pada peta gabungan.")
+
+@st.fragment
+def spatial_panel(df, dataset_version):
+    """Nearest sites, radius search and co-located points around a coordinate"""
+    with st.expander("Pencarian Spasial", key="spatial_search_expander", on_change="rerun") as expander:
+        if not expander.open:
+            return
+        
+        spatial_index = get_spatial_index(df, dataset_version)
+        if len(spatial_index['positions']) == 0:
+            st.info("Tidak ada koordinat yang valid dalam data.")
+            return
+        
+        col_lat, col_lon, col_radius = st.columns(3)
+        with col_lat:
+            lat = st.number_input("Latitude:", value=float(np.nanmean(spatial_index['lat'])), format="%.6f", key="spatial_lat_input")
+        with col_lon:
+            lon = st.number_input("Longitude:", value=float(np.nanmean(spatial_index['lon'])), format="%.6f", key="spatial_lon_input")
+        with col_radius:
+            radius_km = st.number_input("Radius (km):", min_value=0.0, value=1.0, step=0.5, key="spatial_radius_input")
+        
+        # Nearest measurement site
+        nearest, nearest_distance = nearest_points(spatial_index, lat, lon)
+        if len(nearest):
+            site = df.iloc[nearest[0]]
+            st.markdown(f"**Lokasi terdekat:** {site['Alamat']} ({site['Jenis Pengukuran']}, {nearest_distance[0]:.3f} km)")
+        
+        # All measurements within the radius
+        positions, distances = radius_query(spatial_index, lat, lon, radius_km)
+        st.markdown(f"##### {len(positions)} pengukuran dalam radius {radius_km:g} km")
+        if len(positions):
+            columns = [c for c in ['Alamat', 'Jenis Pengukuran', 'Parameter', 'Tanggal_str', 'Koordinat', 'Kabupaten/Kota'] + OPERATORS if c in df.columns]
+            st.dataframe(df.iloc[positions][columns].assign(**{'Jarak (km)': distances}))
         
-    # Location comparison summary
+        # Co-located points, e.g. Route Test rows reusing Static Test coordinates
+        tolerance_m = st.number_input("Toleransi titik berdekatan (m):", min_value=0, value=0, step=10, key="spatial_tolerance_input")
+        groups = get_colocated_groups(df, dataset_version, tolerance_m / 1000)
+        st.markdown(f"**Lokasi unik:** {groups.max() + 1} dari {int((groups >= 0).sum())} baris berkoordinat")
+
+@st.fragment
+def comparison_panel(df, dataset_version, selections_route, selections_static, param_route, param_static):
+    """Best and worst locations per operator"""
     st.subheader("Ringkasan Perbandingan Parameter Antar Operator")
     
-    # Route Test comparison
-    if not df_route_test.empty and parameter_terpilih_route in df_route_test['Parameter'].values:
-        route_comparison = create_location_comparison(df_route_test, parameter_terpilih_route, "Route Test")
-        if route_comparison is not None:
-            st.markdown(f"##### Perbandingan {parameter_terpilih_route} (Route Test)")
-            st.dataframe(route_comparison)
-        else:
-            st.info(f"Tidak dapat membuat perbandingan untuk {parameter_terpilih_route} (Route Test).")
-    
-    # Static Test comparison
-    if not df_static_test.empty and parameter_terpilih_static in df_static_test['Parameter'].values:
-        static_comparison = create_location_comparison(df_static_test, parameter_terpilih_static, "Static Test")
-        if static_comparison is not None:
-            st.markdown(f"##### Perbandingan {parameter_terpilih_static} (Static Test)")
-            st.dataframe(static_comparison)
+    # Rankings for every parameter of the current filter state
+    top_n = st.number_input(
+        "Jumlah lokasi tertinggi/terendah:", min_value=1, max_value=20, value=3, key="ranking_top_n_sidebar"
+    )
+    route_ranking = get_location_ranking(df, dataset_version, selections_route, top_n)
+    static_ranking = get_location_ranking(df, dataset_version, selections_static, top_n)
+    
+    # Comparison of the selected parameter per test type
+    index = get_filter_index(df, dataset_version)
+    for ranking, selections, parameter, test_type in (
+        (route_ranking, selections_route, param_route, "Route Test"),
+        (static_ranking, selections_static, param_static, "Static Test")
+    ):
+        if parameter not in lookup_values(index, 'Parameter', selections):
+            continue
+        comparison = create_location_comparison(ranking, parameter, test_type)
+        if comparison is not None:
+            st.markdown(f"##### Perbandingan {parameter} ({test_type})")
+            st.dataframe(comparison)
         else:
-            st.info(f"Tidak dapat membuat perbandingan untuk {parameter_terpilih_static} (Static Test).")
+            st.info(f"Tidak dapat membuat perbandingan untuk {parameter} ({test_type}).")
+    
+    # Comparison of every parameter, e.g. for monthly reports
+    with st.expander("Perbandingan Semua Parameter"):
+        for ranking, test_type in ((route_ranking, "Route Test"), (static_ranking, "Static Test")):
+            comparison = create_location_comparison(ranking, None, test_type)
+            if comparison is not None:
+                st.markdown(f"##### Semua Parameter ({test_type})")
+                st.dataframe(comparison)
+        
+        st.markdown(f"##### {top_n} Lokasi Tertinggi dan Terendah per Operator")
+        st.dataframe(pd.concat([route_ranking, static_ranking], ignore_index=True))
+
+@st.fragment
+def period_panel(df, dataset_version, selections):
+    """Before/after comparison of two Keterangan periods"""
+    st.subheader("Perbandingan Before/After")
+    
+    if PERIOD_COLUMN not in df.columns:
+        st.info(f"Kolom '{PERIOD_COLUMN}' tidak ditemukan dalam data.")
+        return
+    
+    periods = sorted(str(period) for period in df[PERIOD_COLUMN].dropna().unique())
+    if len(periods) < 2:
+        st.info("Data hanya memiliki satu periode pengukuran.")
+        return
+    
+    # Default to the "Before ..." and "After ..." periods when present
+    before_default = next((i for i, period in enumerate(periods) if 'before' in period.lower()), 0)
+    after_default = next((i for i, period in enumerate(periods) if 'after' in period.lower()), 1)
+    
+    col_before, col_after, col_distance = st.columns(3)
+    with col_before:
+        before = st.selectbox("Periode Sebelum:", periods, index=before_default, key="period_before_select")
+    with col_after:
+        after = st.selectbox("Periode Sesudah:", periods, index=after_default, key="period_after_select")
+    with col_distance:
+        max_distance_km = st.number_input(
+            "Jarak maksimum pencocokan (km):", min_value=0.0, max_value=50.0, value=NEAREST_MATCH_KM, step=0.1,
+            key="period_distance_input"
+        )
+    
+    comparison = get_period_comparison(df, dataset_version, selections, before, after, max_distance_km)
+    if comparison.empty:
+        st.info("Tidak ada lokasi yang dapat dipasangkan antara kedua periode.")
+        return
+    
+    col_type, col_parameter = st.columns(2)
+    with col_type:
+        test_type = st.selectbox(
+            "Jenis Pengukuran:", list(comparison['Jenis Pengukuran'].unique()), key="period_test_type_select"
+        )
+    with col_parameter:
+        parameters = comparison.loc[comparison['Jenis Pengukuran'] == test_type, 'Parameter'].unique()
+        parameter = st.selectbox("Parameter:", list(parameters), key="period_parameter_select")
+    
+    selected = comparison[(comparison['Jenis Pengukuran'] == test_type) & (comparison['Parameter'] == parameter)]
+    create_period_diff_chart(selected, parameter, test_type)
+    
+    diff_map = maps.create_period_diff_map(selected, parameter)
+    if diff_map:
+        st.iframe(diff_map.to_html(), height=500)
+    
+    st.dataframe(selected)
+
+@st.fragment
+def trend_panel(df, dataset_version):
+    """Trend of a parameter over time, read from the precomputed rollups"""
+    st.subheader("Tren Parameter per Periode")
+    
+    col_frequency, col_statistic = st.columns(2)
+    with col_frequency:
+        frequency = st.radio("Periode:", list(ROLLUP_FREQUENCIES), index=0, horizontal=True, key="trend_frequency_radio")
+    with col_statistic:
+        statistic = st.radio("Statistik:", ['Rata-rata', 'P50', 'P90'], index=0, horizontal=True, key="trend_statistic_radio")
+    
+    rollup = get_rollups(df, dataset_version)[frequency]
+    if rollup.empty:
+        st.info("Tidak ada data bertanggal untuk ditampilkan.")
+        return
+    
+    col_type, col_parameter, col_district = st.columns(3)
+    with col_type:
+        test_type = st.selectbox("Jenis Pengukuran:", list(rollup['Jenis Pengukuran'].unique()), key="trend_test_type_select")
+    rollup = rollup[rollup['Jenis Pengukuran'] == test_type]
+    with col_parameter:
+        parameter = st.selectbox("Parameter:", list(rollup['Parameter'].unique()), key="trend_parameter_select")
+    rollup = rollup[rollup['Parameter'] == parameter]
+    if 'Kabupaten/Kota' in rollup.columns:
+        districts = [ALL_DISTRICTS] + sorted(d for d in rollup['Kabupaten/Kota'].unique() if d != ALL_DISTRICTS)
+        with col_district:
+            district = st.selectbox("Kabupaten/Kota:", districts, key="trend_district_select")
+        rollup = rollup[rollup['Kabupaten/Kota'] == district]
+    
+    create_trend_chart(rollup, parameter, statistic, test_type)
+    st.dataframe(rollup)
+
+@st.fragment
+def distribution_panel(df, dataset_version, selections_route, selections_static, param_route, param_static):
+    """Percentiles, box plots and ECDFs per operator"""
+    st.subheader("Distribusi Nilai per Operator")
+    
+    approximate = st.checkbox(
+        "Mode perkiraan (memori terbatas)",
+        value=False,
+        help="Menghitung persentil dengan sketsa kuantil; otomatis dipakai untuk data yang sangat besar",
+        key="distribution_approximate_checkbox"
+    )
+    
+    col1, col2 = st.columns(2)
+    distributions = []
+    for column, selections, parameter, test_type in (
+        (col1, selections_route, param_route, "Route Test"),
+        (col2, selections_static, param_static, "Static Test")
+    ):
+        distribution = get_distribution_summary(df, dataset_version, selections, True if approximate else None)
+        distributions.append(distribution)
+        with column:
+            create_distribution_charts(distribution, parameter, test_type)
+    
+    with st.expander("Ringkasan Distribusi Semua Parameter"):
+        if any(distribution['approximate'] for distribution in distributions):
+            st.caption(f"Persentil diperkirakan dengan galat relatif ±{SKETCH_RELATIVE_ACCURACY:.0%}.")
+        st.dataframe(pd.concat([distribution['summary'] for distribution in distributions], ignore_index=True))
+
+@st.fragment
+def score_panel(df, dataset_version, selections):
+    """Weighted operator scores over all QoE parameters"""
+    st.subheader("Skor Operator Seluruh Parameter")
+    
+    index = get_filter_index(df, dataset_version)
+    parameters = [p for p in lookup_values(index, 'Parameter', selections) if parameter_direction(str(p)) is not None]
+    if not parameters:
+        st.info("Tidak ada parameter yang dapat diberi skor.")
+        return
+    
+    # Parameter weights; 0 leaves a parameter out of the score
+    weights = []
+    with st.expander("Bobot Parameter"):
+        columns = st.columns(min(len(parameters), 4))
+        for i, parameter in enumerate(parameters):
+            direction = "lebih tinggi lebih baik" if parameter_direction(str(parameter)) > 0 else "lebih rendah lebih baik"
+            with columns[i % len(columns)]:
+                weight = st.number_input(
+                    f"{parameter}", min_value=0.0, max_value=10.0, value=1.0, step=0.5,
+                    help=direction, key=f"score_weight_{parameter}"
+                )
+            weights.append((str(parameter), weight))
+    
+    scores = get_operator_scores(df, dataset_version, selections, tuple(weights))
+    
+    # Overall score per operator
+    overall = scores['overall']
+    for column, row in zip(st.columns(max(len(overall), 1)), overall.to_dict('records')):
+        with column:
+            st.metric(str(row['Operator']), f"{row['Skor']:.1f}")
+    
+    create_score_chart(scores['district'])
+    
+    if 'Kabupaten/Kota' in scores['district'].columns:
+        st.markdown("##### Skor per Kabupaten/Kota")
+        st.dataframe(scores['district'].pivot(index='Kabupaten/Kota', columns='Operator', values='Skor'))
+    
+    st.markdown("##### Skor per Lokasi")
+    site_level = [c for c in ['Jenis Pengukuran', 'Kabupaten/Kota', 'Alamat'] if c in scores['site'].columns]
+    st.dataframe(scores['site'].pivot(index=site_level, columns='Operator', values='Skor').reset_index())
 
 # ====== APPLICATION ENTRY POINT ======
 
 if __name__ == "__main__":
+    profiler = start_rerun_profile()
     main()
     
     # Add configuration options
@@ -1018,4 +1408,8 @@ if __name__ == "__main__":
     <div style='text-align: center; margin-top: 30px; padding: 10px; color: #888;'>
         <p>© <b>2025 Aplikasi Visualisasi QoE Kualitas Layanan | Loka Monitor SFR Kendari</b></p>
     </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+    
+    # Cold-start timings and hot-path spans
+    startup_report()
+    performance_panel(profiler)
@@ -0,0 +1,19 @@
+"""Headless QoE data core: ingest, normalize, index, aggregate, compare and map/chart building
+
+Modules:
+    schema       column layout, operators and operator value helpers
+    coordinates  coordinate formatting and distances
+    normalize    typing and enrichment of raw measurement rows
+    ingest       local data files and worksheet snapshots
+    sheets       Google Sheets fetching (imports gspread)
+    index        filter index, long-format table and spatial index
+    aggregate    rankings, grid cells, rollups, distributions and scores
+    compare      Before/After comparison and best/worst location tables
+    charts       Plotly figures (imports plotly)
+    maps         folium/leafmap maps (imports folium and leafmap)
+    perf         timing spans
+    report       batch report of every parameter (python -m qoe_core.report)
+
+Nothing here calls Streamlit. sheets, charts, maps and report pull in
+heavy dependencies, so they are not imported by the package itself.
+"""
@@ -0,0 +1,457 @@
+"""Rankings, grid cells, rollups, distributions and operator scores"""
+import numpy as np
+import pandas as pd
+
+from .index import select_long_rows
+from .schema import PARAMETER_DIRECTIONS
+
+# Groups and location details of the best/worst location ranking
+RANK_KEYS = ['Jenis Pengukuran', 'Parameter', 'Operator']
+RANK_DETAIL_COLUMNS = ['Alamat', 'Kabupaten/Kota', 'Tanggal_str', 'Koordinat', 'Koordinat_DMS']
+
+# ====== LOCATION RANKING ======
+#
+# Highest/lowest locations for every (Jenis Pengukuran, Parameter, Operator)
+# group are found in one pass over the long-format table: rows are sorted
+# once by (group, value, row order) with np.lexsort, and each row's rank
+# within its group is its position minus the group's start. Ties keep the
+# first row in data order, like idxmax/idxmin.
+
+def _rank_within_groups(group_ids, sort_values, top_n):
+    """Positions of the first top_n rows of each group when sorted by sort_values"""
+    order = np.lexsort((np.arange(len(group_ids)), sort_values, group_ids))
+    sorted_groups = group_ids[order]
+    group_starts = np.searchsorted(sorted_groups, sorted_groups, side='left')
+    ranks = np.arange(len(order)) - group_starts
+    keep = ranks < top_n
+    return order[keep], ranks[keep] + 1
+
+def rank_locations(df_long, top_n=1):
+    """Top-N highest and lowest locations per (Jenis Pengukuran, Parameter, Operator)"""
+    data = df_long[df_long['Nilai'].notna()]
+    detail_columns = [c for c in RANK_DETAIL_COLUMNS if c in data.columns]
+    if data.empty:
+        return pd.DataFrame(columns=RANK_KEYS + ['Kategori', 'Peringkat', 'Nilai'] + detail_columns)
+    
+    group_ids = data.groupby(RANK_KEYS, observed=True, sort=True).ngroup().to_numpy()
+    values = data['Nilai'].to_numpy()
+    
+    parts = []
+    for category, sort_values in (('Tertinggi', -values), ('Terendah', values)):
+        positions, ranks = _rank_within_groups(group_ids, sort_values, top_n)
+        part = data[RANK_KEYS + ['Nilai'] + detail_columns].iloc[positions]
+        parts.append(part.assign(Kategori=category, Peringkat=ranks))
+    
+    ranking = pd.concat(parts, ignore_index=True)
+    ranking = ranking.sort_values(RANK_KEYS + ['Kategori', 'Peringkat'], ascending=[True] * 3 + [False, True])
+    return ranking[RANK_KEYS + ['Kategori', 'Peringkat', 'Nilai'] + detail_columns].reset_index(drop=True)
+
+# ====== GRID AGGREGATION ======
+#
+# Dense campaigns are summarised on a square grid instead of individual points.
+# The cell size follows the zoom level it is meant to be read at: one cell spans
+# GRID_CELL_PIXELS screen pixels of a 256-pixel web-map tile at that zoom. Cells
+# are found by flooring the coordinates, and per (cell, operator) statistics are
+# reduced with np.*.reduceat over one lexsort, so the map payload scales with
+# the number of occupied cells rather than the number of samples.
+
+MAP_MODES = ["Titik Pengukuran", "Agregasi Grid"]
+GRID_CELL_PIXELS = 32
+
+def grid_cell_size(zoom):
+    """Cell size in degrees for the given web-map zoom level"""
+    return 360.0 / (256 * 2 ** zoom) * GRID_CELL_PIXELS
+
+def parameter_direction(parameter):
+    """1 if higher values are better, -1 if lower are better, None if unknown"""
+    if parameter in PARAMETER_DIRECTIONS:
+        return PARAMETER_DIRECTIONS[parameter]
+    if '(Mbps)' in parameter:
+        return 1
+    if '(ms)' in parameter:
+        return -1
+    return None
+
+def aggregate_grid(df_long, cell_size):
+    """Mean, min, max and count of Nilai per grid cell and operator"""
+    data = df_long[df_long['Nilai'].notna() & df_long['Latitude'].notna() & df_long['Longitude'].notna()]
+    columns = ['cell_lat', 'cell_lon', 'Operator', 'Rata-rata', 'Minimum', 'Maksimum', 'Jumlah']
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+    
+    cell_lat = np.floor(data['Latitude'].to_numpy(dtype=float) / cell_size).astype(np.int64)
+    cell_lon = np.floor(data['Longitude'].to_numpy(dtype=float) / cell_size).astype(np.int64)
+    operator_codes = data['Operator'].cat.codes.to_numpy()
+    values = data['Nilai'].to_numpy(dtype=float)
+    
+    # Sort by (cell, operator) and reduce every run of equal keys
+    order = np.lexsort((operator_codes, cell_lon, cell_lat))
+    cell_lat, cell_lon = cell_lat[order], cell_lon[order]
+    operator_codes, values = operator_codes[order], values[order]
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = ((cell_lat[1:] != cell_lat[:-1]) | (cell_lon[1:] != cell_lon[:-1])
+                     | (operator_codes[1:] != operator_codes[:-1]))
+    starts = np.flatnonzero(new_group)
+    counts = np.diff(np.append(starts, len(order)))
+    
+    return pd.DataFrame({
+        'cell_lat': cell_lat[starts],
+        'cell_lon': cell_lon[starts],
+        'Operator': pd.Categorical.from_codes(operator_codes[starts], dtype=data['Operator'].dtype),
+        'Rata-rata': np.add.reduceat(values, starts) / counts,
+        'Minimum': np.minimum.reduceat(values, starts),
+        'Maksimum': np.maximum.reduceat(values, starts),
+        'Jumlah': counts
+    }, columns=columns)
+
+# ====== TIME-SERIES ROLLUPS ======
+#
+# Daily, weekly and monthly rollups of every (Kabupaten/Kota, Jenis
+# Pengukuran, Parameter, Operator) series are built once per dataset version.
+# Every row is counted once for its own district and once for ALL_DISTRICTS,
+# so region-wide percentiles come from the raw values as well. Trend charts
+# only read these rollups.
+
+ROLLUP_FREQUENCIES = {'Harian': 'D', 'Mingguan': 'W', 'Bulanan': 'M'}
+ROLLUP_KEYS = ['Kabupaten/Kota', 'Jenis Pengukuran', 'Parameter', 'Operator']
+ROLLUP_STATISTICS = ['Rata-rata', 'P50', 'P90', 'Jumlah']
+ALL_DISTRICTS = 'Semua'
+
+def build_rollups(df_long):
+    """Mean, p50, p90 and count per period for every rollup frequency"""
+    keys = [key for key in ROLLUP_KEYS if key in df_long.columns]
+    data = df_long.loc[df_long['Nilai'].notna() & df_long['Tanggal'].notna(), ['Tanggal'] + keys + ['Nilai']]
+    
+    if 'Kabupaten/Kota' in keys:
+        districts = data['Kabupaten/Kota'].astype(object)
+        data = pd.concat([
+            data.assign(**{'Kabupaten/Kota': districts}),
+            data.assign(**{'Kabupaten/Kota': ALL_DISTRICTS})
+        ], ignore_index=True)
+        data['Kabupaten/Kota'] = data['Kabupaten/Kota'].astype('category')
+    
+    rollups = {}
+    for label, frequency in ROLLUP_FREQUENCIES.items():
+        periods = data['Tanggal'].dt.to_period(frequency).dt.start_time.rename('Periode')
+        grouped = data.groupby([periods] + keys, observed=True)['Nilai']
+        rollup = grouped.agg(['mean', 'median', 'count'])
+        rollup['p90'] = grouped.quantile(0.9)
+        rollup = rollup.rename(columns={'mean': 'Rata-rata', 'median': 'P50', 'p90': 'P90', 'count': 'Jumlah'})
+        rollups[label] = rollup[ROLLUP_STATISTICS].reset_index()
+    return rollups
+
+# ====== DISTRIBUTION SUMMARIES ======
+#
+# Exact mode sorts the long rows once by (group, value); every percentile of
+# every group is then read by index arithmetic with linear interpolation (as
+# np.quantile does), and means/standard deviations come from np.bincount. The
+# ECDF is kept as the quantile function at ECDF_PROBABILITIES, so its size does
+# not grow with the data.
+#
+# Above DISTRIBUTION_EXACT_MAX_ROWS rows the long rows are streamed in chunks
+# through a relative-error quantile sketch (log-spaced buckets as in DDSketch):
+# memory is bounded by the chunk size plus the occupied buckets per group, and
+# every quantile is within SKETCH_RELATIVE_ACCURACY of a true sample value.
+# selected_distribution builds each chunk from the filter index positions, so
+# a selection is never materialized as one frame in streaming mode.
+
+DISTRIBUTION_KEYS = ['Jenis Pengukuran', 'Parameter', 'Operator']
+DISTRIBUTION_QUANTILES = {'P5': 0.05, 'P25': 0.25, 'P50': 0.5, 'P75': 0.75, 'P95': 0.95}
+DISTRIBUTION_COLUMNS = ['Jumlah', 'Rata-rata', 'Std', 'Min'] + list(DISTRIBUTION_QUANTILES) + ['Maks']
+ECDF_PROBABILITIES = np.linspace(0, 1, 101)
+DISTRIBUTION_EXACT_MAX_ROWS = 2_000_000
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_CHUNK_ROWS = 500_000
+SKETCH_MIN_VALUE = 1e-9
+SKETCH_BUCKET_OFFSET = 1 << 20
+
+def _distribution_frames(key_frame, stats, quantiles, approximate):
+    """Assemble the summary and ECDF frames of a distribution result"""
+    summary = key_frame.copy()
+    for column in ['Jumlah', 'Rata-rata', 'Std', 'Min', 'Maks']:
+        summary[column] = stats[column]
+    columns = list(DISTRIBUTION_QUANTILES)
+    positions = [int(np.argmin(np.abs(ECDF_PROBABILITIES - p))) for p in DISTRIBUTION_QUANTILES.values()]
+    for column, position in zip(columns, positions):
+        summary[column] = quantiles[:, position]
+    
+    ecdf = key_frame.loc[np.repeat(np.arange(len(key_frame)), len(ECDF_PROBABILITIES))].reset_index(drop=True)
+    ecdf['Probabilitas'] = np.tile(ECDF_PROBABILITIES, len(key_frame))
+    ecdf['Nilai'] = quantiles.ravel()
+    return {'summary': summary[DISTRIBUTION_KEYS + DISTRIBUTION_COLUMNS], 'ecdf': ecdf, 'approximate': approximate}
+
+def _exact_distribution(data):
+    """Distribution of every group from one sort of the values"""
+    grouped = data.groupby(DISTRIBUTION_KEYS, observed=True, sort=True)
+    group_ids = grouped.ngroup().to_numpy()
+    key_frame = grouped.size().reset_index()[DISTRIBUTION_KEYS]
+    values = data['Nilai'].to_numpy(dtype=float)
+    
+    order = np.lexsort((values, group_ids))
+    sorted_values = values[order]
+    counts = np.bincount(group_ids, minlength=len(key_frame))
+    starts = np.cumsum(counts) - counts
+    
+    # Linear interpolation between the two closest order statistics
+    h = ECDF_PROBABILITIES[None, :] * (counts[:, None] - 1)
+    low = np.floor(h).astype(np.int64)
+    high = np.minimum(low + 1, counts[:, None] - 1)
+    low_values = sorted_values[starts[:, None] + low]
+    quantiles = low_values + (sorted_values[starts[:, None] + high] - low_values) * (h - low)
+    
+    mean = np.bincount(group_ids, weights=values, minlength=len(key_frame)) / counts
+    squares = np.bincount(group_ids, weights=(values - mean[group_ids]) ** 2, minlength=len(key_frame))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+    
+    stats = {
+        'Jumlah': counts, 'Rata-rata': mean, 'Std': std,
+        'Min': sorted_values[starts], 'Maks': sorted_values[starts + counts - 1]
+    }
+    return _distribution_frames(key_frame, stats, quantiles, approximate=False)
+
+def new_quantile_sketch(relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+    """Empty streaming quantile sketch"""
+    return {'gamma': (1 + relative_accuracy) / (1 - relative_accuracy), 'groups': {}, 'categories': {}}
+
+def _sketch_buckets(values, gamma):
+    """Signed log-bucket of every value, 0 for values near zero"""
+    magnitude = np.abs(values)
+    index = np.ceil(np.log(np.maximum(magnitude, SKETCH_MIN_VALUE)) / np.log(gamma)).astype(np.int64)
+    return np.where(magnitude < SKETCH_MIN_VALUE, 0, np.sign(values).astype(np.int64) * (index + SKETCH_BUCKET_OFFSET))
+
+def _sketch_bucket_values(buckets, gamma):
+    """Representative value of every signed log-bucket"""
+    index = np.abs(buckets) - SKETCH_BUCKET_OFFSET
+    return np.sign(buckets) * 2 * np.power(gamma, index.astype(float)) / (gamma + 1)
+
+def update_quantile_sketch(sketch, df_long):
+    """Add a chunk of long-format rows to a quantile sketch"""
+    data = df_long[df_long['Nilai'].notna()]
+    if data.empty:
+        return sketch
+    
+    # Category order of categorical keys, so groups come out in the same order as in exact mode
+    for column in DISTRIBUTION_KEYS:
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            known = sketch['categories'].get(column, [])
+            sketch['categories'][column] = list(dict.fromkeys(known + data[column].cat.categories.tolist()))
+    
+    grouped = data.groupby(DISTRIBUTION_KEYS, observed=True, sort=True)
+    group_ids = grouped.ngroup().to_numpy()
+    group_keys = list(grouped.size().index)
+    values = data['Nilai'].to_numpy(dtype=float)
+    buckets = _sketch_buckets(values, sketch['gamma'])
+    
+    size = len(group_keys)
+    counts = np.bincount(group_ids, minlength=size)
+    sums = np.bincount(group_ids, weights=values, minlength=size)
+    squares = np.bincount(group_ids, weights=values ** 2, minlength=size)
+    minimums = grouped['Nilai'].min().to_numpy(dtype=float)
+    maximums = grouped['Nilai'].max().to_numpy(dtype=float)
+    
+    # Count (group, bucket) pairs through one packed int64 key
+    shift = 2 * SKETCH_BUCKET_OFFSET
+    pairs, pair_counts = np.unique(group_ids.astype(np.int64) * (2 * shift) + buckets + shift, return_counts=True)
+    
+    for group_id, key in enumerate(group_keys):
+        group = sketch['groups'].setdefault(key, {
+            'buckets': {}, 'count': 0, 'sum': 0.0, 'squares': 0.0, 'min': np.inf, 'max': -np.inf
+        })
+        group['count'] += int(counts[group_id])
+        group['sum'] += sums[group_id]
+        group['squares'] += squares[group_id]
+        group['min'] = min(group['min'], minimums[group_id])
+        group['max'] = max(group['max'], maximums[group_id])
+    
+    for pair, count in zip(pairs.tolist(), pair_counts.tolist()):
+        group_id, bucket = divmod(pair, 2 * shift)
+        bucket -= shift
+        group_buckets = sketch['groups'][group_keys[group_id]]['buckets']
+        group_buckets[bucket] = group_buckets.get(bucket, 0) + count
+    return sketch
+
+def sketch_distribution(sketch):
+    """Distribution of every group of a quantile sketch"""
+    key_frame = pd.DataFrame(list(sketch['groups']), columns=DISTRIBUTION_KEYS)
+    for column in DISTRIBUTION_KEYS:
+        key_frame[column] = pd.Categorical(key_frame[column], categories=sketch['categories'].get(column))
+    key_frame = key_frame.sort_values(DISTRIBUTION_KEYS, ignore_index=True)
+    keys = list(key_frame.itertuples(index=False, name=None))
+    quantiles = np.empty((len(keys), len(ECDF_PROBABILITIES)))
+    stats = {column: np.empty(len(keys)) for column in ['Jumlah', 'Rata-rata', 'Std', 'Min', 'Maks']}
+    
+    for row, key in enumerate(keys):
+        group = sketch['groups'][key]
+        buckets = np.array(sorted(group['buckets']), dtype=np.int64)
+        cumulative = np.cumsum([group['buckets'][bucket] for bucket in buckets])
+        ranks = ECDF_PROBABILITIES * (group['count'] - 1)
+        values = _sketch_bucket_values(buckets[np.searchsorted(cumulative, ranks, side='right')], sketch['gamma'])
+        quantiles[row] = np.clip(values, group['min'], group['max'])
+        
+        count = group['count']
+        mean = group['sum'] / count
+        variance = (group['squares'] - count * mean ** 2) / (count - 1) if count > 1 else np.nan
+        stats['Jumlah'][row] = count
+        stats['Rata-rata'][row] = mean
+        stats['Std'][row] = np.sqrt(max(variance, 0.0)) if count > 1 else np.nan
+        stats['Min'][row] = group['min']
+        stats['Maks'][row] = group['max']
+    
+    stats['Jumlah'] = stats['Jumlah'].astype(np.int64)
+    return _distribution_frames(key_frame, stats, quantiles, approximate=True)
+
+def _empty_distribution(approximate):
+    """Distribution result without any values"""
+    return {
+        'summary': pd.DataFrame(columns=DISTRIBUTION_KEYS + DISTRIBUTION_COLUMNS),
+        'ecdf': pd.DataFrame(columns=DISTRIBUTION_KEYS + ['Probabilitas', 'Nilai']),
+        'approximate': approximate
+    }
+
+def stream_distribution(chunks):
+    """Distribution of long-format row chunks fed one by one through a quantile sketch"""
+    sketch = new_quantile_sketch()
+    for chunk in chunks:
+        update_quantile_sketch(sketch, chunk)
+    if not sketch['groups']:
+        return _empty_distribution(approximate=True)
+    return sketch_distribution(sketch)
+
+def distribution_summary(df_long, approximate=None):
+    """Percentiles, mean, std, count and ECDF per (Jenis Pengukuran, Parameter, Operator)
+    
+    approximate=None picks the streaming sketch only above DISTRIBUTION_EXACT_MAX_ROWS rows.
+    """
+    data = df_long[df_long['Nilai'].notna()]
+    if approximate is None:
+        approximate = len(data) > DISTRIBUTION_EXACT_MAX_ROWS
+    
+    if data.empty:
+        return _empty_distribution(approximate)
+    
+    if not approximate:
+        return _exact_distribution(data)
+    return stream_distribution(
+        data.iloc[start:start + SKETCH_CHUNK_ROWS] for start in range(0, len(data), SKETCH_CHUNK_ROWS)
+    )
+
+def selected_distribution(long_data, positions, approximate=None):
+    """distribution_summary of the long rows of some wide row positions
+    
+    The sketch is fed straight from the positions, a chunk of long rows at a
+    time, so the selection is never copied out of the long table as a whole.
+    """
+    operators = max(len(long_data['operators']), 1)
+    if approximate is None:
+        approximate = len(positions) * operators > DISTRIBUTION_EXACT_MAX_ROWS
+    if not approximate:
+        return distribution_summary(select_long_rows(long_data, positions), approximate=False)
+    
+    chunk = max(SKETCH_CHUNK_ROWS // operators, 1)
+    return stream_distribution(
+        select_long_rows(long_data, positions[start:start + chunk]) for start in range(0, len(positions), chunk)
+    )
+
+# ====== OPERATOR SCORING ======
+#
+# Every scored parameter is normalized to 0-100 between its 5th and 95th
+# percentile (clipped, so single outliers such as a 2000 ms ping do not squash
+# the scale) and flipped when lower is better. Scores are averaged per
+# parameter first and then combined with the parameter weights, so parameters
+# with more samples do not dominate a site's or district's score.
+
+SCORE_BOUNDS = (0.05, 0.95)
+
+def normalized_scores(df_long):
+    """Scored long rows with a 0-100 Skor column, higher always better"""
+    data = df_long[df_long['Nilai'].notna()]
+    directions = {p: parameter_direction(str(p)) for p in data['Parameter'].unique()}
+    data = data[data['Parameter'].map(directions).notna().to_numpy()]
+    if data.empty:
+        return data.assign(Skor=pd.Series(dtype=float))
+    
+    bounds = data.groupby('Parameter', observed=True)['Nilai'].quantile(list(SCORE_BOUNDS)).unstack()
+    low = data['Parameter'].map(bounds[SCORE_BOUNDS[0]]).to_numpy(dtype=float)
+    high = data['Parameter'].map(bounds[SCORE_BOUNDS[1]]).to_numpy(dtype=float)
+    direction = data['Parameter'].map(directions).to_numpy(dtype=float)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = np.clip((data['Nilai'].to_numpy(dtype=float) - low) / (high - low), 0, 1)
+    scaled = np.where(direction > 0, scaled, 1 - scaled)
+    
+    # A parameter without spread separates nobody: neutral score in either direction
+    scaled = np.where(high > low, scaled, 0.5)
+    return data.assign(Skor=scaled * 100)
+
+def _weighted_scores(scored, level, weights):
+    """Weighted operator score per group of level columns"""
+    per_parameter = scored.groupby(level + ['Parameter', 'Operator'], observed=True)['Skor'].mean().reset_index()
+    per_parameter['Bobot'] = per_parameter['Parameter'].astype(str).map(weights).fillna(1.0).astype(float)
+    per_parameter = per_parameter[per_parameter['Bobot'] > 0]
+    per_parameter['Bobot x Skor'] = per_parameter['Bobot'] * per_parameter['Skor']
+    
+    grouped = per_parameter.groupby(level + ['Operator'], observed=True)
+    result = grouped[['Bobot x Skor', 'Bobot']].sum()
+    result['Skor'] = result['Bobot x Skor'] / result['Bobot']
+    result['Jumlah Parameter'] = grouped['Parameter'].nunique()
+    return result[['Skor', 'Jumlah Parameter']].reset_index()
+
+def score_operators(df_long, weights=None):
+    """Operator scores per site, per district and overall
+    
+    weights maps parameter names to weights (default 1, 0 leaves a parameter out).
+    """
+    weights = dict(weights or {})
+    scored = normalized_scores(df_long)
+    site_level = [c for c in ['Jenis Pengukuran', 'Kabupaten/Kota', 'Alamat'] if c in scored.columns]
+    district_level = [c for c in ['Kabupaten/Kota'] if c in scored.columns]
+    return {
+        'site': _weighted_scores(scored, site_level, weights),
+        'district': _weighted_scores(scored, district_level, weights),
+        'overall': _weighted_scores(scored, [], weights)
+    }
+
+# ====== BAR CHART LOCATIONS ======
+#
+# Bar charts of many locations are reduced before plotting: to the top and
+# bottom N locations by their mean over all operators, or to district means.
+# The all-locations view plots each location at its rank instead of its
+# address, so the figure carries no per-point strings.
+
+# Bar charts with more locations switch to a large-data mode
+BARCHART_MAX_LOCATIONS = 40
+BARCHART_TOP_N = 15
+BARCHART_LARGE_MODES = ["Top/Bottom N", "Agregasi Kabupaten/Kota", "Semua Lokasi (WebGL)"]
+
+def aggregate_bar_locations(df_plot, mode, top_n=BARCHART_TOP_N):
+    """Reduce the bar chart rows of many locations to top/bottom-N locations or districts"""
+    data = df_plot[df_plot['Nilai'].notna()]
+    if mode == "Agregasi Kabupaten/Kota" and 'Kabupaten/Kota' in data.columns:
+        return data.groupby(['Kabupaten/Kota', 'Operator'], observed=True)['Nilai'].mean().reset_index(), 'Kabupaten/Kota'
+    
+    # Locations ranked by their mean over all operators
+    location_means = data.groupby('Alamat', observed=True)['Nilai'].mean()
+    top = location_means.nlargest(top_n).index
+    bottom = location_means.nsmallest(top_n).index.difference(top)
+    keep = list(top) + list(location_means.loc[bottom].sort_values(ascending=False).index)
+    reduced = data[data['Alamat'].isin(keep)]
+    order = {location: position for position, location in enumerate(keep)}
+    return reduced.sort_values('Alamat', key=lambda column: column.map(order).astype(float), kind='stable'), 'Alamat'
+
+def rank_bar_locations(df_plot):
+    """Mean per location and operator, with locations ranked by their mean over all operators"""
+    means = df_plot[df_plot['Nilai'].notna()].groupby(['Alamat', 'Operator'], observed=True)['Nilai'].mean().reset_index()
+    ranks = means.groupby('Alamat', observed=True)['Nilai'].mean().rank(ascending=False, method='first')
+    return pd.DataFrame({
+        'Peringkat': means['Alamat'].map(ranks).to_numpy(dtype=np.int32),
+        'Operator': means['Operator'],
+        'Nilai': means['Nilai'].to_numpy(dtype=np.float32),
+    })
+
+def value_extremes(df_plot):
+    """Rows with the highest and lowest value of a parameter, None without numeric values"""
+    numeric = df_plot[df_plot['Nilai'].notna()]
+    if numeric.empty:
+        return None
+    return numeric.loc[numeric['Nilai'].idxmax()], numeric.loc[numeric['Nilai'].idxmin()]
@@ -0,0 +1,172 @@
+"""Plotly figures of parameters, trends, distributions and scores"""
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .aggregate import (BARCHART_LARGE_MODES, BARCHART_MAX_LOCATIONS, BARCHART_TOP_N, ROLLUP_STATISTICS,
+                        aggregate_bar_locations, rank_bar_locations)
+from .schema import OPERATOR_COLORS
+
+# ====== FIGURES ======
+#
+# Each builder returns a figure (or None when there is nothing to plot) and
+# leaves displaying or exporting it to the caller.
+
+def operator_color_map(operators):
+    """Plotly color map of the given operators"""
+    return {str(op): OPERATOR_COLORS.get(str(op), 'gray') for op in operators}
+
+def barchart_figure(df_plot, parameter, title, mode=None, top_n=BARCHART_TOP_N):
+    """Bar chart comparing operators for a specific parameter
+    
+    df_plot holds the long-format rows (one per location and operator) of the parameter.
+    Above BARCHART_MAX_LOCATIONS locations, mode selects one of BARCHART_LARGE_MODES.
+    """
+    if df_plot.empty:
+        return None
+    
+    color_discrete_map = operator_color_map(df_plot['Operator'].cat.categories)
+    
+    large = df_plot['Alamat'].nunique() > BARCHART_MAX_LOCATIONS
+    if large and mode is None:
+        mode = BARCHART_LARGE_MODES[0]
+    
+    x_title = "Lokasi"
+    if not large:
+        fig = px.bar(
+            df_plot, 
+            x='Alamat', 
+            y='Nilai', 
+            color='Operator', 
+            barmode='group',
+            title=f"{parameter} ({title})",
+            hover_data=['Operator', 'Alamat', 'Tanggal_str', 'Nilai', 'Koordinat'],
+            color_discrete_map=color_discrete_map
+        )
+    elif mode == "Semua Lokasi (WebGL)":
+        # One WebGL marker per location and operator at the location's rank; the
+        # addresses are left out to keep the figure small (Top/Bottom N names them)
+        fig = px.scatter(
+            rank_bar_locations(df_plot),
+            x='Peringkat',
+            y='Nilai',
+            color='Operator',
+            render_mode='webgl',
+            title=f"{parameter} ({title}, semua lokasi menurut peringkat)",
+            color_discrete_map=color_discrete_map
+        )
+        x_title = "Peringkat Lokasi"
+    else:
+        reduced, x_column = aggregate_bar_locations(df_plot, mode, top_n)
+        subtitle = "rata-rata per Kabupaten/Kota" if x_column == 'Kabupaten/Kota' else f"{top_n} tertinggi dan terendah"
+        if x_column == 'Kabupaten/Kota':
+            x_title = x_column
+        fig = px.bar(
+            reduced,
+            x=x_column,
+            y='Nilai',
+            color='Operator',
+            barmode='group',
+            title=f"{parameter} ({title}, {subtitle})",
+            color_discrete_map=color_discrete_map
+        )
+    
+    fig.update_layout(
+        xaxis_title=x_title,
+        yaxis_title=parameter,
+        legend_title="Operator"
+    )
+    return fig
+
+def trend_figure(rollup, parameter, statistic, title):
+    """Line chart of one rollup statistic per operator over time"""
+    if rollup.empty:
+        return None
+    
+    fig = px.line(
+        rollup.sort_values('Periode'),
+        x='Periode',
+        y=statistic,
+        color='Operator',
+        markers=True,
+        title=f"Tren {statistic} {parameter} ({title})",
+        hover_data=ROLLUP_STATISTICS,
+        color_discrete_map=operator_color_map(rollup['Operator'].cat.categories)
+    )
+    fig.update_layout(xaxis_title="Periode", yaxis_title=parameter, legend_title="Operator")
+    return fig
+
+def distribution_figures(distribution, parameter, test_type):
+    """Box plot and ECDF of one parameter per operator from a distribution summary"""
+    summary = distribution['summary']
+    summary = summary[(summary['Jenis Pengukuran'] == test_type) & (summary['Parameter'] == parameter)]
+    if summary.empty:
+        return None
+    
+    # Box from the precomputed statistics: whiskers at p5/p95, box at p25/p75
+    fig_box = go.Figure()
+    for stats in summary.to_dict('records'):
+        fig_box.add_trace(go.Box(
+            name=str(stats['Operator']),
+            q1=[stats['P25']], median=[stats['P50']], q3=[stats['P75']],
+            lowerfence=[stats['P5']], upperfence=[stats['P95']],
+            mean=[stats['Rata-rata']], sd=[stats['Std']],
+            marker_color=OPERATOR_COLORS.get(str(stats['Operator']), 'gray')
+        ))
+    fig_box.update_layout(
+        title=f"Distribusi {parameter} ({test_type})",
+        yaxis_title=parameter,
+        showlegend=False
+    )
+    
+    ecdf = distribution['ecdf']
+    ecdf = ecdf[(ecdf['Jenis Pengukuran'] == test_type) & (ecdf['Parameter'] == parameter)]
+    fig_ecdf = px.line(
+        ecdf,
+        x='Nilai',
+        y='Probabilitas',
+        color='Operator',
+        title=f"ECDF {parameter} ({test_type})",
+        color_discrete_map=operator_color_map(ecdf['Operator'].astype(str).unique())
+    )
+    fig_ecdf.update_layout(xaxis_title=parameter, yaxis_title="Proporsi ≤ nilai", legend_title="Operator")
+    return fig_box, fig_ecdf
+
+def score_figure(district_scores):
+    """Bar chart of operator scores per district"""
+    if district_scores.empty:
+        return None
+    
+    fig = px.bar(
+        district_scores,
+        x='Kabupaten/Kota' if 'Kabupaten/Kota' in district_scores.columns else 'Operator',
+        y='Skor',
+        color='Operator',
+        barmode='group',
+        title="Skor Operator per Kabupaten/Kota",
+        hover_data=['Jumlah Parameter'],
+        color_discrete_map=operator_color_map(district_scores['Operator'].cat.categories)
+    )
+    fig.update_layout(yaxis_title="Skor (0-100)", yaxis_range=[0, 100], legend_title="Operator")
+    return fig
+
+def period_diff_figure(comparison, parameter, test_type):
+    """Bar chart of the after-minus-before change per site and operator"""
+    if comparison.empty:
+        return None
+    
+    fig = px.bar(
+        comparison,
+        x='Alamat After',
+        y='Selisih',
+        color='Operator',
+        barmode='group',
+        title=f"Perubahan {parameter} ({test_type})",
+        hover_data=['Alamat Before', 'Nilai Before', 'Nilai After', 'Perubahan (%)', 'Pencocokan'],
+        color_discrete_map=operator_color_map(comparison['Operator'].cat.categories)
+    )
+    fig.update_layout(
+        xaxis_title="Lokasi",
+        yaxis_title=f"Selisih {parameter} (After - Before)",
+        legend_title="Operator"
+    )
+    return fig
@@ -0,0 +1,177 @@
+"""Before/After period comparison and best/worst location tables"""
+import numpy as np
+import pandas as pd
+
+from .aggregate import RANK_KEYS
+from .coordinates import coordinate_field, haversine_km
+from .index import build_spatial_index, radius_query
+
+# ====== BEFORE/AFTER COMPARISON ======
+#
+# Measurement periods are told apart by Keterangan ("Posko Before Idul Fitri",
+# "Posko After Idul Fitri", ...). Each period is reduced to one mean value per
+# site and operator, then sites are paired by address; sites whose address only
+# appears in one period are paired with the nearest site of the other period
+# within max_distance_km. The nearest site comes from a spatial index of the
+# distinct unpaired After positions, queried once per distinct Before position;
+# each Before site then takes the first of those neighbours that has an After
+# site with the same keys, so memory grows with the sites within reach rather
+# than with every Before x After combination. Deltas are computed on the
+# paired columns at once.
+
+PERIOD_COLUMN = 'Keterangan'
+PERIOD_KEYS = ['Jenis Pengukuran', 'Parameter', 'Operator']
+NEAREST_MATCH_KM = 1.0
+PERIOD_COMPARISON_COLUMNS = PERIOD_KEYS + [
+    'Alamat Before', 'Alamat After', 'Latitude', 'Longitude', 'Nilai Before', 'Nilai After',
+    'Selisih', 'Perubahan (%)', 'Jarak (km)', 'Pencocokan'
+]
+
+def period_sites(df_long, period):
+    """Mean value and position per site and operator for one period"""
+    data = df_long[(df_long[PERIOD_COLUMN] == period) & df_long['Nilai'].notna()]
+    return data.groupby(PERIOD_KEYS + ['Alamat'], observed=True, sort=False).agg(
+        Nilai=('Nilai', 'mean'), Latitude=('Latitude', 'mean'), Longitude=('Longitude', 'mean')
+    ).reset_index()
+
+def _unpaired(sites, paired, suffix):
+    """Sites that are not part of the already paired rows"""
+    keys = paired[PERIOD_KEYS + [f'Alamat {suffix}']].rename(columns={f'Alamat {suffix}': 'Alamat'})
+    merged = sites.merge(keys, on=PERIOD_KEYS + ['Alamat'], how='left', indicator=True)
+    return merged[merged['_merge'] == 'left_only'].drop(columns='_merge')
+
+def _nearest_pairs(before, after, max_distance_km):
+    """(Before row, After row, distance) of the nearest After row with the same keys within max_distance_km"""
+    pairs = pd.DataFrame({'before_row': np.empty(0, dtype=np.int64), 'after_row': np.empty(0, dtype=np.int64),
+                          'Jarak (km)': np.empty(0)})
+    before_coords = before[['Latitude Before', 'Longitude Before']].to_numpy(dtype=float)
+    after_coords = after[['Latitude After', 'Longitude After']].to_numpy(dtype=float)
+    before_valid = np.flatnonzero(np.isfinite(before_coords).all(axis=1))
+    after_valid = np.flatnonzero(np.isfinite(after_coords).all(axis=1))
+    if before_valid.size == 0 or after_valid.size == 0:
+        return pairs
+    
+    # Sites are measured for many parameters and operators, so query each distinct position once
+    before_positions, before_inverse = np.unique(before_coords[before_valid], axis=0, return_inverse=True)
+    after_positions, after_inverse = np.unique(after_coords[after_valid], axis=0, return_inverse=True)
+    index = build_spatial_index(after_positions[:, 0], after_positions[:, 1], max(max_distance_km, 0.001))
+    found = [radius_query(index, lat, lon, max_distance_km) for lat, lon in before_positions]
+    neighbour_counts = np.array([len(positions) for positions, _ in found])
+    if neighbour_counts.sum() == 0:
+        return pairs
+    neighbours = np.concatenate([positions for positions, _ in found])
+    neighbour_distances = np.concatenate([distances for _, distances in found])
+    neighbour_offsets = np.concatenate([[0], np.cumsum(neighbour_counts)[:-1]])
+    
+    # One integer per (Jenis Pengukuran, Parameter, Operator), shared by both periods
+    keys = pd.concat([before[PERIOD_KEYS], after[PERIOD_KEYS]], ignore_index=True)
+    key_ids = keys.groupby(PERIOD_KEYS, observed=True, sort=False).ngroup().to_numpy()
+    key_count = key_ids.max() + 1
+    before_keys = key_ids[:len(before)][before_valid]
+    
+    # After rows sorted by (position, key); stable, so the first of duplicates is the first row
+    after_codes = after_inverse.ravel() * key_count + key_ids[len(before):][after_valid]
+    after_order = np.argsort(after_codes, kind='stable')
+    sorted_codes = after_codes[after_order]
+    
+    # Every Before row against the neighbour positions of its own position, nearest first
+    before_inverse = before_inverse.ravel()
+    row_counts = neighbour_counts[before_inverse]
+    rows = np.repeat(np.arange(len(before_valid)), row_counts)
+    candidates = np.repeat(neighbour_offsets[before_inverse] - np.cumsum(row_counts) + row_counts, row_counts) \
+        + np.arange(row_counts.sum())
+    codes = neighbours[candidates] * key_count + before_keys[rows]
+    matches = np.minimum(np.searchsorted(sorted_codes, codes), len(sorted_codes) - 1)
+    hits = np.flatnonzero(sorted_codes[matches] == codes)
+    
+    # The first hit of each Before row is its nearest After row with the same keys
+    _, first = np.unique(rows[hits], return_index=True)
+    nearest = hits[first]
+    return pd.DataFrame({
+        'before_row': before_valid[rows[nearest]],
+        'after_row': after_valid[after_order[matches[nearest]]],
+        'Jarak (km)': neighbour_distances[candidates[nearest]],
+    })
+
+def compare_periods(df_long, before, after, max_distance_km=NEAREST_MATCH_KM):
+    """Pair sites of two periods and compute value deltas and percentage changes"""
+    before_sites = period_sites(df_long, before).add_suffix(' Before')
+    after_sites = period_sites(df_long, after).add_suffix(' After')
+    if before_sites.empty or after_sites.empty:
+        return pd.DataFrame(columns=PERIOD_COMPARISON_COLUMNS)
+    
+    keys_before = {f'{key} Before': key for key in PERIOD_KEYS}
+    keys_after = {f'{key} After': key for key in PERIOD_KEYS}
+    before_sites = before_sites.rename(columns=keys_before)
+    after_sites = after_sites.rename(columns=keys_after)
+    
+    # Same address in both periods
+    by_address = before_sites.merge(
+        after_sites, left_on=PERIOD_KEYS + ['Alamat Before'], right_on=PERIOD_KEYS + ['Alamat After']
+    )
+    by_address['Pencocokan'] = 'Alamat'
+    
+    # Nearest site of the other period for the remaining addresses
+    before_left = _unpaired(before_sites.rename(columns={'Alamat Before': 'Alamat'}), by_address, 'Before').rename(
+        columns={'Alamat': 'Alamat Before'}
+    ).reset_index(drop=True)
+    after_left = _unpaired(after_sites.rename(columns={'Alamat After': 'Alamat'}), by_address, 'After').rename(
+        columns={'Alamat': 'Alamat After'}
+    ).reset_index(drop=True)
+    nearby = _nearest_pairs(before_left, after_left, max_distance_km)
+    candidates = before_left.iloc[nearby['before_row']].reset_index(drop=True).join(
+        after_left.iloc[nearby['after_row']].drop(columns=PERIOD_KEYS).reset_index(drop=True)
+    )
+    candidates['Jarak (km)'] = nearby['Jarak (km)'].to_numpy()
+    
+    # An After site claimed by several Before sites goes to the nearest one
+    by_distance = candidates.sort_values('Jarak (km)', kind='stable').drop_duplicates(PERIOD_KEYS + ['Alamat After'])
+    by_distance = by_distance.assign(Pencocokan='Koordinat terdekat')
+    
+    paired = pd.concat([by_address, by_distance], ignore_index=True)
+    paired['Jarak (km)'] = haversine_km(
+        paired['Latitude Before'], paired['Longitude Before'], paired['Latitude After'], paired['Longitude After']
+    )
+    
+    before_values = paired['Nilai Before'].to_numpy(dtype=float)
+    delta = paired['Nilai After'].to_numpy(dtype=float) - before_values
+    paired['Selisih'] = delta
+    with np.errstate(divide='ignore', invalid='ignore'):
+        paired['Perubahan (%)'] = np.where(before_values != 0, delta / np.abs(before_values) * 100, np.nan)
+    
+    # Deltas are drawn at the After position
+    paired['Latitude'] = paired['Latitude After']
+    paired['Longitude'] = paired['Longitude After']
+    for column in ['Alamat Before', 'Alamat After']:
+        paired[column] = paired[column].astype(str)
+    return paired[PERIOD_COMPARISON_COLUMNS].sort_values(PERIOD_KEYS + ['Alamat After']).reset_index(drop=True)
+
+# ====== LOCATION COMPARISON ======
+
+def location_comparison_table(ranking, parameter, test_type, coordinate_format="decimal"):
+    """Best and worst location per operator from a rank_locations result, None if empty
+    
+    With parameter=None every parameter of the test type is compared.
+    """
+    if ranking is None or ranking.empty:
+        return None
+    
+    # Highest and lowest location of each operator
+    first = ranking[(ranking['Peringkat'] == 1) & (ranking['Jenis Pengukuran'] == test_type)]
+    if parameter is not None:
+        first = first[first['Parameter'] == parameter]
+    
+    if first.empty:
+        return None
+    
+    details = {'Nilai': 'Nilai', 'Alamat': 'Lokasi', coordinate_field(coordinate_format): 'Koordinat', 'Tanggal_str': 'Tanggal'}
+    sides = []
+    for category in ('Tertinggi', 'Terendah'):
+        side = first[first['Kategori'] == category].set_index(RANK_KEYS)[list(details)]
+        sides.append(side.rename(columns=lambda c: f"{details[c]} {category}"))
+    
+    comparison = sides[0].join(sides[1]).reset_index()
+    comparison = comparison.rename(columns={'Jenis Pengukuran': 'Jenis Test'})
+    return comparison[['Operator', 'Parameter', 'Jenis Test',
+                       'Nilai Tertinggi', 'Lokasi Tertinggi', 'Koordinat Tertinggi', 'Tanggal Tertinggi',
+                       'Nilai Terendah', 'Lokasi Terendah', 'Koordinat Terendah', 'Tanggal Terendah']]
@@ -0,0 +1,162 @@
+"""Coordinate formatting and distances"""
+import numpy as np
+import pandas as pd
+
+# Mean Earth radius for haversine distances
+EARTH_RADIUS_KM = 6371.0088
+
+# Placeholder shown when a row has no usable coordinates
+COORD_NOT_AVAILABLE = "Koordinat tidak tersedia"
+
+# ====== COORDINATE FORMATTING ======
+
+def format_coordinates(lat, lon, format_type="decimal"):
+    """Format coordinates as decimal or DMS"""
+    if pd.isna(lat) or pd.isna(lon):
+        return COORD_NOT_AVAILABLE
+    
+    if format_type == "decimal":
+        return f"{lat:.6f}, {lon:.6f}"
+    else:  # DMS format
+        lat_dms = decimal_to_dms(abs(lat)) + ("S" if lat < 0 else "N")
+        lon_dms = decimal_to_dms(abs(lon)) + ("W" if lon < 0 else "E")
+        return f"{lat_dms}, {lon_dms}"
+
+def coordinate_field(format_type="decimal"):
+    """Column holding the formatted coordinates of a format type"""
+    return 'Koordinat' if format_type == "decimal" else 'Koordinat_DMS'
+
+def decimal_to_dms(decimal_coord):
+    """Convert decimal coordinates to DMS format"""
+    degrees = int(decimal_coord)
+    minutes_float = (decimal_coord - degrees) * 60
+    minutes = int(minutes_float)
+    seconds = (minutes_float - minutes) * 60
+    return f"{degrees}°{minutes}'{seconds:.2f}\""
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between coordinates (scalars or arrays)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+# ====== VECTORIZED COORDINATE FORMATTING ======
+#
+# format_coordinates handles one point at a time, which is fine for a single
+# popup but far too slow for building the Koordinat columns of a whole sheet.
+# The functions below produce the same strings for entire NumPy arrays: every
+# row gets a slot in a (rows x width) buffer of Unicode code points, the pieces
+# are written at a per-row cursor, and the buffer is finally viewed as a
+# fixed-width string array. NumPy drops trailing zero code points, so each row
+# keeps its natural length.
+
+def _write_text(flat, cursor, text):
+    """Write the same literal text at every row's cursor"""
+    for char in text:
+        flat[cursor] = ord(char)
+        cursor += 1
+
+def _write_choice(flat, cursor, condition, if_true, if_false):
+    """Write one of two single characters per row (e.g. hemisphere letters)"""
+    flat[cursor] = np.where(condition, ord(if_true), ord(if_false))
+    cursor += 1
+
+def _write_int(flat, cursor, values):
+    """Write non-negative integers without leading zeros"""
+    max_digits = len(str(int(values.max()))) if values.size else 1
+    
+    # Number of digits of each value
+    ndigits = np.ones(values.shape, dtype=np.int64)
+    for power in range(1, max_digits):
+        ndigits += values >= 10 ** power
+    
+    # Write digit k of every value that has at least k + 1 digits
+    for k in range(max_digits):
+        active = ndigits > k
+        divisor = 10 ** (ndigits[active] - 1 - k)
+        flat[cursor[active] + k] = ord("0") + (values[active] // divisor) % 10
+    cursor += ndigits
+
+def _write_fixed(flat, cursor, values, decimals):
+    """Write non-negative floats with a fixed number of decimals (formatted like %.Nf)"""
+    scale = 10 ** decimals
+    product = values * scale
+    scaled = np.rint(product).astype(np.int64)
+    
+    # The product is itself rounded in binary, so values within a few ulp of a
+    # half step may round the wrong way; those are rounded from their exact
+    # value by Python's formatting, like %.Nf
+    near_half = np.abs(product - np.floor(product) - 0.5) <= 4 * np.spacing(product)
+    for i in np.flatnonzero(near_half):
+        scaled[i] = int(f"{values[i]:.{decimals}f}".replace(".", ""))
+    
+    _write_int(flat, cursor, scaled // scale)
+    _write_text(flat, cursor, ".")
+    
+    fraction = scaled % scale
+    for k in range(decimals):
+        flat[cursor] = ord("0") + (fraction // 10 ** (decimals - 1 - k)) % 10
+        cursor += 1
+
+def _write_dms(flat, cursor, values):
+    """Write non-negative decimal degrees as DMS, matching decimal_to_dms"""
+    degrees = np.trunc(values)
+    minutes_float = (values - degrees) * 60
+    minutes = np.trunc(minutes_float)
+    seconds = (minutes_float - minutes) * 60
+    
+    _write_int(flat, cursor, degrees.astype(np.int64))
+    _write_text(flat, cursor, "°")
+    _write_int(flat, cursor, minutes.astype(np.int64))
+    _write_text(flat, cursor, "'")
+    _write_fixed(flat, cursor, seconds, 2)
+    _write_text(flat, cursor, '"')
+
+def format_coordinates_array(lat, lon, format_type="decimal"):
+    """Format arrays of coordinates as decimal or DMS (vectorized format_coordinates)"""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    
+    # Rows without a usable latitude/longitude are formatted as 0 and replaced at the end
+    missing = ~(np.isfinite(lat) & np.isfinite(lon))
+    lat = np.where(missing, 0.0, lat)
+    lon = np.where(missing, 0.0, lon)
+    
+    # Size the buffer for the widest possible row (one extra digit for rounding up)
+    largest = max(np.abs(lat).max(initial=0), np.abs(lon).max(initial=0))
+    whole_digits = len(str(int(largest))) + 1
+    width = max(len(COORD_NOT_AVAILABLE), 2 * (whole_digits + 12) + 2)
+    
+    buffer = np.zeros((lat.size, width), dtype=np.uint32)
+    flat = buffer.reshape(-1)
+    cursor = np.arange(lat.size, dtype=np.int64) * width
+    
+    if format_type == "decimal":
+        for i, values in enumerate((lat, lon)):
+            if i:
+                _write_text(flat, cursor, ", ")
+            negative = np.signbit(values)
+            flat[cursor[negative]] = ord("-")
+            cursor += negative
+            _write_fixed(flat, cursor, np.abs(values), 6)
+    else:  # DMS format
+        for i, (values, positive, negative) in enumerate(((lat, "N", "S"), (lon, "E", "W"))):
+            if i:
+                _write_text(flat, cursor, ", ")
+            _write_dms(flat, cursor, np.abs(values))
+            _write_choice(flat, cursor, values < 0, negative, positive)
+    
+    if missing.any():
+        buffer[missing] = 0
+        buffer[missing, :len(COORD_NOT_AVAILABLE)] = [ord(char) for char in COORD_NOT_AVAILABLE]
+    
+    return buffer.view(f"U{width}").ravel()
+
+def add_coordinate_columns(df):
+    """Add the Koordinat (decimal) and Koordinat_DMS columns from Latitude/Longitude"""
+    lat = df['Latitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+    lon = df['Longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    df['Koordinat'] = format_coordinates_array(lat, lon, "decimal")
+    df['Koordinat_DMS'] = format_coordinates_array(lat, lon, "dms")
+    return df
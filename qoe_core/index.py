@@ -0,0 +1,245 @@
+"""Filter index, long-format table and spatial index of a loaded dataset"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .coordinates import EARTH_RADIUS_KM, haversine_km
+from .normalize import union_typed_categoricals
+from .schema import INDEX_COLUMNS, LONG_ID_COLUMNS, OPERATORS, OPERATOR_TEXT_SUFFIX, operator_values_float64
+
+# Cell size of the spatial index buckets
+SPATIAL_CELL_KM = 1.0
+
+# ====== FILTER INDEX ======
+#
+# The dashboard filters (month, district, measurement type, location,
+# parameter) only ever select whole groups of rows that share the same
+# (Bulan, Kabupaten/Kota, Jenis Pengukuran, Alamat, Parameter) key. The index
+# stores the distinct keys once, plus the row positions of each group in CSR
+# layout (positions sorted by group, with offsets per group). A widget
+# selection is resolved on the small key table and the matching groups'
+# positions are gathered, instead of scanning every column of the full frame
+# on each rerun. Option lists for the widgets come from the key table too.
+
+def dataset_version(df):
+    """Content hash identifying a loaded dataset, used as a cache key"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()[:16]
+
+def build_filter_index(df):
+    """Group row positions by the dashboard filter columns"""
+    columns = [c for c in INDEX_COLUMNS if c in df.columns]
+    groups = df.groupby(columns, observed=True, dropna=False, sort=False)
+    
+    group_ids = groups.ngroup().to_numpy()
+    counts = np.bincount(group_ids, minlength=groups.ngroups)
+    
+    return {
+        'keys': groups.size().reset_index()[columns],
+        'order': np.argsort(group_ids, kind='stable'),
+        'counts': counts,
+        'offsets': np.concatenate([[0], np.cumsum(counts)]),
+    }
+
+def _matching_groups(index, selections):
+    """Groups whose key matches every selection ({column: allowed values or None})"""
+    keys = index['keys']
+    mask = np.ones(len(keys), dtype=bool)
+    for column, values in selections.items():
+        if values is not None and column in keys.columns:
+            mask &= keys[column].isin(values).to_numpy()
+    return np.flatnonzero(mask)
+
+def lookup_rows(index, selections):
+    """Row positions matching every selection, in the original row order"""
+    groups = _matching_groups(index, selections)
+    lengths = index['counts'][groups]
+    if lengths.sum() == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    # Gather each group's slice of the sorted positions without a Python loop
+    starts = index['offsets'][groups]
+    run_offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    positions = index['order'][run_offsets + np.arange(lengths.sum())]
+    positions.sort()
+    return positions
+
+def lookup_values(index, column, selections):
+    """Sorted distinct values of a column among the rows matching the selections"""
+    keys = index['keys']
+    if column not in keys.columns:
+        return []
+    values = keys[column].iloc[_matching_groups(index, selections)].dropna().unique()
+    return sorted(values.tolist())
+
+# ====== LONG-FORMAT TABLE ======
+#
+# Charts, comparisons and maps all work on one row per (measurement,
+# operator). Instead of melting the wide operator columns for every chart on
+# every rerun, the long table is built once per dataset:
+#   Operator - categorical, in OPERATORS order
+#   Nilai    - float64 value, widened from float32 as entered in the sheet
+#   Teks     - original text of non-numeric entries (categorical)
+# plus the descriptive columns of the wide row. Rows are stored in operator
+# blocks (all rows of the first operator, then the second, ...), so the long
+# rows of wide row i are i, i + n, i + 2n, ... and filter index positions map
+# straight onto the long table.
+
+def build_long_table(df):
+    """Melt the operator columns into the long-format table"""
+    id_columns = [c for c in LONG_ID_COLUMNS if c in df.columns]
+    operators = [op for op in OPERATORS if op in df.columns]
+    rows = len(df)
+    
+    long_df = df[id_columns].take(np.tile(np.arange(rows), len(operators))).reset_index(drop=True)
+    long_df['Operator'] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(operators)), rows), categories=operators
+    )
+    long_df['Nilai'] = np.concatenate(
+        [operator_values_float64(df[op]) for op in operators]
+    ) if operators else np.empty(0)
+    
+    text_columns = [df[op + OPERATOR_TEXT_SUFFIX] for op in operators if op + OPERATOR_TEXT_SUFFIX in df.columns]
+    if operators and len(text_columns) == len(operators):
+        long_df['Teks'] = union_typed_categoricals(text_columns)
+    else:
+        long_df['Teks'] = pd.Categorical.from_codes(np.full(len(long_df), -1), categories=pd.Index([], dtype=str))
+    
+    return {'table': long_df, 'rows': rows, 'operators': operators}
+
+def select_long_rows(long_data, positions):
+    """Long-format rows of the given wide row positions, in operator blocks"""
+    operator_offsets = long_data['rows'] * np.arange(len(long_data['operators']))
+    long_positions = (operator_offsets[:, None] + np.asarray(positions)[None, :]).ravel()
+    return long_data['table'].take(long_positions)
+
+def long_has_value(df_long):
+    """Mask of long-format rows with a numeric value or a text entry"""
+    return df_long['Nilai'].notna() | df_long['Teks'].notna()
+
+# ====== SPATIAL INDEX ======
+#
+# Points are bucketed into a latitude/longitude grid of roughly SPATIAL_CELL_KM
+# cells, stored like the filter index: distinct cell keys, the point positions
+# sorted by cell, and per-cell counts/offsets. Longitude cells are widened by
+# the highest latitude in the data so no cell is narrower than SPATIAL_CELL_KM.
+# A radius query only looks at the cells overlapping the search box and ranks
+# those candidates by haversine distance; nearest-neighbour queries grow the
+# radius until enough points are found.
+
+KM_PER_DEGREE = EARTH_RADIUS_KM * np.pi / 180
+
+def _cell_key(cell_lat, cell_lon):
+    """Single int64 key of a grid cell"""
+    return cell_lat.astype(np.int64) * (1 << 32) + cell_lon.astype(np.int64)
+
+def build_spatial_index(lat, lon, cell_km=SPATIAL_CELL_KM):
+    """Bucket point coordinates into grid cells; invalid coordinates are left out"""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+    
+    max_abs_lat = np.abs(lat[valid]).max() if valid.size else 0.0
+    cell_lat = cell_km / KM_PER_DEGREE
+    cell_lon = cell_lat / np.cos(np.radians(min(max_abs_lat, 89.0)))
+    
+    rows = np.floor(lat[valid] / cell_lat).astype(np.int64)
+    cols = np.floor(lon[valid] / cell_lon).astype(np.int64)
+    keys = _cell_key(rows, cols)
+    order = np.argsort(keys, kind='stable')
+    cell_keys, offsets, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    
+    # Row/column of each cell, kept as is: negative columns don't decode from the packed key
+    return {
+        'lat': lat, 'lon': lon, 'positions': valid[order],
+        'cell_keys': cell_keys, 'offsets': offsets, 'counts': counts,
+        'cell_rows': rows[order][offsets], 'cell_cols': cols[order][offsets],
+        'cell_lat': cell_lat, 'cell_lon': cell_lon, 'cell_km': cell_km,
+        'bounds': (lat[valid].min(), lat[valid].max(), lon[valid].min(), lon[valid].max()) if valid.size else None
+    }
+
+def _candidate_positions(index, lat, lon, radius_km):
+    """Positions of the points in the cells overlapping a radius around (lat, lon)"""
+    radius_lat = radius_km / KM_PER_DEGREE
+    band_lat = min(abs(lat) + radius_lat, 89.0)
+    radius_lon = radius_km / (KM_PER_DEGREE * np.cos(np.radians(band_lat)))
+    
+    row, col = int(np.floor(lat / index['cell_lat'])), int(np.floor(lon / index['cell_lon']))
+    reach_rows = int(np.ceil(radius_lat / index['cell_lat']))
+    reach_cols = int(np.ceil(radius_lon / index['cell_lon']))
+    
+    if (2 * reach_rows + 1) * (2 * reach_cols + 1) < len(index['cell_keys']):
+        # Look up every cell of the search box
+        rows, cols = np.meshgrid(np.arange(row - reach_rows, row + reach_rows + 1),
+                                 np.arange(col - reach_cols, col + reach_cols + 1), indexing='ij')
+        wanted = _cell_key(rows.ravel(), cols.ravel())
+        found = np.minimum(np.searchsorted(index['cell_keys'], wanted), len(index['cell_keys']) - 1)
+        cells = found[index['cell_keys'][found] == wanted]
+    else:
+        # Search box larger than the data: filter the occupied cells instead
+        cells = np.flatnonzero((np.abs(index['cell_rows'] - row) <= reach_rows)
+                               & (np.abs(index['cell_cols'] - col) <= reach_cols))
+    
+    lengths = index['counts'][cells]
+    if lengths.sum() == 0:
+        return np.empty(0, dtype=np.int64)
+    starts = index['offsets'][cells]
+    run_offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return index['positions'][run_offsets + np.arange(lengths.sum())]
+
+def radius_query(index, lat, lon, radius_km):
+    """Positions and distances (km) of the points within radius_km, nearest first"""
+    candidates = _candidate_positions(index, lat, lon, radius_km)
+    distances = haversine_km(lat, lon, index['lat'][candidates], index['lon'][candidates])
+    within = distances <= radius_km
+    candidates, distances = candidates[within], distances[within]
+    order = np.lexsort((candidates, distances))
+    return candidates[order], distances[order]
+
+def nearest_points(index, lat, lon, k=1):
+    """Positions and distances (km) of the k points nearest to (lat, lon)"""
+    available = len(index['positions'])
+    if available == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    
+    # Start at the distance to the data's bounding box for points outside it
+    min_lat, max_lat, min_lon, max_lon = index['bounds']
+    radius_km = max(index['cell_km'], float(haversine_km(
+        lat, lon, np.clip(lat, min_lat, max_lat), np.clip(lon, min_lon, max_lon)
+    )) * 1.01)
+    while True:
+        positions, distances = radius_query(index, lat, lon, radius_km)
+        if len(positions) >= min(k, available) or radius_km > np.pi * EARTH_RADIUS_KM:
+            return positions[:k], distances[:k]
+        radius_km *= 2
+
+def colocated_groups(index, tolerance_km=0.0):
+    """Group id per point, points within tolerance_km of a group's first point share it
+    
+    Points without valid coordinates get -1. With tolerance_km=0 only identical
+    coordinates are grouped.
+    """
+    groups = np.full(len(index['lat']), -1, dtype=np.int64)
+    valid = np.sort(index['positions'])
+    if valid.size == 0:
+        return groups
+    
+    # Identical coordinates first, the tolerance then merges distinct sites
+    coords = np.column_stack([index['lat'][valid], index['lon'][valid]])
+    unique_coords, first, inverse = np.unique(coords, axis=0, return_index=True, return_inverse=True)
+    if tolerance_km <= 0:
+        site_groups = np.arange(len(unique_coords))
+    else:
+        sites = build_spatial_index(unique_coords[:, 0], unique_coords[:, 1], max(tolerance_km, 0.001))
+        site_groups = np.full(len(unique_coords), -1, dtype=np.int64)
+        for site in np.argsort(first, kind='stable'):
+            if site_groups[site] < 0:
+                members, _ = radius_query(sites, unique_coords[site, 0], unique_coords[site, 1], tolerance_km)
+                members = members[site_groups[members] < 0]
+                site_groups[members] = site
+    
+    # Renumber the groups 0..n-1
+    _, site_groups = np.unique(site_groups, return_inverse=True)
+    groups[valid] = site_groups[inverse.ravel()]
+    return groups
@@ -0,0 +1,177 @@
+"""Local data files and on-disk snapshots of loaded worksheets"""
+import glob
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .normalize import concat_typed_frames, normalize_data
+from .schema import CATEGORY_COLUMNS, LOCAL_DTYPES
+
+# Rows per chunk when reading large CSV files
+CSV_CHUNK_ROWS = 100_000
+
+# Directory for local snapshots of loaded worksheets
+SNAPSHOT_DIR = os.environ.get(
+    "QOE_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".qoe_snapshots")
+)
+
+# Schema metadata key holding the snapshot info (Drive modifiedTime, ingested rows)
+SNAPSHOT_INFO_KEY = b"qoe_snapshot"
+
+# Worksheet loaded most recently, prefetched at the next start
+LAST_USED_SHEET_PATH = os.path.join(SNAPSHOT_DIR, "last_used_sheet.json")
+
+# ====== LOCAL SNAPSHOT CACHE ======
+#
+# Normalized worksheets are stored on disk as Arrow IPC files, one per
+# (spreadsheet, worksheet). Each snapshot carries an info dict in its schema
+# metadata:
+#   modified_time  - Drive modifiedTime of the spreadsheet when it was taken
+#   header         - the worksheet's header row
+#   rows           - number of data rows ingested (sheet rows 2..rows+1)
+#   last_row_hash  - fingerprint of the last ingested raw row
+# While the spreadsheet is unchanged, a reload (after the st.cache_data TTL
+# expires or in a fresh process) only costs one Drive metadata request plus a
+# memory-mapped read. In incremental mode a changed spreadsheet is treated as
+# append-only: only the rows after the last ingested one are fetched and
+# normalized, and the last ingested row is re-read to make sure it is unchanged.
+
+def _snapshot_path(sheet_id, sheet_name):
+    """Path of the snapshot file for one worksheet of a spreadsheet"""
+    sheet_hash = hashlib.sha1(sheet_name.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(SNAPSHOT_DIR, f"{sheet_id}_{sheet_hash}.arrow")
+
+def row_hash(row, width):
+    """Fingerprint of one raw sheet row, padded to the header width"""
+    padded = list(row[:width]) + [""] * (width - len(row))
+    return hashlib.sha1(json.dumps(padded, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def read_snapshot_info(sheet_id, sheet_name):
+    """Read only the info dict of a stored snapshot, or None if there is none"""
+    path = _snapshot_path(sheet_id, sheet_name)
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with pa.memory_map(path, "r") as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        return json.loads(metadata[SNAPSHOT_INFO_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        # A damaged or outdated snapshot is simply rebuilt
+        return None
+
+def read_snapshot_file(path):
+    """Memory-map a snapshot file back into a DataFrame, None if it cannot be read"""
+    try:
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    except (OSError, pa.ArrowException):
+        return None
+
+def read_snapshot(sheet_id, sheet_name):
+    """Memory-map the stored snapshot of a worksheet back into a DataFrame"""
+    return read_snapshot_file(_snapshot_path(sheet_id, sheet_name))
+
+def write_snapshot(df, sheet_id, sheet_name, info):
+    """Store a normalized DataFrame as a snapshot, returns True if it was written"""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns mixing numbers and text have no Arrow type
+        return False
+    
+    metadata = dict(table.schema.metadata or {})
+    metadata[SNAPSHOT_INFO_KEY] = json.dumps(info, ensure_ascii=False).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+    
+    # Write to a temporary file first so readers never see a partial snapshot
+    path = _snapshot_path(sheet_id, sheet_name)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+def read_last_used_sheet():
+    """The (sheet_id, sheet_name) loaded most recently, or None"""
+    try:
+        with open(LAST_USED_SHEET_PATH, encoding="utf-8") as f:
+            last_used = json.load(f)
+        return last_used['sheet_id'], last_used['sheet_name']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def write_last_used_sheet(sheet_id, sheet_name):
+    """Remember the loaded worksheet so the next session can prefetch it"""
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(LAST_USED_SHEET_PATH, "w", encoding="utf-8") as f:
+            json.dump({'sheet_id': sheet_id, 'sheet_name': sheet_name}, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+# ====== LOCAL DATA SOURCES ======
+#
+# Local backends return the same raw measurement table as the Google Sheets
+# loader, so everything goes through normalize_data. Files are read with
+# explicit dtypes and text columns as categoricals; CSV files are parsed in
+# chunks so each chunk's strings are dictionary-encoded before the next one is
+# read, which keeps peak memory low for large historical campaigns.
+
+def read_csv_file(path):
+    """Read a CSV file in typed chunks"""
+    chunks = pd.read_csv(
+        path,
+        dtype=LOCAL_DTYPES,
+        chunksize=CSV_CHUNK_ROWS,
+        encoding='utf-8-sig'
+    )
+    return concat_typed_frames(chunks)
+
+def read_parquet_file(path):
+    """Read a Parquet file, decoding text columns straight into categoricals"""
+    columns = pq.read_schema(path).names
+    table = pq.read_table(path, read_dictionary=[c for c in CATEGORY_COLUMNS if c in columns])
+    return table.to_pandas()
+
+# Readers for local files by extension
+LOCAL_READERS = {
+    '.csv': read_csv_file,
+    '.parquet': read_parquet_file,
+    '.pq': read_parquet_file,
+}
+
+def list_local_files(path, pattern="*"):
+    """List the readable data files for a local path (a single file or a directory + glob pattern)"""
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, pattern)))
+    else:
+        files = [path]
+    return [f for f in files if os.path.splitext(f)[1].lower() in LOCAL_READERS]
+
+def get_local_modified_time(path, pattern="*"):
+    """Version of a local source (file count and newest modification time) for cache keys"""
+    files = list_local_files(path, pattern)
+    return (len(files), max((os.path.getmtime(f) for f in files), default=0))
+
+def read_local_files(files):
+    """Read and normalize local data files as one frame, None if they hold no rows"""
+    df = concat_typed_frames(
+        LOCAL_READERS[os.path.splitext(f)[1].lower()](f) for f in files
+    )
+    if df.empty:
+        return None
+    return normalize_data(df)
@@ -0,0 +1,479 @@
+"""Folium/leafmap maps of measurements and Before/After changes"""
+import html
+import json
+
+import folium
+import folium.plugins
+import leafmap.foliumap as leafmap
+import numpy as np
+import pandas as pd
+from branca.colormap import LinearColormap
+
+from .aggregate import MAP_MODES, aggregate_grid, grid_cell_size, parameter_direction
+from .coordinates import coordinate_field
+from .index import long_has_value
+from .schema import OPERATOR_COLORS, OPERATORS, format_operator_value
+
+# Client-side style, tooltip and popup of grid cells, built from feature properties
+GRID_CELL_JS = """
+function(feature, layer) {
+    var p = feature.properties;
+    var esc = function(text) {
+        return String(text).replace(/[&<>"']/g, function(c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+        });
+    };
+    layer.setStyle({fillColor: p.fill, fillOpacity: p.fill ? 0.6 : 0.1, color: '#555', weight: 0.5});
+    layer.bindTooltip(esc(p.label));
+    layer.bindPopup(function() {
+        var rows = p.stats.map(function(s) {
+            return '<tr><td>' + esc(s[0]) + '</td><td>' + s[1] + '</td><td>' + s[2] + '</td><td>' + s[3] + '</td><td>' + s[4] + '</td></tr>';
+        }).join('');
+        return '<div style="font-family: Arial; font-size: 12px;"><b>' + esc(p.label) + '</b>'
+            + '<table><tr><th>Operator</th><th>Rata-rata</th><th>Min</th><th>Maks</th><th>Jumlah</th></tr>'
+            + rows + '</table></div>';
+    }, {maxWidth: 400});
+}
+"""
+
+def add_grid_layer(m, df_long, jenis_test, parameter, cell_size, color_operator):
+    """Add a choropleth of grid cells, colored from red (worst) to green (best) by the mean of color_operator"""
+    grid = aggregate_grid(df_long, cell_size)
+    if grid.empty:
+        return
+    
+    colored = grid[grid['Operator'] == color_operator]['Rata-rata']
+    colormap = None
+    if not colored.empty:
+        # Lower is better for latency parameters (ms), so their low values are green
+        colors = ['green', 'yellow', 'red'] if parameter_direction(parameter) == -1 else ['red', 'yellow', 'green']
+        colormap = LinearColormap(colors, vmin=colored.min(), vmax=max(colored.max(), colored.min() + 1e-9),
+                                  caption=f"{jenis_test}: rata-rata {parameter} ({color_operator})")
+    
+    features = []
+    for (lat, lon), cell in grid.groupby(['cell_lat', 'cell_lon'], sort=False):
+        south, west = lat * cell_size, lon * cell_size
+        stats = [[str(op), f"{mean:.2f}", f"{low:.2f}", f"{high:.2f}", int(count)]
+                 for op, mean, low, high, count in cell[['Operator', 'Rata-rata', 'Minimum', 'Maksimum', 'Jumlah']].itertuples(index=False)]
+        means = dict(zip(cell['Operator'].astype(str), cell['Rata-rata']))
+        fill = colormap(means[color_operator]) if colormap is not None and color_operator in means else None
+        features.append({
+            'type': 'Feature',
+            'geometry': {'type': 'Polygon', 'coordinates': [[
+                [west, south], [west + cell_size, south], [west + cell_size, south + cell_size],
+                [west, south + cell_size], [west, south]
+            ]]},
+            'properties': {'label': f"{jenis_test} - {parameter}", 'fill': fill, 'stats': stats}
+        })
+    
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        name=f"Grid {jenis_test}",
+        on_each_feature=folium.JsCode(GRID_CELL_JS),
+    ).add_to(m)
+    if colormap is not None:
+        colormap.add_to(m)
+
+# Maps with more points than this are drawn as one GeoJSON canvas layer
+BULK_MAP_THRESHOLD = 1500
+
+# Client-side popup and tooltip for bulk map points, built from feature properties;
+# test type and parameter are shared by the whole layer
+BULK_POINT_JS = """
+function(feature, layer) {
+    var colors = %(colors)s;
+    var jenis = %(jenis)s;
+    var parameter = %(parameter)s;
+    var p = feature.properties;
+    var esc = function(text) {
+        return String(text).replace(/[&<>"']/g, function(c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+        });
+    };
+    layer.setStyle({color: colors[p.operator] || 'gray', fillColor: colors[p.operator] || 'gray'});
+    layer.bindTooltip(function() {
+        return esc(jenis + ': ' + p.operator + ' - ' + p.lokasi + ' | ' + p.koordinat);
+    });
+    layer.bindPopup(function() {
+        return '<div style="font-family: Arial; font-size: 12px;">'
+            + '<b>Jenis Pengukuran:</b> ' + esc(jenis) + '<br>'
+            + '<b>Lokasi:</b> ' + esc(p.lokasi) + '<br>'
+            + '<b>Operator:</b> ' + esc(p.operator) + '<br>'
+            + '<b>Parameter:</b> ' + esc(parameter) + '<br>'
+            + '<b>Nilai:</b> ' + esc(p.nilai) + '<br>'
+            + '<b>Tanggal:</b> ' + esc(p.tanggal) + '<br>'
+            + '<b>Koordinat:</b> <div class="coords-highlight">' + esc(p.koordinat) + '</div>'
+            + (p.kabupaten ? '<b>Kabupaten/Kota:</b> ' + esc(p.kabupaten) + '<br>' : '')
+            + '</div>';
+    }, {maxWidth: 300});
+}
+"""
+
+def build_point_features(df_map, coord_field):
+    """GeoJSON FeatureCollection of long-format rows, popup fields as properties"""
+    nilai = [format_operator_value(v, t) for v, t in zip(df_map['Nilai'].to_numpy(), df_map['Teks'].to_numpy())]
+    kabupaten = (df_map['Kabupaten/Kota'].astype(object).fillna('').to_numpy()
+                 if 'Kabupaten/Kota' in df_map.columns else [''] * len(df_map))
+    
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [round(lon, 6), round(lat, 6)]},
+            'properties': {
+                'operator': op, 'lokasi': lokasi, 'nilai': value, 'tanggal': tanggal, 'koordinat': koordinat, 'kabupaten': kab
+            }
+        }
+        for lat, lon, op, lokasi, value, tanggal, koordinat, kab in zip(
+            df_map['Latitude'].to_numpy(dtype=float).tolist(),
+            df_map['Longitude'].to_numpy(dtype=float).tolist(),
+            df_map['Operator'].astype(str).tolist(),
+            df_map['Alamat'].astype(str).tolist(),
+            nilai,
+            df_map['Tanggal_str'].astype(str).tolist(),
+            df_map[coord_field].astype(str).tolist(),
+            [str(k) for k in kabupaten]
+        )
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
+
+def add_bulk_point_layer(m, df_map, jenis_test, parameter, coord_field):
+    """Add all points of a test type as one GeoJSON layer of canvas circles"""
+    radius = 4 if jenis_test == 'Route Test' else 7
+    folium.GeoJson(
+        build_point_features(df_map, coord_field),
+        name=jenis_test,
+        marker=folium.CircleMarker(radius=radius, weight=1, fill=True, fill_opacity=0.8),
+        on_each_feature=folium.JsCode(BULK_POINT_JS % {
+            'colors': json.dumps(OPERATOR_COLORS),
+            'jenis': json.dumps(jenis_test),
+            'parameter': json.dumps(parameter)
+        }),
+    ).add_to(m)
+
+def create_combined_map(df_route, df_static, param_route, param_static, show_coordinates=True,
+                        coordinate_format="decimal", map_mode=MAP_MODES[0], grid_zoom=12, color_operator=OPERATORS[0]):
+    """Create a map displaying both Route Test and Static Test data
+    
+    df_route and df_static hold the long-format rows of the selected parameters.
+    coordinate_format is "decimal" or "dms"; grid_zoom and color_operator apply
+    to the "Agregasi Grid" map mode. Returns None when there is nothing to show.
+    """
+    # Check if there's data to display
+    has_route_data = not df_route.empty
+    has_static_data = not df_static.empty
+   
+    if not has_route_data and not has_static_data:
+        return None
+   
+    # Keep rows with a value or a text entry
+    df_route_map = df_route[long_has_value(df_route)] if has_route_data else pd.DataFrame()
+    df_static_map = df_static[long_has_value(df_static)] if has_static_data else pd.DataFrame()
+   
+    # Combine data to determine map center
+    df_combined = pd.concat([df_route_map, df_static_map])
+   
+    if df_combined.empty:
+        return None
+   
+    # Calculate center coordinates
+    center_lat = df_combined['Latitude'].mean()
+    center_lon = df_combined['Longitude'].mean()
+   
+    # Large selections are drawn in bulk on a canvas instead of one marker per row
+    grid_mode = map_mode == "Agregasi Grid"
+    bulk_mode = grid_mode or len(df_combined) > BULK_MAP_THRESHOLD
+    
+    # Create map
+    m = leafmap.Map(center=[center_lat, center_lon], zoom=8, prefer_canvas=bulk_mode)
+    m.add_basemap("OpenStreetMap")
+    m.add_basemap("Satellite")
+    
+    # Add coordinate control to map
+    if show_coordinates:
+        # Format according to user choice
+        if coordinate_format == "decimal":
+            formatter = 'function(num) {return L.Util.formatNum(num, 6) + "°";}'
+        else:
+            formatter = '''
+            function(num) {
+                var deg = Math.floor(Math.abs(num));
+                var min = Math.floor((Math.abs(num) - deg) * 60);
+                var sec = ((Math.abs(num) - deg - min/60) * 3600).toFixed(2);
+                var dir = num >= 0 ? "N" : "S";
+                if (this.options.lngFirst) {
+                    dir = num >= 0 ? "E" : "W";
+                }
+                return deg + "°" + min + "'" + sec + '"' + dir;
+            }
+            '''
+            
+        mouse_position = folium.plugins.MousePosition(
+            position='bottomright',
+            separator=' | ',
+            empty_string='',
+            lng_first=False,
+            num_digits=6,
+            prefix='Koordinat:',
+            lat_formatter=formatter,
+            lng_formatter=formatter
+        )
+        m.add_child(mouse_position)
+    
+    # Add CSS for pulse animation
+    folium.Element("""
+    <style>
+        @keyframes pulse {
+            0% { opacity: 1; }
+            50% { opacity: 0.4; }
+            100% { opacity: 1; }
+        }
+        .marker-pulse {
+            animation: pulse 1.5s infinite;
+        }
+        .marker-pulse-fast {
+            animation: pulse 0.8s infinite;
+        }
+        .coordinate-display {
+            background-color: rgba(255, 255, 255, 0.8);
+            border-radius: 4px;
+            padding: 4px 8px;
+            font-weight: bold;
+            color: #333;
+            border: 1px solid #ccc;
+        }
+        .coords-highlight {
+            background-color: #f0f0f0;
+            border-left: 3px solid #2196F3;
+            padding: 3px 6px;
+            margin-top: 4px;
+            font-weight: bold;
+            font-family: monospace;
+        }
+    </style>
+    """).add_to(m)
+   
+    if grid_mode:
+        cell_size = grid_cell_size(grid_zoom)
+        if not df_route_map.empty:
+            add_grid_layer(m, df_route_map, 'Route Test', param_route, cell_size, color_operator)
+        if not df_static_map.empty:
+            add_grid_layer(m, df_static_map, 'Static Test', param_static, cell_size, color_operator)
+    elif bulk_mode:
+        coord_field = coordinate_field(coordinate_format)
+        if not df_route_map.empty:
+            add_bulk_point_layer(m, df_route_map, 'Route Test', param_route, coord_field)
+        if not df_static_map.empty:
+            add_bulk_point_layer(m, df_static_map, 'Static Test', param_static, coord_field)
+    else:
+        # Create marker cluster
+        marker_cluster = folium.plugins.MarkerCluster().add_to(m)
+   
+    # Function to create custom icon
+    def create_custom_icon(jenis_test, operator, nilai):
+        # Determine color based on operator
+        color = OPERATOR_COLORS.get(operator, 'gray')
+        
+        # Create icon HTML based on test type
+        if jenis_test == 'Route Test':
+            icon_html = f"""
+            <div class="marker-pulse" style="animation-delay: {(hash(operator) % 5) * 0.2}s;">
+                <i class="fa fa-map-marker fa-2x" style="color:{color};"></i>
+            </div>
+            """
+            return folium.DivIcon(
+                html=icon_html,
+                icon_size=(30, 30),
+                icon_anchor=(15, 30)
+            )
+        else:
+            icon_html = f"""
+            <div class="marker-pulse-fast" style="animation-delay: {(hash(operator) % 3) * 0.3}s;">
+                <i class="fa fa-wifi fa-2x" style="color:{color};"></i>
+            </div>
+            """
+            return folium.DivIcon(
+                html=icon_html,
+                icon_size=(30, 30),
+                icon_anchor=(15, 15)
+            )
+    
+    # Helper function to get coordinate display
+    def get_coordinate_display(row):
+        return row[coordinate_field(coordinate_format)]
+   
+    # Add Route Test markers
+    if has_route_data and not bulk_mode:
+        for _, row in df_route_map.iterrows():
+            op = row['Operator']
+            
+            # Format value for display
+            nilai = row['Nilai']
+            nilai_str = format_operator_value(nilai, row['Teks'])
+            
+            # Get coordinates in selected format
+            coord_display = get_coordinate_display(row)
+            
+            # Sheet text is escaped, it is shown as HTML
+            lokasi = html.escape(str(row['Alamat']))
+            coord_text = html.escape(str(coord_display))
+           
+            # Create popup content
+            popup_content = f"""
+            <div style="font-family: Arial; font-size: 12px;">
+                <b>Jenis Pengukuran:</b> Route Test<br>
+                <b>Lokasi:</b> {lokasi}<br>
+                <b>Operator:</b> {html.escape(str(op))}<br>
+                <b>Parameter:</b> {html.escape(param_route)}<br>
+                <b>Nilai:</b> {html.escape(nilai_str)}<br>
+                <b>Tanggal:</b> {html.escape(str(row['Tanggal_str']))}<br>
+                <b>Koordinat:</b> <div class="coords-highlight">{coord_text}</div>
+                {"<b>Kabupaten/Kota:</b> " + html.escape(str(row['Kabupaten/Kota'])) + "<br>" if 'Kabupaten/Kota' in df_route_map.columns else ""}
+            </div>
+            """
+           
+            # Create marker
+            folium.Marker(
+                location=[row['Latitude'], row['Longitude']],
+                icon=create_custom_icon('Route Test', op, nilai),
+                popup=folium.Popup(popup_content, max_width=300),
+                tooltip=f"Route Test: {html.escape(str(op))} - {lokasi} | {coord_text}"
+            ).add_to(marker_cluster)
+   
+    # Add Static Test markers
+    if has_static_data and not bulk_mode:
+        for _, row in df_static_map.iterrows():
+            op = row['Operator']
+            
+            # Format value for display
+            nilai = row['Nilai']
+            nilai_str = format_operator_value(nilai, row['Teks'])
+            
+            # Get coordinates in selected format
+            coord_display = get_coordinate_display(row)
+            
+            # Sheet text is escaped, it is shown as HTML
+            lokasi = html.escape(str(row['Alamat']))
+            coord_text = html.escape(str(coord_display))
+           
+            # Create popup content
+            popup_content = f"""
+            <div style="font-family: Arial; font-size: 12px;">
+                <b>Jenis Pengukuran:</b> Static Test<br>
+                <b>Lokasi:</b> {lokasi}<br>
+                <b>Operator:</b> {html.escape(str(op))}<br>
+                <b>Parameter:</b> {html.escape(param_static)}<br>
+                <b>Nilai:</b> {html.escape(nilai_str)}<br>
+                <b>Tanggal:</b> {html.escape(str(row['Tanggal_str']))}<br>
+                <b>Koordinat:</b> <div class="coords-highlight">{coord_text}</div>
+                {"<b>Kabupaten/Kota:</b> " + html.escape(str(row['Kabupaten/Kota'])) + "<br>" if 'Kabupaten/Kota' in df_static_map.columns else ""}
+            </div>
+            """
+           
+            # Create marker
+            folium.Marker(
+                location=[row['Latitude'], row['Longitude']],
+                icon=create_custom_icon('Static Test', op, nilai),
+                popup=folium.Popup(popup_content, max_width=300),
+                tooltip=f"Static Test: {html.escape(str(op))} - {lokasi} | {coord_text}"
+            ).add_to(marker_cluster)
+   
+    # Add legend
+    legend_html = """
+    <div style="position: fixed; bottom: 50px; right: 50px; z-index: 1000; background-color: white;
+                padding: 10px; border: 2px solid grey; border-radius: 5px">
+        <div style="margin-bottom: 5px;"><b>Operator:</b></div>
+    """
+   
+    # Add operator legend
+    for op in OPERATORS:
+        legend_html += f"""
+        <div style="margin-bottom: 3px;">
+            <i style="background:{OPERATOR_COLORS.get(op, 'gray')}; width: 12px; height: 12px; display: inline-block; border: 1px solid black;" 
+               class="marker-pulse"></i> {op}
+        </div>
+        """
+   
+    # Add test type legend
+    legend_html += """
+        <div style="margin-top: 10px; margin-bottom: 5px;"><b>Jenis Pengukuran:</b></div>
+        <div style="margin-bottom: 3px;" class="marker-pulse"><i class="fa fa-map-marker" style="color:gray;"></i> Route Test</div>
+        <div style="margin-bottom: 3px;" class="marker-pulse-fast"><i class="fa fa-wifi" style="color:gray;"></i> Static Test</div>
+    </div>
+    """
+   
+    m.add_html(html=legend_html, position="bottomright")
+   
+    return m
+
+# Client-side style, tooltip and popup of before/after diff points
+PERIOD_DIFF_JS = """
+function(feature, layer) {
+    var p = feature.properties;
+    var esc = function(text) {
+        return String(text).replace(/[&<>"']/g, function(c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+        });
+    };
+    layer.setRadius(p.radius);
+    layer.setStyle({color: p.delta >= 0 ? '#1f77b4' : '#ff7f0e', fillColor: p.delta >= 0 ? '#1f77b4' : '#ff7f0e'});
+    layer.bindTooltip(esc(p.operator) + ': ' + (p.delta >= 0 ? '+' : '') + p.delta.toFixed(2));
+    layer.bindPopup(function() {
+        return '<div style="font-family: Arial; font-size: 12px;">'
+            + '<b>Operator:</b> ' + esc(p.operator) + '<br>'
+            + '<b>Lokasi Before:</b> ' + esc(p.before_site) + '<br>'
+            + '<b>Lokasi After:</b> ' + esc(p.after_site) + '<br>'
+            + '<b>Nilai:</b> ' + p.before.toFixed(2) + ' &rarr; ' + p.after.toFixed(2) + '<br>'
+            + '<b>Selisih:</b> ' + p.delta.toFixed(2)
+            + (p.pct === null ? '' : ' (' + p.pct.toFixed(1) + '%)') + '<br>'
+            + '<b>Pencocokan:</b> ' + esc(p.match)
+            + '</div>';
+    }, {maxWidth: 300});
+}
+"""
+
+def create_period_diff_map(comparison, parameter):
+    """Create a map of before/after changes, one circle per site and operator"""
+    data = comparison[comparison['Latitude'].notna() & comparison['Longitude'].notna()]
+    if data.empty:
+        return None
+    
+    m = leafmap.Map(center=[data['Latitude'].mean(), data['Longitude'].mean()], zoom=8)
+    m.add_basemap("OpenStreetMap")
+    
+    # Larger circles for larger relative changes
+    pct = data['Perubahan (%)'].abs().fillna(0).clip(upper=100).to_numpy()
+    radius = 5 + pct / 10
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': {
+                'operator': op, 'before_site': before_site, 'after_site': after_site, 'before': before,
+                'after': after, 'delta': delta, 'pct': None if np.isnan(change) else change,
+                'match': match, 'radius': r
+            }
+        }
+        for lat, lon, op, before_site, after_site, before, after, delta, change, match, r in zip(
+            data['Latitude'].tolist(), data['Longitude'].tolist(), data['Operator'].astype(str).tolist(),
+            data['Alamat Before'].tolist(), data['Alamat After'].tolist(), data['Nilai Before'].tolist(),
+            data['Nilai After'].tolist(), data['Selisih'].tolist(), data['Perubahan (%)'].tolist(),
+            data['Pencocokan'].tolist(), radius.tolist()
+        )
+    ]
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        name=f"Perubahan {parameter}",
+        marker=folium.CircleMarker(radius=6, weight=1, fill=True, fill_opacity=0.7),
+        on_each_feature=folium.JsCode(PERIOD_DIFF_JS),
+    ).add_to(m)
+    
+    legend_html = """
+    <div style="position: fixed; bottom: 50px; right: 50px; z-index: 1000; background-color: white;
+                padding: 10px; border: 2px solid grey; border-radius: 5px">
+        <div style="margin-bottom: 5px;"><b>Perubahan (After - Before):</b></div>
+        <div><i style="background:#1f77b4; width: 12px; height: 12px; display: inline-block;"></i> Naik</div>
+        <div><i style="background:#ff7f0e; width: 12px; height: 12px; display: inline-block;"></i> Turun</div>
+    </div>
+    """
+    m.add_html(html=legend_html, position="bottomright")
+    return m
@@ -0,0 +1,131 @@
+"""Typing and enrichment of raw measurement rows"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .coordinates import add_coordinate_columns
+from .perf import perf_span
+from .schema import CATEGORY_COLUMNS, DERIVED_CATEGORY_COLUMNS, OPERATORS, OPERATOR_TEXT_SUFFIX, RATING_VALUES
+
+# ====== DATA SCHEMA ======
+#
+# Normalized measurements are kept in a compact, typed layout:
+#   - low-cardinality text columns (and the derived date/coordinate strings,
+#     which repeat for every parameter measured at a point) as categoricals
+#   - operator values as float32, with ratings mapped to 4..1; the original
+#     text of non-numeric entries ('Excellent', '-', ...) is kept in a separate
+#     categorical "<operator>_teks" column. float32 holds about 7 significant
+#     digits, more than the 2-3 decimals measurements are entered with, at half
+#     the memory of float64; it does print widened values (45.8199997 for
+#     45.82), so values are shown through operator_values_float64
+#   - coordinates as float64
+# The memory used by each column before and after the conversion is stored in
+# df.attrs['memory_usage'] as {column: [bytes before, bytes after]}.
+
+def split_operator_values(values):
+    """Split raw operator values into float32 numbers and the text of non-numeric entries"""
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        # Same str categories dtype as the text of columns with entries, so the two can be unioned
+        no_text = pd.Categorical.from_codes(np.full(len(values), -1), categories=pd.Index([], dtype=str))
+        return values.astype('float32'), pd.Series(no_text, index=values.index)
+    
+    numeric = pd.to_numeric(values, errors='coerce')
+    
+    # Non-blank entries that aren't numbers are kept as text
+    is_text = numeric.isna() & values.notna() & (values.astype(str).str.strip() != '')
+    text = values.where(is_text).astype('category')
+    
+    # Replace common text representations with their rating
+    numeric = numeric.fillna(values.map(RATING_VALUES))
+    return numeric.astype('float32'), text
+
+def apply_schema(df):
+    """Convert a normalized DataFrame to the compact typed schema"""
+    before = df.memory_usage(index=False, deep=True)
+    
+    for operator in OPERATORS:
+        if operator in df.columns:
+            df[operator], df[operator + OPERATOR_TEXT_SUFFIX] = split_operator_values(df[operator])
+    
+    for column in CATEGORY_COLUMNS + DERIVED_CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    
+    for column in ('Latitude', 'Longitude'):
+        if column in df.columns:
+            df[column] = df[column].astype('float64')
+    
+    after = df.memory_usage(index=False, deep=True)
+    df.attrs['memory_usage'] = {
+        column: [int(before.get(column, 0)), int(after[column])] for column in after.index
+    }
+    return df
+
+def memory_usage_report(df):
+    """Table of memory per column before and after the typed schema, in KB"""
+    usage = df.attrs.get('memory_usage')
+    if not usage:
+        return None
+    
+    report = pd.DataFrame.from_dict(usage, orient='index', columns=['Sebelum (KB)', 'Sesudah (KB)']) / 1024
+    report.loc['Total'] = report.sum()
+    report['Rasio'] = report['Sebelum (KB)'] / report['Sesudah (KB)']
+    return report.round(1)
+
+def union_typed_categoricals(values):
+    """union_categoricals of categoricals whose categories may differ in dtype
+    
+    A part without any entries (a blank CSV chunk, an operator column without
+    text) has empty object categories, while parts with entries have str ones.
+    Empty categories take the dtype of the others; differing non-empty dtypes
+    fall back to object.
+    """
+    dtypes = {v.dtype.categories.dtype for v in values if len(v.dtype.categories)}
+    common = dtypes.pop() if len(dtypes) == 1 else np.dtype(object)
+    values = [
+        v if v.dtype.categories.dtype == common
+        else v.astype(pd.CategoricalDtype(v.dtype.categories.astype(common)))
+        for v in values
+    ]
+    return union_categoricals(values, ignore_order=True)
+
+def concat_typed_frames(frames):
+    """Concatenate frames, keeping columns that are categorical in every frame categorical"""
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    
+    df = pd.concat(frames, ignore_index=True)
+    
+    # pd.concat falls back to object when the categories differ between frames
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        if all(column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames):
+            df[column] = union_typed_categoricals([frame[column] for frame in frames])
+    return df
+
+def normalize_data(df):
+    """Type and enrich raw sheet data (coordinates, dates, operator values)"""
+    with perf_span("normalize_data", len(df)):
+        return _normalize_data(df)
+
+def _normalize_data(df):
+    """Body of normalize_data"""
+    # Process coordinates
+    if 'Latitude' in df.columns and 'Longitude' in df.columns:
+        # Convert to numeric, handling both text and numbers
+        df['Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
+        df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
+        
+        # Add formatted coordinate columns
+        add_coordinate_columns(df)
+    
+    # Process date column
+    if 'Tanggal' in df.columns:
+        df['Tanggal'] = pd.to_datetime(df['Tanggal'], errors='coerce')
+        df['Bulan'] = df['Tanggal'].dt.strftime('%B %Y')
+        df['Tanggal_str'] = df['Tanggal'].dt.strftime('%d-%m-%Y')
+    
+    # Convert operator values and text columns to the compact schema
+    return apply_schema(df)
@@ -0,0 +1,60 @@
+"""Timing spans around the hot paths of the data pipeline"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ====== PERFORMANCE SPANS ======
+# Hot paths (Sheets fetch, normalization, filtering, chart and map building)
+# run inside perf_span, which records duration, row count and the change of
+# resident memory. Spans go to the collection started by collect_spans in the
+# current context (one Streamlit run, one batch job) and are appended as JSON
+# lines to QOE_PERF_LOG when it is set.
+
+# JSON-lines file receiving every span, disabled when empty
+PERF_LOG_PATH = os.environ.get("QOE_PERF_LOG", "")
+PERF_LOG_LOCK = threading.Lock()
+
+# (start time, list of spans) of the current collection, None when not collecting
+_collection = contextvars.ContextVar("qoe_perf_collection", default=None)
+
+def collect_spans():
+    """Start a new span collection in the current context and return its list"""
+    spans = []
+    _collection.set((time.perf_counter(), spans))
+    return spans
+
+def map_with_spans(pool, func, items):
+    """pool.map whose tasks record their spans in the caller's collection"""
+    futures = [pool.submit(contextvars.copy_context().run, func, item) for item in items]
+    return [future.result() for future in futures]
+
+def resident_memory_bytes():
+    """Current resident set size of the process, 0 where it cannot be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+@contextmanager
+def perf_span(name, rows=None):
+    """Time a block; the yielded record takes the row count when it is only known inside"""
+    record = {'span': name, 'rows': rows, 'thread': threading.current_thread().name}
+    collection = _collection.get()
+    start_memory = resident_memory_bytes()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = round(time.perf_counter() - start, 4)
+        record['memory_delta_mb'] = round((resident_memory_bytes() - start_memory) / 2**20, 2)
+        if collection is not None:
+            record['start'] = round(start - collection[0], 4)
+            collection[1].append(record)
+        if PERF_LOG_PATH:
+            line = json.dumps(dict(record, time=time.time()))
+            with PERF_LOG_LOCK, open(PERF_LOG_PATH, "a") as f:
+                f.write(line + "\n")
@@ -0,0 +1,242 @@
+"""Batch report: every (test type x parameter) chart, comparison table and map as files
+
+Run from the repository root:
+
+    python -m qoe_core.report data/ --output laporan/
+    python -m qoe_core.report campaign.parquet --month "March 2025" --png --output laporan_maret/
+    python -m qoe_core.report --sheet-id <spreadsheet id> --worksheet Sheet1 --output laporan/
+"""
+import argparse
+import html
+import importlib.util
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from . import charts, maps
+from .aggregate import BARCHART_LARGE_MODES, BARCHART_TOP_N, MAP_MODES, rank_locations
+from .compare import location_comparison_table
+from .index import build_filter_index, build_long_table, lookup_rows, lookup_values, select_long_rows
+from .ingest import list_local_files, read_local_files, read_snapshot, read_snapshot_file
+from .perf import collect_spans, perf_span
+
+# ====== BATCH REPORT ======
+#
+# A report holds, for every parameter of every test type in the filtered data,
+# the bar chart (HTML, optionally PNG), the long-format rows, the location
+# ranking and best/worst comparison (CSV) and the map (HTML). The dataset is
+# loaded and normalized once in the parent process and handed to the workers of
+# a process pool through the pool initializer: inherited on fork, pickled once
+# per worker on spawn, never once per task. Each worker builds the filter index
+# and long table once and then renders one (test type, parameter) after another.
+
+TEST_TYPES = ["Route Test", "Static Test"]
+
+# Dataset structures and report options of a worker process, set by init_worker
+_WORKER = {}
+
+def slugify(text):
+    """File name part of a test type or parameter name"""
+    return re.sub(r'[^0-9a-z]+', '_', str(text).lower()).strip('_')
+
+def load_source(path=None, sheet_id=None, worksheet="Sheet1", pattern="*"):
+    """Normalized dataset of a CSV/Parquet file or directory, a snapshot file or a stored worksheet snapshot"""
+    with perf_span("load_data") as span:
+        if sheet_id:
+            df = read_snapshot(sheet_id, worksheet)
+        elif os.path.splitext(path)[1].lower() == '.arrow':
+            df = read_snapshot_file(path)
+        else:
+            files = list_local_files(path, pattern)
+            df = read_local_files(files) if files else None
+        span['rows'] = 0 if df is None else len(df)
+    return df
+
+def report_tasks(df, selections):
+    """(test type, parameter) pairs present in the rows matching the selections"""
+    index = build_filter_index(df)
+    return [
+        (test_type, parameter)
+        for test_type in TEST_TYPES
+        for parameter in lookup_values(index, 'Parameter', {**selections, 'Jenis Pengukuran': [test_type]})
+    ]
+
+def init_worker(df, selections, options):
+    """Build the dataset structures of a worker process once"""
+    _WORKER.update(
+        index=build_filter_index(df),
+        long_data=build_long_table(df),
+        selections=selections,
+        options=options,
+    )
+
+def render_parameter(task):
+    """Write the files of one (test type, parameter); returns its manifest entry"""
+    test_type, parameter = task
+    options = _WORKER['options']
+    spans = collect_spans()
+    start = time.perf_counter()
+
+    with perf_span("filter") as span:
+        selections = {**_WORKER['selections'], 'Jenis Pengukuran': [test_type], 'Parameter': [parameter]}
+        df_plot = select_long_rows(_WORKER['long_data'], lookup_rows(_WORKER['index'], selections))
+        span['rows'] = len(df_plot)
+
+    directory = os.path.join(options['output'], slugify(test_type))
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, slugify(parameter))
+    files = []
+
+    def written(suffix):
+        files.append(os.path.relpath(base + suffix, options['output']))
+        return base + suffix
+
+    df_plot.to_csv(written('_data.csv'), index=False)
+
+    with perf_span("create_barchart", len(df_plot)):
+        fig = charts.barchart_figure(df_plot, parameter, test_type, options['bar_mode'], options['top_n'])
+    if fig is not None:
+        fig.write_html(written('_chart.html'), include_plotlyjs='cdn')
+        if options['png']:
+            with perf_span("write_image", len(df_plot)):
+                fig.write_image(written('_chart.png'))
+
+    with perf_span("rank_locations", len(df_plot)):
+        ranking = rank_locations(df_plot, options['top_n'])
+    ranking.to_csv(written('_ranking.csv'), index=False)
+    comparison = location_comparison_table(ranking, parameter, test_type, options['coordinate_format'])
+    if comparison is not None:
+        comparison.to_csv(written('_comparison.csv'), index=False)
+
+    if options['maps']:
+        empty = df_plot.iloc[:0]
+        df_route, df_static = (df_plot, empty) if test_type == "Route Test" else (empty, df_plot)
+        with perf_span("create_combined_map", len(df_plot)):
+            combined_map = maps.create_combined_map(
+                df_route, df_static, parameter, parameter,
+                coordinate_format=options['coordinate_format'],
+                map_mode=options['map_mode']
+            )
+        if combined_map is not None:
+            with perf_span("to_html", len(df_plot)) as span:
+                map_html = combined_map.to_html()
+                span['bytes'] = len(map_html)
+            with open(written('_map.html'), 'w', encoding='utf-8') as f:
+                f.write(map_html)
+
+    return {
+        'Jenis Pengukuran': test_type,
+        'Parameter': parameter,
+        'Baris': len(df_plot),
+        'Detik': round(time.perf_counter() - start, 3),
+        'Berkas': files,
+        'spans': spans,
+    }
+
+def write_index(output, manifest, title):
+    """Write the manifest CSV and an HTML page linking every report file"""
+    pd.DataFrame(manifest).drop(columns='spans').assign(
+        Berkas=lambda m: m['Berkas'].str.join(' ')
+    ).to_csv(os.path.join(output, 'manifest.csv'), index=False)
+
+    rows = []
+    for entry in manifest:
+        links = ' '.join(
+            f'<a href="{html.escape(path)}">{html.escape(os.path.basename(path))}</a>' for path in entry['Berkas']
+        )
+        rows.append(
+            f"<tr><td>{html.escape(entry['Jenis Pengukuran'])}</td><td>{html.escape(entry['Parameter'])}</td>"
+            f"<td>{entry['Baris']}</td><td>{links}</td></tr>"
+        )
+    page = (
+        f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head><body>\n"
+        f"<h1>{html.escape(title)}</h1>\n"
+        "<table border=\"1\" cellpadding=\"4\">\n"
+        "<tr><th>Jenis Pengukuran</th><th>Parameter</th><th>Baris</th><th>Berkas</th></tr>\n"
+        + "\n".join(rows) +
+        "\n</table>\n</body></html>\n"
+    )
+    with open(os.path.join(output, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(page)
+
+def run_report(df, output, selections=None, workers=None, png=False, top_n=BARCHART_TOP_N, bar_mode=None,
+               coordinate_format="decimal", map_mode=MAP_MODES[0], include_maps=True, title="Laporan QoE SIGMON"):
+    """Render the report of a normalized dataset into output; yields each manifest entry when it is done"""
+    selections = selections or {}
+    tasks = report_tasks(df, selections)
+    if not tasks:
+        return
+
+    os.makedirs(output, exist_ok=True)
+    options = {
+        'output': output,
+        'png': png,
+        'top_n': top_n,
+        'bar_mode': bar_mode,
+        'coordinate_format': coordinate_format,
+        'map_mode': map_mode,
+        'maps': include_maps,
+    }
+
+    manifest = []
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(df, selections, options)) as pool:
+        for entry in pool.map(render_parameter, tasks):
+            manifest.append(entry)
+            yield entry
+    write_index(output, manifest, title)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', nargs='?', help="CSV/Parquet file or directory, or an .arrow snapshot file")
+    parser.add_argument('--pattern', default="*", help="Glob pattern of the data files in a source directory")
+    parser.add_argument('--sheet-id', help="Spreadsheet whose stored snapshot is reported instead of a source path")
+    parser.add_argument('--worksheet', default="Sheet1")
+    parser.add_argument('--output', required=True, help="Directory receiving the report files")
+    parser.add_argument('--month', help="Only report this month (Bulan, e.g. \"March 2025\")")
+    parser.add_argument('--district', action='append', help="Only report these districts (Kabupaten/Kota), repeatable")
+    parser.add_argument('--workers', type=int, help="Worker processes, default one per CPU")
+    parser.add_argument('--png', action='store_true', help="Also write PNG charts (needs kaleido)")
+    parser.add_argument('--top-n', type=int, default=BARCHART_TOP_N, help="Locations per ranking and Top/Bottom N chart")
+    parser.add_argument('--bar-mode', choices=BARCHART_LARGE_MODES, help="Bar chart mode above the location limit")
+    parser.add_argument('--coordinate-format', choices=["decimal", "dms"], default="decimal")
+    parser.add_argument('--map-mode', choices=MAP_MODES, default=MAP_MODES[0])
+    parser.add_argument('--no-maps', action='store_true', help="Skip the maps, the slowest part of a report")
+    args = parser.parse_args()
+
+    if not args.source and not args.sheet_id:
+        parser.error("a source path or --sheet-id is required")
+    if args.png and importlib.util.find_spec('kaleido') is None:
+        parser.error("--png needs the kaleido package")
+
+    start = time.perf_counter()
+    df = load_source(args.source, args.sheet_id, args.worksheet, args.pattern)
+    if df is None:
+        sys.exit("no data found in the source")
+    print(f"loaded {len(df)} rows in {time.perf_counter() - start:.2f}s")
+
+    selections = {}
+    if args.month:
+        selections['Bulan'] = [args.month]
+    if args.district:
+        selections['Kabupaten/Kota'] = args.district
+
+    entries = 0
+    for entry in run_report(
+        df, args.output, selections, args.workers, args.png, args.top_n, args.bar_mode,
+        args.coordinate_format, args.map_mode, not args.no_maps
+    ):
+        entries += 1
+        print(f"{entry['Jenis Pengukuran']:<12} {entry['Parameter']:<24} {entry['Baris']:>9} rows {entry['Detik']:>8.2f}s")
+
+    if not entries:
+        sys.exit("no rows match the filters")
+    print(f"wrote {entries} parameters to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Column layout, operator constants and operator value helpers of the QoE data"""
+import numpy as np
+import pandas as pd
+
+# Define color map for operators
+OPERATOR_COLORS = {
+    'Telkomsel': 'red',
+    'XL Axiata': 'blue',
+    'IOH': 'yellow'
+}
+
+# Operator list
+OPERATORS = ['Telkomsel', 'IOH', 'XL Axiata']
+
+# Text columns read as categoricals from local files
+CATEGORY_COLUMNS = ['Bulan', 'Hari', 'Jenis Pengukuran', 'Test', 'Parameter',
+                    'Kabupaten/Kota', 'Alamat', 'Keterangan']
+
+# Derived string columns that repeat for every parameter measured at a point
+DERIVED_CATEGORY_COLUMNS = ['Tanggal_str', 'Koordinat', 'Koordinat_DMS']
+
+# Numeric values of text ratings in operator columns
+RATING_VALUES = {'Excellent': 4, 'Good': 3, 'Fair': 2, 'Poor': 1}
+
+# Suffix of the column keeping the text of non-numeric operator values
+OPERATOR_TEXT_SUFFIX = "_teks"
+
+# Explicit dtypes for local files. Operator columns are left to the parser
+# because they may hold text ratings ('Excellent', 'Good', ...).
+LOCAL_DTYPES = {
+    **{column: 'category' for column in CATEGORY_COLUMNS},
+    'Tanggal': str,
+    'Latitude': 'float64',
+    'Longitude': 'float64',
+}
+
+# Column tagging each row of a merged load with the worksheet it came from
+SOURCE_COLUMN = 'Sumber'
+
+# Descriptive columns carried over into the long-format table
+LONG_ID_COLUMNS = ['Alamat', 'Tanggal', 'Bulan', 'Jenis Pengukuran', 'Parameter',
+                   'Tanggal_str', 'Latitude', 'Longitude', 'Koordinat', 'Koordinat_DMS',
+                   'Kabupaten/Kota', 'Keterangan', 'Sumber']
+
+# Columns indexed for the dashboard filters
+INDEX_COLUMNS = ['Bulan', 'Kabupaten/Kota', 'Jenis Pengukuran', 'Alamat', 'Parameter']
+
+# Direction of the QoE parameters: 1 if higher is better, -1 if lower is better.
+# Other parameters follow their unit (see parameter_direction).
+PARAMETER_DIRECTIONS = {
+    'DL speed (Mbps)': 1,
+    'DL (Mbps)': 1,
+    'UL (Mbps)': 1,
+    'Throughput V (Mbps)': 1,
+    'Throughput W (Mbps)': 1,
+    'Ping (ms)': -1,
+    'Initial Buffering (ms)': -1,
+    'Loading time (ms)': -1,
+}
+
+def operator_values_float64(values):
+    """Widen float32 operator values to float64 for display (45.82, not 45.8199997)
+    
+    Each value becomes the float64 of the shortest decimal that still rounds
+    back to the same float32, i.e. the number as it was entered in the sheet.
+    This is what repr() does for one float32, vectorized over a whole array.
+    """
+    x32 = np.asarray(values, dtype=np.float32)
+    x64 = x32.astype(np.float64)
+    result = x64.copy()
+    
+    pending = np.isfinite(x64) & (x64 != 0)
+    magnitude = np.floor(np.log10(np.abs(np.where(pending, x64, 1.0))))
+    
+    # Try 1, 2, ... 9 significant digits until the rounded value round-trips
+    for digits in range(1, 10):
+        idx = np.flatnonzero(pending)
+        if idx.size == 0:
+            break
+        shift = (digits - 1 - magnitude[idx]).astype(np.int64)
+        up = 10.0 ** np.clip(shift, 0, 22)
+        down = 10.0 ** np.clip(-shift, 0, 22)
+        candidate = np.round(x64[idx] * up / down) / up * down
+        
+        round_trips = candidate.astype(np.float32) == x32[idx]
+        result[idx[round_trips]] = candidate[round_trips]
+        pending[idx[round_trips]] = False
+    
+    return result
+
+def format_operator_value(value, text=None):
+    """Format an operator value for display, preferring its original text"""
+    if text is not None and not pd.isna(text):
+        return str(text)
+    if isinstance(value, np.floating):
+        # Shortest representation for the value's own precision (12.509, not 12.50900077)
+        return np.format_float_positional(value, trim='-')
+    return f"{value}"
@@ -0,0 +1,196 @@
+"""Google Sheets fetching through the local snapshot cache"""
+from concurrent.futures import ThreadPoolExecutor
+
+import gspread
+import gspread.utils
+import pandas as pd
+
+from .ingest import read_snapshot, read_snapshot_info, row_hash, write_snapshot
+from .normalize import concat_typed_frames, normalize_data
+from .perf import map_with_spans, perf_span
+from .schema import SOURCE_COLUMN
+
+# Concurrent spreadsheet fetches/normalizations of a merged load
+MERGE_WORKERS = 4
+
+def get_sheet_modified_time(gc, sheet_id):
+    """Get the Drive modifiedTime of a spreadsheet, or None if it can't be read"""
+    try:
+        return gc.get_file_drive_metadata(sheet_id)["modifiedTime"]
+    except Exception:
+        return None
+
+# ====== SHEET FETCHING ======
+
+def records_to_frame(header, rows):
+    """Build a DataFrame from raw sheet rows the same way get_all_records() does"""
+    if len(set(header)) != len(header):
+        raise gspread.exceptions.GSpreadException("the header row in the worksheet is not unique")
+    
+    width = len(header)
+    records = [gspread.utils.numericise_all(list(row[:width]) + [""] * (width - len(row))) for row in rows]
+    return pd.DataFrame(records, columns=header)
+
+def fetch_worksheet(sh, sheet_name):
+    """Fetch a whole worksheet, returns (raw DataFrame, sync info)"""
+    return values_to_frame(sh.worksheet(sheet_name).get_values())
+
+def values_to_frame(values):
+    """Build (raw DataFrame, sync info) from all values of a worksheet"""
+    if len(values) < 2:
+        return None, None
+    
+    header, rows = values[0], values[1:]
+    info = {
+        'header': header,
+        'rows': len(rows),
+        'last_row_hash': row_hash(rows[-1], len(header)),
+    }
+    return records_to_frame(header, rows), info
+
+def fetch_worksheet_delta(sh, sheet_name, info):
+    """Fetch only the rows appended after a snapshot, returns (raw DataFrame, sync info)
+    
+    Returns (None, None) when the sheet was not just appended to, i.e. the last
+    ingested row has changed or disappeared; the caller should then do a full fetch.
+    """
+    header = info['header']
+    last_column = gspread.utils.rowcol_to_a1(1, len(header)).rstrip("0123456789")
+    
+    # Start at the last ingested row (row 1 is the header) to check it is unchanged
+    start_row = info['rows'] + 1
+    response = sh.values_get(gspread.utils.absolute_range_name(sheet_name, f"A{start_row}:{last_column}"))
+    rows = response.get("values", [])
+    
+    if not rows or row_hash(rows[0], len(header)) != info['last_row_hash']:
+        return None, None
+    
+    new_rows = rows[1:]
+    new_info = dict(info)
+    if new_rows:
+        new_info['rows'] = info['rows'] + len(new_rows)
+        new_info['last_row_hash'] = row_hash(new_rows[-1], len(header))
+    return records_to_frame(header, new_rows), new_info
+
+def fetch_worksheet_titles(gc, sheet_id):
+    """Titles of the worksheets in a spreadsheet"""
+    return [worksheet.title for worksheet in gc.open_by_key(sheet_id).worksheets()]
+
+def fetch_sheet_data(gc, sheet_id, sheet_name, incremental=False):
+    """Fetch and normalize a worksheet through its local snapshot, None if it is empty
+    
+    With incremental=True, rows appended since the last snapshot are fetched and
+    normalized on their own and appended to the snapshot instead of reloading
+    the whole worksheet.
+    """
+    # Use the local snapshot if the spreadsheet hasn't changed since it was taken
+    modified_time = get_sheet_modified_time(gc, sheet_id)
+    info = read_snapshot_info(sheet_id, sheet_name) if modified_time is not None else None
+    if info is not None and info.get('modified_time') == modified_time:
+        df = read_snapshot(sheet_id, sheet_name)
+        if df is not None:
+            return df
+    
+    # Open spreadsheet by ID
+    sh = gc.open_by_key(sheet_id)
+    
+    # Fetch and normalize only the appended rows
+    if incremental and info is not None:
+        snapshot = read_snapshot(sheet_id, sheet_name)
+        with perf_span("sheets_fetch_delta") as span:
+            delta, delta_info = fetch_worksheet_delta(sh, sheet_name, info) if snapshot is not None else (None, None)
+            span['rows'] = 0 if delta is None else len(delta)
+        if delta is not None:
+            if not delta.empty:
+                df = concat_typed_frames([snapshot, normalize_data(delta)])
+            else:
+                df = snapshot
+            write_snapshot(df, sheet_id, sheet_name, dict(delta_info, modified_time=modified_time))
+            return df
+    
+    # Get all values and headers
+    with perf_span("sheets_fetch") as span:
+        df, info = fetch_worksheet(sh, sheet_name)
+        span['rows'] = 0 if df is None else len(df)
+    
+    # Process the DataFrame
+    if df is None or df.empty:
+        return None
+    
+    df = normalize_data(df)
+    
+    if modified_time is not None:
+        write_snapshot(df, sheet_id, sheet_name, dict(info, modified_time=modified_time))
+    
+    return df
+
+# ====== MERGED SHEET LOADING ======
+#
+# Campaigns split over several worksheets/spreadsheets are loaded as one frame.
+# Worksheets are grouped per spreadsheet: each spreadsheet costs one Drive
+# metadata call plus a single values_batch_get for the worksheets without a
+# fresh snapshot. Spreadsheets are fetched concurrently, then every worksheet is
+# normalized concurrently, so the load takes about as long as the slowest sheet.
+
+def fetch_spreadsheet_values(gc, sheet_id, sheet_names):
+    """Snapshots or raw values of worksheets of one spreadsheet
+    
+    Returns (modified_time, {sheet_name: DataFrame or (raw DataFrame, sync info)}).
+    """
+    modified_time = get_sheet_modified_time(gc, sheet_id)
+    results = {}
+    missing = []
+    for sheet_name in sheet_names:
+        info = read_snapshot_info(sheet_id, sheet_name) if modified_time is not None else None
+        df = read_snapshot(sheet_id, sheet_name) if info is not None and info.get('modified_time') == modified_time else None
+        if df is not None:
+            results[sheet_name] = df
+        else:
+            missing.append(sheet_name)
+    
+    if missing:
+        with perf_span("sheets_fetch_batch", len(missing)):
+            response = gc.open_by_key(sheet_id).values_batch_get([gspread.utils.absolute_range_name(name) for name in missing])
+        for sheet_name, value_range in zip(missing, response.get('valueRanges', [])):
+            results[sheet_name] = values_to_frame(value_range.get('values', []))
+    return modified_time, results
+
+def normalize_fetched(result, sheet_id, sheet_name, modified_time):
+    """Normalize a freshly fetched worksheet and snapshot it; snapshots pass through"""
+    if isinstance(result, pd.DataFrame):
+        return result
+    
+    raw, info = result
+    if raw is None or raw.empty:
+        return None
+    
+    df = normalize_data(raw)
+    if modified_time is not None:
+        write_snapshot(df, sheet_id, sheet_name, dict(info, modified_time=modified_time))
+    return df
+
+def fetch_sheet_set(gc, sources, max_workers=MERGE_WORKERS):
+    """Fetch (sheet_id, sheet_name, label) sources into one typed frame, tagged per row with its label"""
+    sheet_names = {}
+    for sheet_id, sheet_name, _ in sources:
+        sheet_names.setdefault(sheet_id, []).append(sheet_name)
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="qoe-merge") as pool:
+        fetched = dict(zip(sheet_names, map_with_spans(
+            pool, lambda item: fetch_spreadsheet_values(gc, *item), sheet_names.items()
+        )))
+        frames = map_with_spans(
+            pool,
+            lambda source: normalize_fetched(
+                fetched[source[0]][1][source[1]], source[0], source[1], fetched[source[0]][0]
+            ),
+            sources
+        )
+    
+    labels = [label for _, _, label in sources]
+    categories = list(dict.fromkeys(labels))
+    tagged = [
+        df.assign(**{SOURCE_COLUMN: pd.Categorical([label] * len(df), categories=categories)})
+        for df, label in zip(frames, labels) if df is not None
+    ]
+    return concat_typed_frames(tagged)
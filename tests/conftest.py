@@ -0,0 +1,31 @@
+import os
+
+import pandas as pd
+import pytest
+
+from qoe_core.schema import OPERATORS
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                          "data", "Data QoS Posko 1446 H Before After.csv")
+
+
+@pytest.fixture
+def sample_csv():
+    """Path of the bundled Before/After campaign"""
+    return SAMPLE_CSV
+
+
+@pytest.fixture
+def long_rows():
+    """Build Static Test long-format rows from tuples of the given columns
+
+    Extra keyword arguments are constant columns; text columns are categorical
+    as in the app's long table.
+    """
+    def build(rows, columns, **constants):
+        df = pd.DataFrame(rows, columns=columns).assign(**{'Jenis Pengukuran': 'Static Test', **constants})
+        for column in df.columns.drop(['Operator', 'Nilai', 'Latitude', 'Longitude'], errors='ignore'):
+            df[column] = df[column].astype('category')
+        df['Operator'] = pd.Categorical(df['Operator'], categories=OPERATORS)
+        return df
+    return build
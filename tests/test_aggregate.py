@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qoe_core import aggregate
+from qoe_core.aggregate import (
+    ALL_DISTRICTS, ROLLUP_FREQUENCIES, aggregate_bar_locations, build_rollups, distribution_summary, normalized_scores,
+    rank_bar_locations, score_operators, selected_distribution,
+)
+from qoe_core.index import build_filter_index, build_long_table, lookup_rows, select_long_rows
+from qoe_core.normalize import normalize_data
+from qoe_core.schema import OPERATORS
+
+
+def wide_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return normalize_data(pd.DataFrame({
+        'Jenis Pengukuran': 'Static Test',
+        'Parameter': rng.choice(['DL (Mbps)', 'Ping (ms)'], rows),
+        'Alamat': [f'Lokasi {i % 40}' for i in range(rows)],
+        'Telkomsel': rng.lognormal(3, 0.5, rows),
+        'IOH': rng.lognormal(2.5, 0.5, rows),
+        'XL Axiata': rng.lognormal(2, 0.5, rows),
+    }))
+
+
+def test_exact_distribution_matches_numpy():
+    long_df = build_long_table(wide_frame(3000))['table']
+    summary = distribution_summary(long_df, approximate=False)['summary']
+    for row in summary.itertuples(index=False):
+        values = long_df[(long_df['Parameter'] == row.Parameter) & (long_df['Operator'] == row.Operator)]['Nilai']
+        assert row.Jumlah == len(values)
+        assert np.isclose(row.P50, np.quantile(values, 0.5))
+        assert np.isclose(row.P95, np.quantile(values, 0.95))
+
+
+def test_streamed_distribution_matches_in_memory_sketch(monkeypatch):
+    df = wide_frame(3000)
+    long_data = build_long_table(df)
+    positions = lookup_rows(build_filter_index(df), {'Parameter': ['DL (Mbps)']})
+    monkeypatch.setattr(aggregate, 'SKETCH_CHUNK_ROWS', 500)
+
+    streamed = selected_distribution(long_data, positions, approximate=True)
+    in_memory = distribution_summary(select_long_rows(long_data, positions), approximate=True)
+
+    assert streamed['approximate']
+    pd.testing.assert_frame_equal(streamed['summary'], in_memory['summary'])
+    exact = distribution_summary(select_long_rows(long_data, positions), approximate=False)['summary']
+    p50 = streamed['summary'].assign(Operator=lambda s: s['Operator'].astype(str)).set_index('Operator')['P50']
+    expected = exact.assign(Operator=lambda s: s['Operator'].astype(str)).set_index('Operator')['P50']
+    assert np.allclose(p50[expected.index], expected, rtol=0.03)
+
+
+def test_streamed_distribution_without_rows():
+    df = wide_frame(100)
+    result = selected_distribution(build_long_table(df), np.empty(0, dtype=np.int64), approximate=True)
+    assert result['summary'].empty
+
+
+@pytest.fixture
+def score_rows(long_rows):
+    """Long-format rows from (district, address, parameter, operator, value) tuples"""
+    return lambda rows: long_rows(rows, ['Kabupaten/Kota', 'Alamat', 'Parameter', 'Operator', 'Nilai'])
+
+
+def test_scores_follow_parameter_direction(score_rows):
+    rows = []
+    for site in range(20):
+        rows += [
+            ('Kendari', f'L{site}', 'DL (Mbps)', 'Telkomsel', 30.0 + site),
+            ('Kendari', f'L{site}', 'DL (Mbps)', 'IOH', 10.0 + site),
+            ('Kendari', f'L{site}', 'Ping (ms)', 'Telkomsel', 20.0 + site),
+            ('Kendari', f'L{site}', 'Ping (ms)', 'IOH', 80.0 + site),
+        ]
+    overall = score_operators(score_rows(rows))['overall'].set_index('Operator')['Skor']
+    assert overall['Telkomsel'] > overall['IOH']
+    assert overall.between(0, 100).all()
+
+    # Lower ping alone scores higher
+    ping = score_operators(score_rows(rows), weights={'DL (Mbps)': 0})['overall'].set_index('Operator')['Skor']
+    assert ping['Telkomsel'] > ping['IOH']
+
+
+def test_identical_values_score_the_same_in_both_directions(score_rows):
+    rows = [
+        ('Kendari', 'L1', parameter, operator, 25.0)
+        for parameter in ('DL (Mbps)', 'Ping (ms)')
+        for operator in ('Telkomsel', 'IOH')
+    ]
+    scored = normalized_scores(score_rows(rows))
+    assert scored['Skor'].tolist() == [50.0] * 4
+
+
+
+def test_parameter_without_spread_scores_neutral(score_rows):
+    rows = []
+    for site in range(20):
+        rows += [
+            ('Kendari', f'L{site}', 'DL (Mbps)', 'Telkomsel', 100.0),
+            ('Kendari', f'L{site}', 'DL (Mbps)', 'IOH', 1.0),
+            ('Kendari', f'L{site}', 'Ping (ms)', 'Telkomsel', 20.0),
+            ('Kendari', f'L{site}', 'Ping (ms)', 'IOH', 20.0),
+        ]
+    overall = score_operators(score_rows(rows))['overall'].set_index('Operator')['Skor']
+    assert overall['Telkomsel'] == 75.0
+    assert overall['IOH'] == 25.0
+
+
+def test_unscored_parameters_are_left_out(score_rows):
+    rows = [('Kendari', 'L1', 'Distance (km)', 'Telkomsel', 3.0), ('Kendari', 'L1', 'DL (Mbps)', 'IOH', 5.0)]
+    scores = score_operators(score_rows(rows))
+    assert scores['overall']['Operator'].astype(str).tolist() == ['IOH']
+    assert scores['district']['Jumlah Parameter'].tolist() == [1]
+
+
+def test_rollups_per_period_and_district():
+    df = pd.DataFrame({
+        'Tanggal': pd.to_datetime(['2025-03-03', '2025-03-04', '2025-03-10', '2025-04-01', None]),
+        'Kabupaten/Kota': pd.Categorical(['Kendari', 'Konawe', 'Kendari', 'Kendari', 'Kendari']),
+        'Jenis Pengukuran': 'Static Test',
+        'Parameter': 'DL (Mbps)',
+        'Operator': pd.Categorical(['IOH'] * 5, categories=OPERATORS),
+        'Nilai': [1.0, 3.0, 5.0, 7.0, 9.0],
+    })
+    rollups = build_rollups(df)
+    assert list(rollups) == list(ROLLUP_FREQUENCIES)
+
+    def series(label, district):
+        rollup = rollups[label]
+        rows = rollup[rollup['Kabupaten/Kota'] == district]
+        return {str(period.date()): (mean, p90, count)
+                for period, mean, p90, count in rows[['Periode', 'Rata-rata', 'P90', 'Jumlah']].itertuples(index=False)}
+
+    assert series('Harian', 'Konawe') == {'2025-03-04': (3.0, 3.0, 1)}
+    # Weeks start on Monday, rows without a date are left out
+    assert series('Mingguan', ALL_DISTRICTS) == {
+        '2025-03-03': (2.0, 2.8, 2), '2025-03-10': (5.0, 5.0, 1), '2025-03-31': (7.0, 7.0, 1)
+    }
+    assert series('Bulanan', 'Kendari') == {'2025-03-01': (3.0, 4.6, 2), '2025-04-01': (7.0, 7.0, 1)}
+    assert series('Bulanan', ALL_DISTRICTS)['2025-03-01'][2] == 3
+
+
+@pytest.fixture
+def bar_rows(long_rows):
+    """Bar chart rows of 6 locations in 2 districts, location i valued i (Telkomsel) and i + 1 (IOH)"""
+    rows = [
+        ('Kendari' if site < 3 else 'Konawe', f'L{site}', operator, float(site + offset))
+        for site in range(6)
+        for operator, offset in (('Telkomsel', 0), ('IOH', 1))
+    ]
+    return long_rows(rows + [('Kendari', 'L0', 'XL Axiata', None)], ['Kabupaten/Kota', 'Alamat', 'Operator', 'Nilai'])
+
+
+def test_bar_locations_top_and_bottom(bar_rows):
+    reduced, x_column = aggregate_bar_locations(bar_rows, "Top/Bottom N", top_n=2)
+    assert x_column == 'Alamat'
+    assert reduced['Alamat'].astype(str).tolist() == ['L5', 'L5', 'L4', 'L4', 'L1', 'L1', 'L0', 'L0']
+    assert reduced['Nilai'].notna().all()
+
+    # Overlapping top and bottom locations are kept once
+    reduced, _ = aggregate_bar_locations(bar_rows, "Top/Bottom N", top_n=4)
+    assert reduced['Alamat'].astype(str).unique().tolist() == ['L5', 'L4', 'L3', 'L2', 'L1', 'L0']
+
+
+def test_bar_locations_per_district(bar_rows):
+    reduced, x_column = aggregate_bar_locations(bar_rows, "Agregasi Kabupaten/Kota")
+    assert x_column == 'Kabupaten/Kota'
+    means = reduced.set_index(['Kabupaten/Kota', 'Operator'])['Nilai']
+    assert means.to_dict() == {
+        ('Kendari', 'Telkomsel'): 1.0, ('Kendari', 'IOH'): 2.0, ('Konawe', 'Telkomsel'): 4.0, ('Konawe', 'IOH'): 5.0
+    }
+
+
+def test_bar_locations_ranked(bar_rows):
+    ranked = rank_bar_locations(bar_rows)
+    assert list(ranked.columns) == ['Peringkat', 'Operator', 'Nilai']
+    assert ranked.set_index(['Peringkat', 'Operator'])['Nilai'].to_dict() == {
+        (6 - site, operator): site + offset for site in range(6) for operator, offset in (('Telkomsel', 0), ('IOH', 1))
+    }
+
+
+def test_sketch_groups_follow_category_order():
+    long_df = build_long_table(wide_frame(600))['table']
+    exact = distribution_summary(long_df, approximate=False)['summary']
+    sketched = distribution_summary(long_df, approximate=True)['summary']
+
+    assert exact['Operator'].astype(str).tolist()[:3] == OPERATORS
+    columns = ['Jenis Pengukuran', 'Parameter', 'Operator', 'Jumlah']
+    pd.testing.assert_frame_equal(sketched[columns], exact[columns], check_column_type=False)
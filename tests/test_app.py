@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import threading
+import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import bts5
+
+
+@pytest.fixture
+def prefetcher(monkeypatch):
+    """A one-thread prefetcher, so background tasks run in submission order"""
+    state = {'pool': ThreadPoolExecutor(max_workers=1), 'futures': {}, 'lock': threading.Lock()}
+    monkeypatch.setattr(bts5, 'get_prefetcher', lambda: state)
+    yield state
+    state['pool'].shutdown(wait=True, cancel_futures=True)
+
+
+def test_prefetched_result_does_not_wait(prefetcher):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'titles'
+
+    running = bts5.prefetch(('worksheets', 'a'), slow)
+    queued = bts5.prefetch(('worksheets', 'b'), lambda: 'other titles')
+    started.wait(5)
+
+    assert bts5.prefetched_result(('worksheets', 'a')) is None
+    assert bts5.prefetched_result(('worksheets', 'b')) is None
+    assert queued.cancelled()
+    assert bts5.prefetched_result(('worksheets', 'c')) is None
+
+    release.set()
+    running.result(5)
+    assert bts5.prefetched_result(('worksheets', 'a')) == 'titles'
+    assert bts5.prefetch(('worksheets', 'a'), slow) is running
+
+
+def test_expired_prefetch_is_not_queued_again(prefetcher, monkeypatch):
+    calls = []
+    bts5.prefetch(('worksheets', 'a'), calls.append, 1).result(5)
+    monkeypatch.setattr(bts5, 'PREFETCH_TTL', 0)
+
+    assert bts5.prefetched_result(('worksheets', 'a')) is None
+    bts5.prefetch(('worksheets', 'a'), calls.append, 2).result(5)
+    assert calls == [1]
+
+
+def test_last_used_data_is_prefetched_first(prefetcher, monkeypatch):
+    calls = []
+    fake_sheets = types.SimpleNamespace(
+        fetch_sheet_data=lambda gc, sheet_id, name: calls.append(('data', sheet_id, name)),
+        fetch_worksheet_titles=lambda gc, sheet_id: calls.append(('worksheets', sheet_id)),
+    )
+    monkeypatch.setattr(bts5, 'sheets', fake_sheets)
+    monkeypatch.setattr(bts5.ingest, 'read_last_used_sheet', lambda: ('b', 'Sheet1'))
+
+    bts5.prefetch_sheets(None, ['a', 'b', 'c'])
+    prefetcher['pool'].shutdown(wait=True)
+
+    assert calls == [('data', 'b', 'Sheet1'), ('worksheets', 'a'), ('worksheets', 'b'), ('worksheets', 'c')]
+
+
+@pytest.fixture
+def map_cache(monkeypatch):
+    """An empty map cache of at most 3 entries and 10 bytes"""
+    cache = {'entries': OrderedDict(), 'size': 0, 'lock': threading.Lock()}
+    monkeypatch.setattr(bts5, 'get_map_cache', lambda: cache)
+    monkeypatch.setattr(bts5, 'MAP_CACHE_MAX_ENTRIES', 3)
+    monkeypatch.setattr(bts5, 'MAP_CACHE_MAX_BYTES', 10)
+    return cache
+
+
+def test_map_cache_evicts_least_recently_used(map_cache):
+    for key in 'abc':
+        bts5.put_cached_map_html(key, key)
+    assert bts5.get_cached_map_html('a') == 'a'
+
+    bts5.put_cached_map_html('d', 'd')
+    assert list(map_cache['entries']) == ['c', 'a', 'd']
+    assert bts5.get_cached_map_html('b') is None
+    assert map_cache['size'] == 3
+
+
+def test_map_cache_is_bounded_by_size(map_cache):
+    bts5.put_cached_map_html('a', 'aaaa')
+    bts5.put_cached_map_html('b', 'bbbb')
+    bts5.put_cached_map_html('a', 'aaaaa')
+    assert list(map_cache['entries']) == ['b', 'a'] and map_cache['size'] == 9
+
+    bts5.put_cached_map_html('c', 'cccc')
+    assert list(map_cache['entries']) == ['a', 'c'] and map_cache['size'] == 9
+
+    bts5.put_cached_map_html('d', 'd' * 11)
+    assert bts5.get_cached_map_html('d') is None
+    assert list(map_cache['entries']) == ['a', 'c']
+
+
+def test_ingest_is_imported_lazily():
+    code = "import sys, bts5; print('qoe_core.ingest' in sys.modules, 'pyarrow.parquet' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.split() == ['False', 'False']
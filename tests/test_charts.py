@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from qoe_core.aggregate import BARCHART_MAX_LOCATIONS
+from qoe_core.charts import barchart_figure
+
+
+@pytest.fixture
+def many_locations(long_rows):
+    """Bar chart rows of more locations than a plain bar chart shows, with long addresses"""
+    count = BARCHART_MAX_LOCATIONS * 10
+    rows = [
+        (f'Kabupaten {site % 4}', f'Jalan Poros Kendari - Kolaka Km {site}', operator, float(site + offset))
+        for site in range(count)
+        for operator, offset in (('Telkomsel', 0), ('IOH', 1), ('XL Axiata', 2))
+    ]
+    return long_rows(rows, ['Kabupaten/Kota', 'Alamat', 'Operator', 'Nilai'])
+
+
+def test_large_bar_chart_axis_titles(many_locations):
+    def x_title(mode):
+        return barchart_figure(many_locations, 'DL (Mbps)', 'Static Test', mode).layout.xaxis.title.text
+
+    assert x_title("Top/Bottom N") == "Lokasi"
+    assert x_title("Agregasi Kabupaten/Kota") == "Kabupaten/Kota"
+    assert x_title("Semua Lokasi (WebGL)") == "Peringkat Lokasi"
+
+
+def test_webgl_bar_chart_carries_no_addresses(many_locations):
+    fig = barchart_figure(many_locations, 'DL (Mbps)', 'Static Test', "Semua Lokasi (WebGL)")
+    payload = fig.to_json()
+
+    assert 'Jalan Poros' not in payload
+    assert sum(len(trace.x) for trace in fig.data) == len(many_locations)
+    assert len(payload) < 40 * len(many_locations)
+    assert json.loads(payload)['data'][0]['type'] == 'scattergl'
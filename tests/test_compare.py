@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from qoe_core.aggregate import rank_locations
+from qoe_core.compare import PERIOD_COLUMN, compare_periods, location_comparison_table
+from qoe_core.coordinates import haversine_km
+from qoe_core.schema import OPERATORS
+
+BEFORE, AFTER = 'Posko Before Idul Fitri', 'Posko After Idul Fitri'
+
+
+@pytest.fixture
+def site_rows(long_rows):
+    """Long-format DL rows from (period, address, lat, lon, operator, value) tuples"""
+    columns = [PERIOD_COLUMN, 'Alamat', 'Latitude', 'Longitude', 'Operator', 'Nilai']
+    return lambda rows: long_rows(rows, columns, Parameter='DL (Mbps)')
+
+
+def test_pairs_by_address_then_nearest_site(site_rows):
+    df = site_rows([
+        (BEFORE, 'Pasar', -4.0, 122.0, 'Telkomsel', 10.0),
+        (BEFORE, 'Pasar', -4.0, 122.0, 'Telkomsel', 20.0),
+        (AFTER, 'Pasar', -4.0, 122.0, 'Telkomsel', 30.0),
+        # Renamed site 0.5 km away
+        (BEFORE, 'Terminal', -4.1, 122.1, 'IOH', 8.0),
+        (AFTER, 'Terminal Baru', -4.1045, 122.1, 'IOH', 6.0),
+        # Renamed site 5 km away stays unpaired
+        (BEFORE, 'Pelabuhan', -4.3, 122.3, 'XL Axiata', 5.0),
+        (AFTER, 'Dermaga', -4.345, 122.3, 'XL Axiata', 7.0),
+        # Nearby site of another operator is not a match
+        (AFTER, 'Terminal Lama', -4.1001, 122.1, 'Telkomsel', 1.0),
+    ])
+
+    result = compare_periods(df, BEFORE, AFTER).set_index('Alamat Before')
+
+    assert sorted(result.index) == ['Pasar', 'Terminal']
+    assert result.loc['Pasar', 'Pencocokan'] == 'Alamat'
+    assert result.loc['Pasar', 'Selisih'] == 15.0
+    assert result.loc['Pasar', 'Perubahan (%)'] == 100.0
+    assert result.loc['Terminal', 'Alamat After'] == 'Terminal Baru'
+    assert result.loc['Terminal', 'Pencocokan'] == 'Koordinat terdekat'
+    assert abs(result.loc['Terminal', 'Jarak (km)'] - 0.5) < 0.01
+
+
+def test_nearest_matches_brute_force(site_rows):
+    rng = np.random.default_rng(3)
+    rows = []
+    for i in range(300):
+        lat, lon = rng.uniform(-4.1, -3.9), rng.uniform(121.9, 122.1)
+        operator = OPERATORS[i % 3]
+        rows.append((BEFORE, f'B{i}', lat, lon, operator, rng.uniform(1, 50)))
+        rows.append((AFTER, f'A{i}', lat + rng.normal(0, 0.005), lon + rng.normal(0, 0.005), operator, rng.uniform(1, 50)))
+    df = site_rows(rows)
+
+    result = compare_periods(df, BEFORE, AFTER, max_distance_km=1.0)
+
+    # Reference: full cross join of every Before and After site of the same operator
+    before = df[df[PERIOD_COLUMN] == BEFORE].add_suffix(' Before').rename(columns={'Operator Before': 'Operator'})
+    after = df[df[PERIOD_COLUMN] == AFTER].add_suffix(' After').rename(columns={'Operator After': 'Operator'})
+    cross = before.merge(after, on='Operator')
+    cross['Jarak (km)'] = haversine_km(cross['Latitude Before'], cross['Longitude Before'],
+                                       cross['Latitude After'], cross['Longitude After'])
+    expected = cross[cross['Jarak (km)'] <= 1.0].sort_values('Jarak (km)', kind='stable')
+    expected = expected.drop_duplicates('Alamat Before').drop_duplicates('Alamat After')
+
+    assert dict(zip(result['Alamat Before'], result['Alamat After'])) == \
+        dict(zip(expected['Alamat Before'].astype(str), expected['Alamat After'].astype(str)))
+    assert len(result) > 100
+
+
+def test_missing_period(site_rows):
+    df = site_rows([(BEFORE, 'Pasar', -4.0, 122.0, 'Telkomsel', 10.0)])
+    assert compare_periods(df, BEFORE, AFTER).empty
+
+
+def test_location_comparison_table(site_rows):
+    df = site_rows([
+        (BEFORE, 'Pasar', -4.0, 122.0, 'Telkomsel', 10.0),
+        (BEFORE, 'Terminal', -4.1, 122.1, 'Telkomsel', 30.0),
+        (BEFORE, 'Pelabuhan', -4.2, 122.2, 'Telkomsel', 20.0),
+        (BEFORE, 'Pasar', -4.0, 122.0, 'IOH', 5.0),
+    ]).assign(Koordinat='-', Tanggal_str='01-03-2025')
+
+    ranking = rank_locations(df, top_n=2)
+    comparison = location_comparison_table(ranking, 'DL (Mbps)', 'Static Test').set_index('Operator')
+
+    assert ranking[ranking['Operator'] == 'Telkomsel']['Peringkat'].tolist() == [1, 2, 1, 2]
+    assert comparison.loc['Telkomsel', 'Lokasi Tertinggi'] == 'Terminal'
+    assert comparison.loc['Telkomsel', 'Lokasi Terendah'] == 'Pasar'
+    assert comparison.loc['IOH', 'Nilai Tertinggi'] == comparison.loc['IOH', 'Nilai Terendah'] == 5.0
+    assert location_comparison_table(ranking, 'DL (Mbps)', 'Route Test') is None
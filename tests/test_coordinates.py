@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from qoe_core.coordinates import add_coordinate_columns, format_coordinates, haversine_km
+
+
+def expected_columns(df):
+    """Koordinat columns from the per-point formatter"""
+    return (
+        [format_coordinates(lat, lon, "decimal") for lat, lon in zip(df['Latitude'], df['Longitude'])],
+        [format_coordinates(lat, lon, "dms") for lat, lon in zip(df['Latitude'], df['Longitude'])],
+    )
+
+
+def test_matches_format_coordinates_for_rounded_inputs():
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-5.8, -3.0, 4000)
+    lon = rng.uniform(121.0, 124.2, 4000)
+    for decimals in (None, 6, 7, 8):
+        df = pd.DataFrame({'Latitude': lat, 'Longitude': lon})
+        if decimals is not None:
+            df = df.round(decimals)
+        decimal, dms = expected_columns(df)
+        add_coordinate_columns(df)
+        assert df['Koordinat'].tolist() == decimal
+        assert df['Koordinat_DMS'].tolist() == dms
+
+
+def test_half_way_values():
+    df = pd.DataFrame({
+        'Latitude': [-3.0342795, 0.0000005, -0.0000015, 1.2345675],
+        'Longitude': [122.5000005, 179.9999995, -70.1234565, 0.0],
+    })
+    decimal, dms = expected_columns(df)
+    add_coordinate_columns(df)
+    assert df['Koordinat'].tolist() == decimal
+    assert df['Koordinat_DMS'].tolist() == dms
+
+
+def test_missing_coordinates():
+    df = pd.DataFrame({'Latitude': [np.nan, -4.0], 'Longitude': [122.0, np.nan]})
+    add_coordinate_columns(df)
+    assert df['Koordinat'].tolist() == [format_coordinates(np.nan, 122.0)] * 2
+    assert df['Koordinat_DMS'].tolist() == [format_coordinates(np.nan, 122.0, "dms")] * 2
+
+
+def test_haversine_km():
+    # One degree of latitude is about 111.2 km
+    assert abs(haversine_km(0.0, 0.0, 1.0, 0.0) - 111.195) < 0.01
+    assert haversine_km(-4.0, 122.0, -4.0, 122.0) == 0.0
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from qoe_core.coordinates import haversine_km
+from qoe_core.index import (
+    build_filter_index, build_long_table, build_spatial_index, colocated_groups, lookup_rows, lookup_values,
+    nearest_points, radius_query, select_long_rows,
+)
+from qoe_core.ingest import read_local_files
+from qoe_core.normalize import normalize_data
+
+
+def test_filter_index_matches_boolean_filtering(sample_csv):
+    df = read_local_files([sample_csv])
+    index = build_filter_index(df)
+    district = df['Kabupaten/Kota'].dropna().iloc[0]
+    selections = {'Jenis Pengukuran': ['Static Test'], 'Kabupaten/Kota': [district]}
+
+    positions = lookup_rows(index, selections)
+
+    mask = (df['Jenis Pengukuran'] == 'Static Test') & (df['Kabupaten/Kota'] == district)
+    assert positions.tolist() == np.flatnonzero(mask.to_numpy()).tolist()
+    assert lookup_values(index, 'Parameter', selections) == sorted(df[mask]['Parameter'].dropna().unique().tolist())
+    assert lookup_rows(index, {'Alamat': []}).size == 0
+
+
+def test_select_long_rows_matches_melt(sample_csv):
+    df = read_local_files([sample_csv])
+    long_data = build_long_table(df)
+    positions = lookup_rows(build_filter_index(df), {'Jenis Pengukuran': ['Route Test']})
+
+    rows = select_long_rows(long_data, positions)
+
+    assert len(rows) == 3 * len(positions)
+    for operator in long_data['operators']:
+        values = rows[rows['Operator'] == operator]['Nilai'].to_numpy()
+        expected = df[operator].iloc[positions].to_numpy(dtype=float)
+        assert np.allclose(values, expected, equal_nan=True, rtol=1e-6)
+
+
+def test_long_table_with_text_in_one_operator(tmp_path, sample_csv):
+    raw = pd.read_csv(sample_csv, encoding='utf-8-sig')
+    raw['Telkomsel'] = raw['Telkomsel'].astype(object)
+    raw.loc[5, 'Telkomsel'] = '-'
+    path = tmp_path / "dash.csv"
+    raw.to_csv(path, index=False)
+
+    long_data = build_long_table(read_local_files([str(path)]))
+    table = long_data['table']
+
+    assert len(table) == 3 * len(raw)
+    telkomsel = table[table['Operator'] == 'Telkomsel']
+    assert telkomsel['Teks'].iloc[5] == '-'
+    assert np.isnan(telkomsel['Nilai'].iloc[5])
+    assert table['Teks'].notna().sum() == 1
+
+
+def test_long_table_with_object_text_categories():
+    # Snapshots written before the text columns had str categories
+    df = normalize_data(pd.DataFrame({'Parameter': ['Ping (ms)'] * 2, 'Telkomsel': ['Good', '20'], 'IOH': [10.0, 12.0]}))
+    df['IOH_teks'] = pd.Categorical.from_codes([-1, -1], categories=pd.Index([], dtype=object))
+
+    table = build_long_table(df)['table']
+
+    assert table['Teks'].iloc[0] == 'Good'
+    assert table['Teks'].notna().sum() == 1
+    assert table['Nilai'].tolist() == [3.0, 20.0, 10.0, 12.0]
+
+
+def random_points(seed, lon_range):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(-1.0, 1.0, 2000)
+    lon = rng.uniform(*lon_range, 2000)
+    lat[::97] = np.nan
+    return lat, lon
+
+
+def test_radius_query_matches_brute_force():
+    for lon_range in ((121.0, 124.0), (-70.5, -69.5), (-0.5, 0.5)):
+        lat, lon = random_points(1, lon_range)
+        index = build_spatial_index(lat, lon)
+        centre_lon = float(np.mean(lon_range))
+        for radius_km in (0.5, 5.0, 50.0, 200.0):
+            positions, distances = radius_query(index, 0.1, centre_lon, radius_km)
+            brute = haversine_km(0.1, centre_lon, lat, lon)
+            expected = np.flatnonzero(brute <= radius_km)
+            assert sorted(positions.tolist()) == expected.tolist()
+            assert np.allclose(distances, brute[positions])
+            assert (np.diff(distances) >= 0).all()
+
+
+def test_nearest_points_matches_brute_force():
+    lat, lon = random_points(2, (-70.5, -69.5))
+    index = build_spatial_index(lat, lon)
+    brute = np.nan_to_num(haversine_km(3.0, -72.0, lat, lon), nan=np.inf)
+    positions, distances = nearest_points(index, 3.0, -72.0, k=5)
+    assert np.allclose(distances, np.sort(brute)[:5])
+
+
+def test_colocated_groups():
+    lat = np.array([-4.0, -4.0, -4.00001, np.nan, -5.0])
+    lon = np.array([122.0, 122.0, 122.0, 122.0, 123.0])
+    index = build_spatial_index(lat, lon)
+
+    exact = colocated_groups(index)
+    assert exact[3] == -1
+    assert exact[0] == exact[1] != exact[2]
+    assert len(set(exact[[0, 2, 4]])) == 3
+
+    near = colocated_groups(index, tolerance_km=0.01)
+    assert near[0] == near[1] == near[2] != near[4]
@@ -0,0 +1,82 @@
+import folium
+import pandas as pd
+
+from qoe_core import maps
+from qoe_core.maps import add_grid_layer, build_point_features, create_combined_map
+from qoe_core.schema import OPERATORS
+
+RED, GREEN = '#ff0000ff', '#008000ff'
+
+
+def grid_colors(parameter):
+    """Fill color of the low-value and the high-value grid cell"""
+    df_long = pd.DataFrame({
+        'Latitude': [-4.0, -5.0],
+        'Longitude': [122.0, 123.0],
+        'Operator': pd.Categorical(['Telkomsel', 'Telkomsel'], categories=OPERATORS),
+        'Nilai': [10.0, 90.0],
+    })
+    m = folium.Map()
+    add_grid_layer(m, df_long, 'Static Test', parameter, 0.5, 'Telkomsel')
+    layer = next(child for child in m._children.values() if isinstance(child, folium.GeoJson))
+    fills = {feature['properties']['stats'][0][1]: feature['properties']['fill'] for feature in layer.data['features']}
+    return fills['10.00'], fills['90.00']
+
+
+def test_grid_colors_follow_parameter_direction():
+    assert grid_colors('DL (Mbps)') == (RED, GREEN)
+    assert grid_colors('Ping (ms)') == (GREEN, RED)
+    assert grid_colors('Loading time (ms)') == (GREEN, RED)
+
+
+def test_marker_text_is_escaped():
+    df_long = pd.DataFrame({
+        'Latitude': [-4.0],
+        'Longitude': [122.0],
+        'Operator': pd.Categorical(['Telkomsel'], categories=OPERATORS),
+        'Alamat': ['<script>alert(1)</script>'],
+        'Nilai': [10.0],
+        'Teks': [None],
+        'Tanggal_str': ['01/01/2025'],
+        'Koordinat': ['-4.000000, 122.000000'],
+    })
+    page = create_combined_map(df_long, df_long.iloc[:0], 'DL (Mbps)', 'DL (Mbps)').get_root().render()
+    assert '<script>alert(1)</script>' not in page
+    assert '&lt;script&gt;alert(1)&lt;/script&gt;' in page
+
+
+def point_rows(count):
+    """Long-format Route Test rows at count points"""
+    return pd.DataFrame({
+        'Latitude': [-4.0 - i / 1000 for i in range(count)],
+        'Longitude': [122.12345678] * count,
+        'Operator': pd.Categorical(['IOH'] * count, categories=OPERATORS),
+        'Alamat': [f'Titik {i}' for i in range(count)],
+        'Nilai': [i + 0.5 for i in range(count)],
+        'Teks': [None] * count,
+        'Tanggal_str': ['01/01/2025'] * count,
+        'Koordinat': ['-'] * count,
+    })
+
+
+def test_point_features():
+    df_map = point_rows(2).assign(**{'Teks': [None, 'No Service'], 'Kabupaten/Kota': ['Kendari', None]})
+    features = build_point_features(df_map, 'Koordinat')['features']
+
+    assert [feature['geometry']['coordinates'] for feature in features] == [[122.123457, -4.0], [122.123457, -4.001]]
+    assert features[0]['properties'] == {
+        'operator': 'IOH', 'lokasi': 'Titik 0', 'nilai': '0.5', 'tanggal': '01/01/2025', 'koordinat': '-', 'kabupaten': 'Kendari'
+    }
+    assert features[1]['properties']['nilai'] == 'No Service'
+    assert features[1]['properties']['kabupaten'] == ''
+
+
+def test_large_maps_are_drawn_in_bulk(monkeypatch):
+    monkeypatch.setattr(maps, 'BULK_MAP_THRESHOLD', 3)
+
+    def layers(count):
+        m = create_combined_map(point_rows(count), point_rows(0), 'DL (Mbps)', 'DL (Mbps)')
+        return [type(child).__name__ for child in m._children.values()]
+
+    assert 'MarkerCluster' in layers(3) and 'GeoJson' not in layers(3)
+    assert 'GeoJson' in layers(4) and 'MarkerCluster' not in layers(4)
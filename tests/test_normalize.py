@@ -0,0 +1,44 @@
+import pandas as pd
+import pyarrow as pa
+
+from qoe_core import ingest
+from qoe_core.ingest import read_csv_file
+from qoe_core.normalize import concat_typed_frames, normalize_data
+from qoe_core.schema import operator_values_float64
+
+
+def test_csv_chunks_with_blank_category_column(tmp_path, monkeypatch):
+    path = tmp_path / "blank.csv"
+    pd.DataFrame({
+        'Parameter': ['DL (Mbps)'] * 250,
+        'Keterangan': ['Posko Before Idul Fitri'] * 150 + [None] * 100,
+        'Telkomsel': range(250),
+    }).to_csv(path, index=False)
+    monkeypatch.setattr(ingest, 'CSV_CHUNK_ROWS', 100)
+
+    df = read_csv_file(path)
+
+    assert isinstance(df['Keterangan'].dtype, pd.CategoricalDtype)
+    assert df['Keterangan'].notna().sum() == 150
+    assert df['Keterangan'].cat.categories.tolist() == ['Posko Before Idul Fitri']
+
+
+def test_concat_operator_text_with_and_without_entries():
+    numeric = normalize_data(pd.DataFrame({'Telkomsel': [1.5, 2.0], 'IOH': [3.0, 4.0]}))
+    with_text = normalize_data(pd.DataFrame({'Telkomsel': ['7', '-'], 'IOH': ['Good', '5']}))
+    snapshot = pa.Table.from_pandas(numeric, preserve_index=False).to_pandas()
+    assert numeric['Telkomsel_teks'].cat.categories.dtype == with_text['Telkomsel_teks'].cat.categories.dtype
+
+    for parts in ([numeric, with_text], [with_text, numeric], [snapshot, with_text]):
+        df = concat_typed_frames(parts)
+        assert isinstance(df['Telkomsel_teks'].dtype, pd.CategoricalDtype)
+        assert df['Telkomsel_teks'].dropna().tolist() == ['-']
+        assert df['IOH_teks'].dropna().tolist() == ['Good']
+        assert sorted(df['IOH'].dropna().tolist()) == [3.0, 3.0, 4.0, 5.0]
+
+
+def test_operator_values_shown_as_entered():
+    df = normalize_data(pd.DataFrame({'Telkomsel': [45.82, 0.1], 'IOH': ['12.345', 'Good']}))
+    assert df['Telkomsel'].dtype == 'float32'
+    assert operator_values_float64(df['Telkomsel']).tolist() == [45.82, 0.1]
+    assert operator_values_float64(df['IOH']).tolist() == [12.345, 3.0]
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from qoe_core.ingest import read_local_files
+from qoe_core.report import load_source, run_report
+
+def test_report_of_every_parameter(tmp_path, sample_csv):
+    df = load_source(sample_csv)
+    output = tmp_path / "laporan"
+
+    entries = list(run_report(df, str(output), workers=2, include_maps=False))
+
+    parameters = df.groupby(['Jenis Pengukuran', 'Parameter'], observed=True).size()
+    assert len(entries) == len(parameters)
+    manifest = pd.read_csv(output / "manifest.csv")
+    assert manifest['Baris'].sum() == 3 * len(df)
+    for entry in entries:
+        for path in entry['Berkas']:
+            assert (output / path).exists()
+    assert (output / "index.html").exists()
+
+
+def test_report_with_filters_matching_nothing(tmp_path, sample_csv):
+    df = read_local_files([sample_csv])
+    assert list(run_report(df, str(tmp_path / "kosong"), {'Bulan': ['Januari 1999']})) == []
+    assert not (tmp_path / "kosong").exists()
@@ -0,0 +1,125 @@
+import csv
+import re
+import types
+
+import pandas as pd
+import pytest
+
+from qoe_core import ingest
+from qoe_core.normalize import normalize_data
+from qoe_core.schema import SOURCE_COLUMN
+from qoe_core.sheets import fetch_sheet_data, fetch_sheet_set, records_to_frame
+
+
+@pytest.fixture
+def sheet_values(sample_csv, tmp_path, monkeypatch):
+    """Raw worksheet values (header first) of the sample campaign, snapshots in tmp_path"""
+    monkeypatch.setattr(ingest, 'SNAPSHOT_DIR', str(tmp_path))
+    with open(sample_csv, encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f))
+
+
+def fake_client(spreadsheets, modified_times, calls):
+    """gspread client serving {sheet_id: {sheet_name: values}}, recording API calls"""
+    def worksheet(sheet_id, name):
+        calls.append(('get_values', sheet_id, name))
+        return types.SimpleNamespace(get_values=lambda: spreadsheets[sheet_id][name])
+
+    def values_get(sheet_id, range_name):
+        calls.append(('values_get', sheet_id, range_name))
+        name, start_row = re.fullmatch(r"'(.+)'!A(\d+):[A-Z]+", range_name).groups()
+        return {'values': spreadsheets[sheet_id][name][int(start_row) - 1:]}
+
+    def values_batch_get(sheet_id, ranges):
+        calls.append(('values_batch_get', sheet_id, ranges))
+        return {'valueRanges': [{'values': spreadsheets[sheet_id][name.strip("'")]} for name in ranges]}
+
+    def open_by_key(sheet_id):
+        return types.SimpleNamespace(
+            worksheet=lambda name: worksheet(sheet_id, name),
+            values_get=lambda range_name: values_get(sheet_id, range_name),
+            values_batch_get=lambda ranges: values_batch_get(sheet_id, ranges),
+        )
+
+    return types.SimpleNamespace(
+        get_file_drive_metadata=lambda sheet_id: {'modifiedTime': modified_times[sheet_id]},
+        open_by_key=open_by_key,
+    )
+
+
+def expected_frame(values):
+    return normalize_data(records_to_frame(values[0], values[1:]))
+
+
+def assert_same_rows(df, expected):
+    pd.testing.assert_frame_equal(df.astype(object), expected.astype(object))
+
+
+def test_unchanged_sheet_is_read_from_snapshot(sheet_values):
+    calls = []
+    gc = fake_client({'a': {'Sheet1': sheet_values}}, {'a': 't1'}, calls)
+
+    first = fetch_sheet_data(gc, 'a', 'Sheet1')
+    assert calls == [('get_values', 'a', 'Sheet1')]
+
+    second = fetch_sheet_data(gc, 'a', 'Sheet1')
+    assert len(calls) == 1
+    assert_same_rows(second, first)
+
+
+def test_appended_rows_are_fetched_as_delta(sheet_values):
+    calls = []
+    spreadsheets = {'a': {'Sheet1': sheet_values[:101]}}
+    modified_times = {'a': 't1'}
+    gc = fake_client(spreadsheets, modified_times, calls)
+    fetch_sheet_data(gc, 'a', 'Sheet1', incremental=True)
+
+    spreadsheets['a']['Sheet1'] = sheet_values
+    modified_times['a'] = 't2'
+    df = fetch_sheet_data(gc, 'a', 'Sheet1', incremental=True)
+
+    assert calls[1:] == [('values_get', 'a', "'Sheet1'!A101:N")]
+    assert_same_rows(df, expected_frame(sheet_values))
+    assert ingest.read_snapshot_info('a', 'Sheet1')['rows'] == len(sheet_values) - 1
+
+
+def test_changed_last_row_reloads_whole_sheet(sheet_values):
+    calls = []
+    spreadsheets = {'a': {'Sheet1': sheet_values[:101]}}
+    modified_times = {'a': 't1'}
+    gc = fake_client(spreadsheets, modified_times, calls)
+    fetch_sheet_data(gc, 'a', 'Sheet1', incremental=True)
+
+    edited = [list(row) for row in sheet_values]
+    edited[100][6] = '99.5'
+    spreadsheets['a']['Sheet1'] = edited
+    modified_times['a'] = 't2'
+    df = fetch_sheet_data(gc, 'a', 'Sheet1', incremental=True)
+
+    assert calls[1:] == [('values_get', 'a', "'Sheet1'!A101:N"), ('get_values', 'a', 'Sheet1')]
+    assert_same_rows(df, expected_frame(edited))
+
+
+def test_sheet_set_fetches_each_spreadsheet_in_one_batch(sheet_values):
+    calls = []
+    spreadsheets = {
+        'a': {'Before': sheet_values[:101], 'After': [sheet_values[0]] + sheet_values[101:]},
+        'b': {'Sheet1': sheet_values[:51]},
+    }
+    gc = fake_client(spreadsheets, {'a': 't1', 'b': 't1'}, calls)
+    sources = [('a', 'Before', 'A/Before'), ('b', 'Sheet1', 'B'), ('a', 'After', 'A/After')]
+
+    df = fetch_sheet_set(gc, sources, max_workers=2)
+
+    assert sorted(calls) == [
+        ('values_batch_get', 'a', ["'Before'", "'After'"]),
+        ('values_batch_get', 'b', ["'Sheet1'"]),
+    ]
+    assert df[SOURCE_COLUMN].value_counts(sort=False).to_dict() == {
+        'A/Before': 100, 'B': 50, 'A/After': len(sheet_values) - 101
+    }
+
+    # Every worksheet was snapshotted, so the next load needs no values at all
+    calls.clear()
+    assert_same_rows(fetch_sheet_set(gc, sources), df)
+    assert calls == []